@@ -0,0 +1,153 @@
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Mapping, Optional, Sequence, Tuple
+
+from aiohttp import hdrs, web
+
+__all__ = (
+    "BaseCacheBackend",
+    "LocMemCache",
+    "CachedResponse",
+)
+
+
+class BaseCacheBackend:
+    """
+    A base class from which all cache backend classes should inherit.
+
+    Besides plain key/value storage backend keeps a generation counter per namespace (model),
+    generation is a part of every cache key, so bumping it invalidates all entries of the namespace at once.
+    Generations have to outlive cached entries, i.e. must not be evicted or expire.
+    """
+
+    async def get(self, key: str) -> Optional[Any]:
+        raise NotImplementedError("`get()` must be implemented.")
+
+    async def set(self, key: str, value: Any, timeout: Optional[float] = None) -> None:
+        raise NotImplementedError("`set()` must be implemented.")
+
+    async def delete(self, key: str) -> None:
+        raise NotImplementedError("`delete()` must be implemented.")
+
+    async def clear(self) -> None:
+        raise NotImplementedError("`clear()` must be implemented.")
+
+    async def get_generation(self, namespace: str) -> int:
+        raise NotImplementedError("`get_generation()` must be implemented.")
+
+    async def incr_generation(self, namespace: str) -> int:
+        raise NotImplementedError("`incr_generation()` must be implemented.")
+
+
+class LocMemCache(BaseCacheBackend):
+    """
+    In-process cache, least recently used entries are evicted when there are more than `max_entries`.
+    Every process has its own cache, so writes made by other processes don't invalidate it,
+    use a shared backend if the app runs in several processes and stale reads aren't acceptable.
+    """
+
+    def __init__(self, max_entries: int = 1000, default_timeout: float = 300):
+        assert max_entries > 0, "`max_entries` has to be a positive number"
+        self.max_entries = max_entries
+        self.default_timeout = default_timeout
+        self._cache: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+        self._generations: Dict[str, int] = {}
+
+    async def get(self, key: str) -> Optional[Any]:
+        item = self._cache.get(key)
+        if item is None:
+            return None
+        expires_at, value = item
+        if expires_at <= time.monotonic():
+            del self._cache[key]
+            return None
+        self._cache.move_to_end(key)
+        return value
+
+    async def set(self, key: str, value: Any, timeout: Optional[float] = None) -> None:
+        if timeout is None:
+            timeout = self.default_timeout
+        self._cache[key] = (time.monotonic() + timeout, value)
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    async def delete(self, key: str) -> None:
+        self._cache.pop(key, None)
+
+    async def clear(self) -> None:
+        self._cache.clear()
+        self._generations.clear()
+
+    async def get_generation(self, namespace: str) -> int:
+        return self._generations.get(namespace, 0)
+
+    async def incr_generation(self, namespace: str) -> int:
+        generation = self._generations.get(namespace, 0) + 1
+        self._generations[namespace] = generation
+        return generation
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+
+class CachedResponse:
+    """Cache entry with everything needed to rebuild a response"""
+
+    # headers worth caching, the rest of them are set by aiohttp for every response
+    # or declared by the view, see `from_response()`
+    cached_headers: Tuple[str, ...] = (hdrs.ETAG, hdrs.LAST_MODIFIED)
+
+    __slots__ = ("status", "body", "content_type", "charset", "headers", "fresh_until")
+
+    def __init__(
+        self,
+        status: int,
+        body: bytes,
+        content_type: str,
+        charset: Optional[str],
+        headers: Mapping[str, str],
+        fresh_until: float,
+    ):
+        self.status = status
+        self.body = body
+        self.content_type = content_type
+        self.charset = charset
+        self.headers = headers
+        self.fresh_until = fresh_until
+
+    @classmethod
+    def from_response(
+        cls,
+        response: web.Response,
+        timeout: float,
+        extra_headers: Sequence[str] = (),
+    ) -> "CachedResponse":
+        """Entry of `response` fresh for `timeout` seconds, `extra_headers` are cached as well if it has them"""
+        headers = {
+            name: response.headers[name]
+            for name in (*cls.cached_headers, *extra_headers)
+            if name in response.headers
+        }
+        return cls(
+            status=response.status,
+            body=response.body,
+            content_type=response.content_type,
+            charset=response.charset,
+            headers=headers,
+            fresh_until=time.time() + timeout,
+        )
+
+    def to_response(self) -> web.Response:
+        response = web.Response(
+            status=self.status,
+            body=self.body,
+            content_type=self.content_type,
+            charset=self.charset,
+        )
+        response.headers.update(self.headers)
+        return response
+
+    @property
+    def is_fresh(self) -> bool:
+        return time.time() < self.fresh_until
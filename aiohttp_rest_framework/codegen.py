@@ -0,0 +1,431 @@
+"""
+Generation of specialized (de)serialization functions for serializers.
+
+Generic marshmallow `dump` and `load` resolve accessors, defaults, data keys and hooks for every field
+of every row. For serializers with no hooks all of it is known once fields are set up, so a function with
+field accesses unrolled is generated for every fields layout and cached on the serializer class.
+Generated code only depends on the layout, field objects are passed to it when it's bound to an instance.
+"""
+import keyword
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import marshmallow as ma
+from marshmallow.decorators import POST_DUMP, POST_LOAD, PRE_DUMP, PRE_LOAD, VALIDATES, VALIDATES_SCHEMA
+from marshmallow.utils import is_collection
+
+__all__ = (
+    "DumpFunctions",
+    "LoadFunction",
+    "get_dump_functions",
+    "get_row_dump_functions",
+    "get_load_function",
+    "make_record_class",
+)
+
+# `(dump one object, dump many objects)`
+DumpFunctions = Tuple[Callable[[Any], Dict], Callable[[Any], List[Dict]]]
+# `load(data, many)`
+LoadFunction = Callable[[Any, bool], Any]
+
+# (name of the field on serializer, key in output, attribute to read, whether attribute is read, has default)
+_DumpFieldLayout = Tuple[str, str, str, bool, bool]
+# (key in row, key in output, conversion of not null values)
+_RowDumpFieldLayout = Tuple[str, str, Optional[str]]
+# (key in input, attribute to set, whether missing value has to be deserialized, type check of the fast path)
+_LoadFieldLayout = Tuple[str, str, bool, Optional[str]]
+
+
+def get_dump_functions(serializer: ma.Schema) -> Optional[DumpFunctions]:
+    """
+    Generated dump functions bound to `serializer` fields or `None` if serializer can't be compiled,
+    e.g. it has `pre_dump`/`post_dump` hooks or custom attribute getters.
+    """
+    layout = _get_dump_layout(serializer)
+    if layout is None:
+        return None
+    cache = type(serializer).__dict__.get("_dump_functions_cache")
+    if cache is None:
+        cache = {}
+        setattr(type(serializer), "_dump_functions_cache", cache)
+    factory = cache.get(layout)
+    if factory is None:
+        factory = cache[layout] = _compile_dump_factory(layout)
+
+    args = []
+    for field_name, field_obj in serializer.dump_fields.items():
+        args.append(field_obj._serialize)  # noqa
+        if field_obj._CHECK_ATTRIBUTE and field_obj.default is not ma.missing:  # noqa
+            default = field_obj.default
+            args.append(default if callable(default) else _constant(default))
+    return factory(ma.missing, *args)
+
+
+def _constant(value: Any) -> Callable[[], Any]:
+    return lambda: value
+
+
+def _get_dump_layout(serializer: ma.Schema) -> Optional[Tuple[_DumpFieldLayout, ...]]:
+    if serializer._has_processors(PRE_DUMP) or serializer._has_processors(POST_DUMP):  # noqa
+        return None
+    if type(serializer).get_attribute is not ma.Schema.get_attribute:
+        return None
+    layout = []
+    for field_name, field_obj in serializer.dump_fields.items():
+        field_cls = type(field_obj)
+        if field_cls.serialize is not ma.fields.Field.serialize or field_cls.get_value is not ma.fields.Field.get_value:
+            return None
+        attribute = field_obj.attribute or field_name
+        if "." in attribute:  # nested attributes are resolved by marshmallow's `get_value`
+            return None
+        data_key = field_obj.data_key if field_obj.data_key is not None else field_name
+        check_attribute = field_obj._CHECK_ATTRIBUTE  # noqa
+        has_default = check_attribute and field_obj.default is not ma.missing
+        layout.append((field_name, data_key, attribute, check_attribute, has_default))
+    return tuple(layout)
+
+
+def _compile_dump_factory(layout: Tuple[_DumpFieldLayout, ...]) -> Callable[..., DumpFunctions]:
+    """
+    Generate a factory of dump functions for the fields `layout`, e.g. for one plain field `name`:
+
+        def factory(missing, serialize_0):
+            def dump_one(obj):
+                ret = {}
+                value = getattr(obj, "name", missing)
+                if value is not missing:
+                    value = serialize_0(value, "name", obj)
+                    if value is not missing:
+                        ret["name"] = value
+                return ret
+            ...
+    """
+    params = ["missing"]
+    body = ["ret = {}"]
+    for index, (field_name, data_key, attribute, check_attribute, has_default) in enumerate(layout):
+        serialize = f"serialize_{index}"
+        params.append(serialize)
+        if not check_attribute:  # e.g. method fields, they get the whole object
+            body.append(f"value = {serialize}(None, {field_name!r}, obj)")
+            body.append("if value is not missing:")
+            body.append(f"    ret[{data_key!r}] = value")
+            continue
+        body.append(f"value = getattr(obj, {attribute!r}, missing)")
+        if has_default:
+            default = f"default_{index}"
+            params.append(default)
+            body.append("if value is missing:")
+            body.append(f"    value = {default}()")
+        body.append("if value is not missing:")
+        body.append(f"    value = {serialize}(value, {field_name!r}, obj)")
+        body.append("    if value is not missing:")
+        body.append(f"        ret[{data_key!r}] = value")
+
+    lines = [f"def factory({', '.join(params)}):"]
+    lines.append("    def dump_one(obj):")
+    lines.extend(f"        {line}" for line in body)
+    lines.append("        return ret")
+    lines.append("    def dump_many(objs):")
+    lines.append("        result = []")
+    lines.append("        append = result.append")
+    lines.append("        for obj in objs:")
+    lines.extend(f"            {line}" for line in body)
+    lines.append("            append(ret)")
+    lines.append("        return result")
+    lines.append("    return dump_one, dump_many")
+
+    namespace: Dict[str, Any] = {}
+    exec(compile("\n".join(lines), "<aiohttp_rest_framework.codegen dump>", "exec"), namespace)
+    return namespace["factory"]
+
+
+def get_row_dump_functions(serializer: ma.Schema) -> Optional[DumpFunctions]:
+    """
+    Generated functions dumping database rows (mappings of column name to value, e.g. `Row._mapping`)
+    bound to `serializer` fields, or `None` if serializer can't be compiled.
+    Every dumped field has to read a column, row values are converted by column type without calling
+    fields at all where it's known how, e.g. uuids are just stringified and datetimes are `isoformat()`-ed.
+    """
+    layout = _get_row_dump_layout(serializer)
+    if layout is None:
+        return None
+    cache = type(serializer).__dict__.get("_row_dump_functions_cache")
+    if cache is None:
+        cache = {}
+        setattr(type(serializer), "_row_dump_functions_cache", cache)
+    factory = cache.get(layout)
+    if factory is None:
+        factory = cache[layout] = _compile_row_dump_factory(layout)
+    return factory(*(field_obj._serialize for field_obj in serializer.dump_fields.values()))  # noqa
+
+
+def _get_row_dump_layout(serializer: ma.Schema) -> Optional[Tuple[_RowDumpFieldLayout, ...]]:
+    if _get_dump_layout(serializer) is None:
+        return None
+    layout = []
+    for field_name, field_obj in serializer.dump_fields.items():
+        if not field_obj._CHECK_ATTRIBUTE:  # noqa
+            return None
+        data_key = field_obj.data_key if field_obj.data_key is not None else field_name
+        layout.append((field_obj.attribute or field_name, data_key, _get_row_conversion(field_obj)))
+    return tuple(layout)
+
+
+def _get_row_conversion(field_obj: ma.fields.Field) -> Optional[str]:
+    """
+    Expression converting not null column `value` the same way field's `_serialize` does,
+    `None` means value is taken as is and "serialize" means that the field has to be called
+    """
+    field_cls = type(field_obj)
+    if field_cls._serialize is ma.fields.String._serialize:
+        # uuid columns may be read as `uuid.UUID`, strings are already strings
+        return "str(value)" if isinstance(field_obj, ma.fields.UUID) else None
+    if field_cls._serialize is ma.fields.Number._serialize and not field_obj.as_string:
+        if field_cls._format_num is ma.fields.Number._format_num and field_cls.num_type in (int, float):
+            return None
+    if field_cls._serialize is ma.fields.Boolean._serialize:
+        return None
+    for base in (ma.fields.DateTime, ma.fields.Date, ma.fields.Time):
+        if isinstance(field_obj, base) and field_cls._serialize is base._serialize:
+            if (field_obj.format or field_cls.DEFAULT_FORMAT) in ("iso", "iso8601"):
+                return "value.isoformat()"
+    return "serialize"
+
+
+def _compile_row_dump_factory(layout: Tuple[_RowDumpFieldLayout, ...]) -> Callable[..., DumpFunctions]:
+    """
+    Generate a factory of row dump functions for the fields `layout`, e.g. for uuid `id` and datetime `created`:
+
+        def factory(serialize_0, serialize_1):
+            def dump_one(row):
+                ret = {}
+                value = row["id"]
+                ret["id"] = None if value is None else str(value)
+                value = row["created"]
+                ret["created"] = None if value is None else value.isoformat()
+                return ret
+            ...
+    """
+    params = []
+    body = ["ret = {}"]
+    for index, (key, data_key, conversion) in enumerate(layout):
+        serialize = f"serialize_{index}"
+        params.append(serialize)
+        if conversion is None:
+            body.append(f"ret[{data_key!r}] = row[{key!r}]")
+            continue
+        body.append(f"value = row[{key!r}]")
+        if conversion == "serialize":
+            body.append(f"ret[{data_key!r}] = {serialize}(value, {key!r}, row)")
+        else:
+            body.append(f"ret[{data_key!r}] = None if value is None else {conversion}")
+
+    lines = [f"def factory({', '.join(params)}):"]
+    lines.append("    def dump_one(row):")
+    lines.extend(f"        {line}" for line in body)
+    lines.append("        return ret")
+    lines.append("    def dump_many(rows):")
+    lines.append("        result = []")
+    lines.append("        append = result.append")
+    lines.append("        for row in rows:")
+    lines.extend(f"            {line}" for line in body)
+    lines.append("            append(ret)")
+    lines.append("        return result")
+    lines.append("    return dump_one, dump_many")
+
+    namespace: Dict[str, Any] = {}
+    exec(compile("\n".join(lines), "<aiohttp_rest_framework.codegen row dump>", "exec"), namespace)
+    return namespace["factory"]
+
+
+def get_load_function(serializer: ma.Schema) -> Optional[LoadFunction]:
+    """
+    Generated load function bound to `serializer` fields or `None` if serializer can't be compiled,
+    e.g. it has load/validation hooks or doesn't exclude unknown fields.
+    Field validators are still run, but only for fields that have them.
+    """
+    layout = _get_load_layout(serializer)
+    if layout is None:
+        return None
+    cache = type(serializer).__dict__.get("_load_functions_cache")
+    if cache is None:
+        cache = {}
+        setattr(type(serializer), "_load_functions_cache", cache)
+    factory = cache.get(layout)
+    if factory is None:
+        factory = cache[layout] = _compile_load_factory(layout)
+
+    deserializers = [field_obj.deserialize for field_obj in serializer.load_fields.values()]
+    load_one = factory(ma.missing, Mapping, ma.ValidationError, [serializer.error_messages["type"]], *deserializers)
+    partial = serializer.partial
+    kwargs = {"partial": partial} if partial is not None else {}
+
+    def load(data: Any, many: bool) -> Any:
+        errors: Dict[Any, Any] = {}
+        if not many:
+            result = load_one(data, partial, kwargs, errors)
+        else:
+            result = []
+            for index, item in enumerate(data):
+                item_errors: Dict[str, Any] = {}
+                result.append(load_one(item, partial, kwargs, item_errors))
+                if item_errors:
+                    errors[index] = item_errors
+        if errors:
+            raise ma.ValidationError(errors, data=data, valid_data=result)
+        return result
+
+    return load
+
+
+def _get_load_layout(serializer: ma.Schema) -> Optional[Tuple[_LoadFieldLayout, ...]]:
+    for tag in (PRE_LOAD, POST_LOAD, VALIDATES, VALIDATES_SCHEMA):
+        if serializer._has_processors(tag):  # noqa
+            return None
+    if type(serializer).handle_error is not ma.Schema.handle_error:
+        return None
+    if serializer.unknown != ma.EXCLUDE or not serializer.opts.index_errors or is_collection(serializer.partial):
+        return None
+    layout = []
+    for field_name, field_obj in serializer.load_fields.items():
+        if type(field_obj).deserialize is not ma.fields.Field.deserialize:
+            return None
+        attribute = field_obj.attribute or field_name
+        if "." in attribute:  # nested attributes are set by marshmallow's `set_value`
+            return None
+        data_key = field_obj.data_key if field_obj.data_key is not None else field_name
+        # not required fields without `missing` are just skipped when there is no value
+        deserialize_missing = field_obj.required or field_obj.missing is not ma.missing
+        layout.append((data_key, attribute, deserialize_missing, _get_fast_path(field_obj)))
+    return tuple(layout)
+
+
+def _get_fast_path(field_obj: ma.fields.Field) -> Optional[str]:
+    """
+    Check of raw value for which field's deserialization would return the value as is,
+    so the field doesn't have to be called at all
+    """
+    if field_obj.validators:
+        return None
+    field_cls = type(field_obj)
+    if isinstance(field_obj, ma.fields.String) and field_cls._deserialize is ma.fields.String._deserialize:
+        return "value.__class__ is str"
+    if isinstance(field_obj, ma.fields.Integer) and field_cls._deserialize is ma.fields.Integer._deserialize:
+        if field_cls._validated is ma.fields.Integer._validated:
+            return "value.__class__ is int"
+    if isinstance(field_obj, ma.fields.Boolean) and field_cls._deserialize is ma.fields.Boolean._deserialize:
+        if not field_obj.truthy or (True in field_obj.truthy and False in field_obj.falsy):
+            return "value is True or value is False"
+    return None
+
+
+def _compile_load_factory(layout: Tuple[_LoadFieldLayout, ...]) -> Callable[..., Callable]:
+    """
+    Generate a factory of load function for the fields `layout`, e.g. for one required string field `name`:
+
+        def factory(missing, Mapping, ValidationError, type_error, deserialize_0):
+            def load_one(data, partial, kwargs, errors):
+                ret = {}
+                if not isinstance(data, Mapping):
+                    errors["_schema"] = type_error
+                    return ret
+                get = data.get
+                value = get("name", missing)
+                if value is missing:
+                    if not partial:
+                        <deserialize with the field, it reports the missing value>
+                elif value.__class__ is str:
+                    ret["name"] = value
+                else:
+                    <deserialize with the field>
+                return ret
+            return load_one
+    """
+    params = ["missing", "Mapping", "ValidationError", "type_error"]
+    body = [
+        "ret = {}",
+        "if not isinstance(data, Mapping):",
+        "    errors['_schema'] = type_error",
+        "    return ret",
+        "get = data.get",
+    ]
+    for index, (data_key, attribute, deserialize_missing, fast_path) in enumerate(layout):
+        deserialize = f"deserialize_{index}"
+        params.append(deserialize)
+        call = [
+            "try:",
+            f"    value = {deserialize}(value, {data_key!r}, data, **kwargs)",
+            "except ValidationError as error:",
+            f"    errors[{data_key!r}] = error.messages",
+            "    value = error.valid_data or missing",
+            "if value is not missing:",
+            f"    ret[{attribute!r}] = value",
+        ]
+        body.append(f"value = get({data_key!r}, missing)")
+        if deserialize_missing:
+            body.append("if value is missing:")
+            body.append("    if not partial:")
+            body.extend(f"        {line}" for line in call)
+            body.append("elif " if fast_path else "else:")
+        else:
+            body.append("if value is not missing:" if not fast_path else "if value is missing:")
+            if fast_path:
+                body.append("    pass")
+                body.append("elif ")
+        if fast_path:
+            body[-1] += f"{fast_path}:"
+            body.append(f"    ret[{attribute!r}] = value")
+            body.append("else:")
+        body.extend(f"    {line}" for line in call)
+
+    lines = [f"def factory({', '.join(params)}):"]
+    lines.append("    def load_one(data, partial, kwargs, errors):")
+    lines.extend(f"        {line}" for line in body)
+    lines.append("        return ret")
+    lines.append("    return load_one")
+
+    namespace: Dict[str, Any] = {}
+    exec(compile("\n".join(lines), "<aiohttp_rest_framework.codegen load>", "exec"), namespace)
+    return namespace["factory"]
+
+
+def make_record_class(name: str, fields: Sequence[str]) -> Optional[type]:
+    """
+    Generate a plain class with `__slots__` for `fields`, it's built from positional values in
+    `fields` order, e.g. `UserRecord(*row)`. Records aren't tracked by anything, so they are much
+    cheaper than ORM instances for rows that are only dumped. `None` if a field isn't a valid identifier.
+    Classes are cached by name and fields, records are picklable as long as their values are.
+    """
+    key = (name, tuple(fields))
+    if key in _record_classes:
+        return _record_classes[key]
+    if not all(field.isidentifier() and not keyword.iskeyword(field) for field in fields):
+        _record_classes[key] = None
+        return None
+    params = [f"_{index}" for index in range(len(fields))]
+    values = "".join(f"self.{field}, " for field in fields)
+    lines = [f"def __init__(self{''.join(f', {param}' for param in params)}):"]
+    lines.extend(f"    self.{field} = {param}" for field, param in zip(fields, params))
+    if not fields:
+        lines.append("    pass")
+    lines.append("def __repr__(self):")
+    lines.append(f"    return f'<{name} " + " ".join(f"{field}={{self.{field}!r}}" for field in fields) + ">'")
+    lines.append("def __reduce__(self):")
+    lines.append(f"    return _make_record, (name, fields, ({values}))")
+
+    namespace: Dict[str, Any] = {"_make_record": _make_record, "name": name, "fields": key[1]}
+    exec(compile("\n".join(lines), "<aiohttp_rest_framework.codegen record>", "exec"), namespace)
+    record_class = _record_classes[key] = type(name, (), {
+        "__slots__": key[1],
+        "__init__": namespace["__init__"],
+        "__repr__": namespace["__repr__"],
+        "__reduce__": namespace["__reduce__"],
+    })
+    return record_class
+
+
+_record_classes: Dict[Tuple[str, Tuple[str, ...]], Optional[type]] = {}
+
+
+def _make_record(name: str, fields: Tuple[str, ...], values: Tuple) -> Any:
+    """Rebuild unpickled record, record classes are generated, so they can't be imported by pickle"""
+    return make_record_class(name, fields)(*values)
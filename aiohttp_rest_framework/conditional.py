@@ -0,0 +1,76 @@
+import datetime
+import hashlib
+from typing import Any, List, Optional, Tuple
+
+from aiohttp import hdrs, web
+
+__all__ = (
+    "etag_from_body",
+    "etag_from_version",
+    "version_from_etag",
+    "parse_etags",
+    "etag_matches",
+    "is_not_modified",
+)
+
+
+def etag_from_body(body: bytes) -> str:
+    """Strong ETag computed from response body"""
+    return f'"{hashlib.blake2b(body, digest_size=16).hexdigest()}"'
+
+
+def etag_from_version(version: Any) -> str:
+    """Strong ETag computed from object's version (e.g. version number or `updated_at` column)"""
+    if isinstance(version, (datetime.datetime, datetime.date, datetime.time)):
+        version = version.isoformat()
+    return f'"{version}"'
+
+
+def version_from_etag(etag: str) -> str:
+    return etag.strip('"')
+
+
+def parse_etags(header: Optional[str]) -> List[Tuple[str, bool]]:
+    """Parse `If-Match`/`If-None-Match` header into a list of `(etag, is_weak)` tuples"""
+    if not header:
+        return []
+    etags = []
+    for etag in header.split(","):
+        etag = etag.strip()
+        if not etag:
+            continue
+        is_weak = etag.startswith("W/")
+        etags.append((etag[2:] if is_weak else etag, is_weak))
+    return etags
+
+
+def etag_matches(etag: str, header: Optional[str], weak: bool = False) -> bool:
+    """
+    Check if `etag` matches any of etags from the `header`.
+    Weak comparison is used for `If-None-Match`, strong one for `If-Match`.
+    """
+    for candidate, is_weak in parse_etags(header):
+        if candidate == "*":
+            return True
+        if is_weak and not weak:
+            continue
+        if candidate == etag:
+            return True
+    return False
+
+
+def is_not_modified(
+    request: web.Request,
+    etag: Optional[str],
+    last_modified: Optional[datetime.datetime] = None,
+) -> bool:
+    """Check `If-None-Match` and `If-Modified-Since` headers of a read request"""
+    if_none_match = request.headers.get(hdrs.IF_NONE_MATCH)
+    if if_none_match is not None:
+        # `If-Modified-Since` is ignored if `If-None-Match` is present
+        return etag is not None and etag_matches(etag, if_none_match, weak=True)
+    if last_modified is not None and request.if_modified_since is not None:
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=datetime.timezone.utc)
+        return last_modified.replace(microsecond=0) <= request.if_modified_since
+    return False
@@ -1,4 +1,4 @@
-from typing import Generic, List, TypeVar
+from typing import Generic, List, TypeVar, Union
 
 T = TypeVar("T")
 
@@ -16,8 +16,23 @@ class BaseDBManager(Generic[T]):
     async def create(self, *args, **kwargs) -> T:
         raise NotImplementedError()
 
+    async def bulk_create(self, *args, **kwargs) -> List[T]:
+        raise NotImplementedError()
+
     async def update(self, *args, **kwargs) -> T:
         raise NotImplementedError()
 
+    async def update_by(self, *args, **kwargs) -> T:
+        raise NotImplementedError()
+
+    async def bulk_update(self, *args, **kwargs) -> Union[int, List[T]]:
+        raise NotImplementedError()
+
     async def delete(self, *args, **kwargs) -> None:
         raise NotImplementedError()
+
+    async def delete_by(self, *args, **kwargs) -> None:
+        raise NotImplementedError()
+
+    async def bulk_delete(self, *args, **kwargs) -> Union[int, List[T]]:
+        raise NotImplementedError()
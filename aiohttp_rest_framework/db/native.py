@@ -0,0 +1,446 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import (
+    Any,
+    AsyncContextManager,
+    AsyncIterator,
+    Dict,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    Union,
+)
+from weakref import WeakKeyDictionary
+
+import asyncpg
+from asyncpg import DataError, ForeignKeyViolationError, NotNullViolationError, PostgresError, UndefinedFunctionError
+from sqlalchemy import Column, Float, Numeric, any_, bindparam, insert
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.engine import Dialect, Engine
+from sqlalchemy.exc import MultipleResultsFound, NoResultFound, SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.sql import Executable
+from sqlalchemy.sql.elements import ClauseElement
+from sqlalchemy.sql.selectable import Select
+from sqlalchemy.sql.type_api import TypeEngine
+
+from aiohttp_rest_framework.db.sa import SAManager, _session_scope
+from aiohttp_rest_framework.exceptions import FieldValidationError, UniqueViolationError
+
+__all__ = (
+    "NativeManager",
+    "AsyncpgManager",
+    "NativeStatement",
+    "NativeRow",
+    "NativeResult",
+    "get_asyncpg_pool",
+    "close_asyncpg_pools",
+)
+
+# oids of postgres types asyncpg dialect's numeric result processors depend on
+FLOAT8_OID = 701
+NUMERIC_OID = 1700
+
+_pools: "WeakKeyDictionary[Engine, asyncio.Future]" = WeakKeyDictionary()
+
+
+async def get_asyncpg_pool(engine: AsyncEngine, config) -> asyncpg.Pool:
+    """
+    asyncpg pool of `engine`'s database, it's created on first use with config's pool settings:
+    at most `pool_size + max_overflow` connections, each of them keeps up to `prepared_statement_cache_size`
+    (query parameter of database url, 100 by default) prepared statements.
+    """
+    sync_engine = engine.sync_engine
+    future = _pools.get(sync_engine)
+    if future is None:
+        future = _pools[sync_engine] = asyncio.ensure_future(_create_pool(sync_engine, config))
+    try:
+        # a cancelled request must not cancel creation of the pool other requests wait for
+        return await asyncio.shield(future)
+    except Exception:
+        if _pools.get(sync_engine) is future:
+            del _pools[sync_engine]
+        raise
+
+
+async def _create_pool(engine: Engine, config) -> asyncpg.Pool:
+    url = engine.url
+    pool_size = config.pool_size if config.pool_size is not None else 5
+    max_overflow = config.max_overflow if config.max_overflow is not None else 10
+    return await asyncpg.create_pool(
+        user=url.username,
+        password=url.password,
+        host=url.host,
+        port=url.port,
+        database=url.database,
+        min_size=0,
+        max_size=max(pool_size + max(max_overflow, 0), 1),
+        statement_cache_size=int(url.query.get("prepared_statement_cache_size", 100)),
+    )
+
+
+async def close_asyncpg_pools(*_args) -> None:
+    """Close pools of all engines, e.g. `app.on_cleanup.append(close_asyncpg_pools)`"""
+    futures = list(_pools.values())
+    _pools.clear()
+    for pool in await asyncio.gather(*futures, return_exceptions=True):
+        if isinstance(pool, asyncpg.Pool):
+            await pool.close()
+
+
+class NativeRow:
+    """Result row of `AsyncpgManager`, values are accessed by index, column name or attribute like `Row`'s"""
+
+    __slots__ = ("_keymap", "_values")
+
+    def __init__(self, keymap: Mapping[str, int], values: Sequence[Any]):
+        self._keymap = keymap
+        self._values = values
+
+    @property
+    def _fields(self) -> Tuple[str, ...]:
+        return tuple(self._keymap)
+
+    @property
+    def _mapping(self) -> Dict[str, Any]:
+        return dict(zip(self._keymap, self._values))
+
+    def _asdict(self) -> Dict[str, Any]:
+        return self._mapping
+
+    def __getattr__(self, name: str) -> Any:
+        if name in NativeRow.__slots__:  # not set yet, e.g. while unpickling
+            raise AttributeError(name)
+        try:
+            return self._values[self._keymap[name]]
+        except KeyError:
+            raise AttributeError(name)
+
+    def __getitem__(self, key: Union[int, slice, str]) -> Any:
+        if isinstance(key, str):
+            return self._values[self._keymap[key]]
+        return self._values[key]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._values)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __eq__(self, other: Any) -> bool:
+        return tuple(self) == tuple(other) if isinstance(other, (NativeRow, tuple)) else NotImplemented
+
+    def __repr__(self) -> str:
+        return repr(tuple(self._values))
+
+
+class NativeResult:
+    """Rows of a statement run by `AsyncpgManager` with methods of SQLAlchemy's `Result` db managers use"""
+
+    def __init__(self, rows: List[Any], rowcount: int):
+        self.rows = rows
+        self.rowcount = rowcount
+
+    def all(self) -> List[Any]:
+        return self.rows
+
+    def one_or_none(self) -> Optional[Any]:
+        if len(self.rows) > 1:
+            raise MultipleResultsFound("Multiple rows were found when one or none was required")
+        return self.rows[0] if self.rows else None
+
+    def one(self) -> Any:
+        if not self.rows:
+            raise NoResultFound("No row was found when one was required")
+        if len(self.rows) > 1:
+            raise MultipleResultsFound("Multiple rows were found when exactly one was required")
+        return self.rows[0]
+
+    def scalar_one(self) -> Any:
+        return self.one()[0]
+
+
+class NativeStatement:
+    """
+    Statement compiled for a driver: SQL with driver's placeholders, processors of its parameters and result columns.
+    Parameters are processed the way SQLAlchemy's execution context does it, with column types' processors
+    of the dialect and python side column defaults.
+    """
+
+    def __init__(self, statement: Executable, dialect: Dialect):
+        self.dialect = dialect
+        self.compiled = compiled = statement.compile(dialect=dialect)
+        self.is_dml = compiled.isinsert or compiled.isupdate or compiled.isdelete
+        self.returns_rows = not self.is_dml or bool(compiled.returning)
+        self.defaults = [(column.key, column.default) for column in compiled.insert_prefetch]
+        self.defaults.extend((column.key, column.onupdate) for column in compiled.update_prefetch)
+        # expanding parameters (e.g. `IN` of literal values) are rendered on every execution
+        self.expanding = bool(compiled.post_compile_params or compiled.literal_execute_params)
+        if not self.expanding:
+            self.sql = self._get_sql(compiled.string, len(compiled.positiontup))
+            self.arguments = [(key, compiled._bind_processors.get(key)) for key in compiled.positiontup]  # noqa
+        self.keymap = {column[0]: index for index, column in enumerate(compiled._result_columns)}  # noqa
+        processors = [self._get_result_processor(column[3]) for column in compiled._result_columns]  # noqa
+        self.result_processors = processors if any(processors) else None
+
+    def _get_sql(self, statement: str, count: int) -> str:
+        if self.dialect.paramstyle != "format":
+            return statement
+        # asyncpg dialect compiles `format` style placeholders (literal `%` are escaped as `%%`), asyncpg takes `$n`
+        return statement % tuple(f"${index}" for index in range(1, count + 1))
+
+    def _get_result_processor(self, type_: TypeEngine):
+        coltype = None
+        if isinstance(type_, Numeric):  # the column is assumed to be of its declared type
+            coltype = FLOAT8_OID if isinstance(type_, Float) else NUMERIC_OID
+        return type_.dialect_impl(self.dialect).result_processor(self.dialect, coltype)
+
+    def get_arguments(self, parameters: Optional[Mapping] = None) -> Tuple[str, List[Any]]:
+        """SQL and positional arguments for `parameters` values of bind parameters"""
+        params = self.compiled.construct_params(parameters)
+        for key, default in self.defaults:
+            params[key] = default.arg(None) if default.is_callable else default.arg
+        if self.expanding:
+            state = self.compiled._process_parameters_for_postcompile(params)  # noqa
+            processors = {**self.compiled._bind_processors, **state.processors}  # noqa
+            sql = self._get_sql(state.statement, len(state.positiontup))
+            arguments = [(key, processors.get(key)) for key in state.positiontup]
+        else:
+            sql, arguments = self.sql, self.arguments
+        return sql, [params[key] if processor is None else processor(params[key]) for key, processor in arguments]
+
+    def to_rows(self, records: Sequence[Sequence[Any]], names: Optional[Sequence[str]] = None) -> List[NativeRow]:
+        """
+        Rows of driver's `records`, `names` of their columns are only needed for textual statements
+        (their columns aren't known), they are taken from `records` (e.g. asyncpg records) if not passed
+        """
+        if not records:
+            return []
+        keymap = self.keymap
+        if len(keymap) != len(records[0]):
+            keymap = {key: index for index, key in enumerate(names if names is not None else records[0].keys())}
+        if self.result_processors is None:
+            return [NativeRow(keymap, tuple(record)) for record in records]
+        processors = self.result_processors
+        return [
+            NativeRow(keymap, tuple(value if processor is None else processor(value)
+                                    for processor, value in zip(processors, record)))
+            for record in records
+        ]
+
+
+class NativeManager(SAManager):
+    """
+    Base class of db managers of `SAManager`'s API running statements on driver's connections
+    instead of SQLAlchemy sessions. Statements are still built of model's table and compiled by SQLAlchemy,
+    but only once per statement (cached ones are compiled once in total). Rows are converted with
+    column types' result processors, there is no ORM layer and no greenlet bridging in between.
+    Subclasses provide connections and run compiled statements on them.
+    """
+
+    # errors of the driver and its database, they are translated with `_get_native_exception()`
+    driver_errors: Tuple[Type[Exception], ...] = ()
+
+    def __init__(self, config, model, use_records: Optional[bool] = None) -> None:
+        super().__init__(config, model, use_records=use_records)
+        self._compiled: "WeakKeyDictionary[Executable, NativeStatement]" = WeakKeyDictionary()
+
+    async def bulk_create(
+        self,
+        values: Sequence[Mapping],
+        columns: Optional[Sequence[str]] = None,
+        chunk_size: int = 1000,
+    ) -> List[Any]:
+        if self._in_session_scope(await self.get_engine()):
+            return await super().bulk_create(values, columns, chunk_size)
+        returning = self._get_returning(columns)
+        instances = []
+        engine = await self.get_engine()
+        async with self.connection(engine, transaction=True) as connection:
+            for chunk in self._get_bulk_chunks(values, chunk_size):
+                query = insert(self.model).values(chunk).returning(*returning)
+                result = await self._run(connection, engine, query)
+                instances.extend(self.to_model_instance(row) for row in result.rows)
+        return instances
+
+    async def execute(
+        self,
+        query: Executable,
+        parameters: Optional[Mapping] = None,
+        operation: Optional[str] = None,
+        no_scalars: bool = False,
+        read: bool = False,
+    ) -> Any:
+        """Execute `query` on a connection of `connection()`, `read` ones may be routed to a replica"""
+        primary = await self.get_engine()
+        if self._in_session_scope(primary):
+            return await super().execute(query, parameters, operation, no_scalars, read)
+        engine = await self.get_read_engine() if read else primary
+        async with self.connection(engine) as connection:
+            result = await self._run(connection, engine, query, parameters)
+        if not operation:
+            return result
+        if not no_scalars and not self._is_core:
+            result.rows = [self.model(**row._asdict()) for row in result.rows]
+        try:
+            return getattr(result, operation)()
+        except SQLAlchemyError as exc:
+            raise self._get_exception(exc)
+
+    def connection(self, engine, transaction: bool = False) -> AsyncContextManager:
+        """Async context manager of `engine`'s connection, statements run in a transaction with `transaction`"""
+        raise NotImplementedError("`connection()` must be implemented.")
+
+    async def _stream(
+        self,
+        engine,
+        query: Select,
+        chunk_size: int,
+        columns: Optional[Sequence[str]],
+        as_records: bool,
+    ) -> AsyncIterator[List[Any]]:
+        statement = self.get_native_statement(query, engine)
+        async with self.connection(engine, transaction=True) as connection:
+            sql, arguments = self._get_arguments(statement)
+            try:
+                async for records, names in self._fetch_chunks(connection, sql, arguments, chunk_size):
+                    partition = statement.to_rows(records, names)
+                    if as_records:
+                        partition = self.to_records(partition)
+                    elif not self._is_core:
+                        partition = [self.to_model_instance(row) for row in partition]
+                    yield partition
+            except self.driver_errors as exc:
+                raise self._get_native_exception(exc)
+
+    def _fetch_chunks(
+        self,
+        connection: Any,
+        sql: str,
+        arguments: List[Any],
+        chunk_size: int,
+    ) -> AsyncIterator[Tuple[Sequence[Any], Optional[Sequence[str]]]]:
+        """Iterate over non empty chunks of records read with a cursor and names of their columns"""
+        raise NotImplementedError("`_fetch_chunks()` must be implemented.")
+
+    def get_dialect(self, engine) -> Dialect:
+        return engine.sync_engine.dialect
+
+    def get_native_statement(self, query: Executable, engine) -> NativeStatement:
+        """`query` compiled for `engine`, it's compiled once as long as the statement object is alive"""
+        statement = self._compiled.get(query)
+        if statement is None:
+            statement = self._compiled[query] = NativeStatement(query, self.get_dialect(engine))
+        return statement
+
+    async def _run(
+        self,
+        connection: Any,
+        engine,
+        query: Executable,
+        parameters: Optional[Mapping] = None,
+    ) -> NativeResult:
+        statement = self.get_native_statement(query, engine)
+        sql, arguments = self._get_arguments(statement, parameters)
+        try:
+            return await self._run_statement(connection, statement, sql, arguments)
+        except self.driver_errors as exc:
+            raise self._get_native_exception(exc)
+
+    async def _run_statement(
+        self,
+        connection: Any,
+        statement: NativeStatement,
+        sql: str,
+        arguments: List[Any],
+    ) -> NativeResult:
+        raise NotImplementedError("`_run_statement()` must be implemented.")
+
+    @staticmethod
+    def _get_arguments(statement: NativeStatement, parameters: Optional[Mapping] = None) -> Tuple[str, List[Any]]:
+        try:
+            return statement.get_arguments(parameters)
+        except SQLAlchemyError:
+            raise
+        except Exception as exc:  # a value is rejected by column type's processor, e.g. malformed uuid
+            raise FieldValidationError(str(exc))
+
+    def _in_session_scope(self, primary) -> bool:
+        scope = _session_scope.get()
+        return scope is not None and scope.engine is primary and not scope.closed
+
+    def _get_native_exception(self, exc: Exception) -> Exception:
+        return exc
+
+    def _get_returning(self, columns: Optional[Sequence[str]] = None) -> List[ClauseElement]:
+        # columns of `RETURNING *` have no types to convert their values with
+        return self.get_columns(columns)
+
+
+class AsyncpgManager(NativeManager):
+    """
+    Db manager running statements on asyncpg pools (see `get_asyncpg_pool()`) of engines' databases,
+    so asyncpg reuses its prepared statements and binary codecs of the connection.
+    Single statements run in autocommit mode.
+    Statements within `session_scope()` run in its session, so they share its transaction.
+    """
+
+    driver_errors = (PostgresError, ValueError)
+
+    @asynccontextmanager
+    async def connection(self, engine: AsyncEngine, transaction: bool = False) -> AsyncIterator[asyncpg.Connection]:
+        pool = await get_asyncpg_pool(engine, self.config)
+        async with pool.acquire(timeout=self.config.pool_timeout) as connection:
+            if not transaction:
+                yield connection
+                return
+            async with connection.transaction():
+                yield connection
+
+    async def _fetch_chunks(
+        self,
+        connection: asyncpg.Connection,
+        sql: str,
+        arguments: List[Any],
+        chunk_size: int,
+    ) -> AsyncIterator[Tuple[Sequence[Any], Optional[Sequence[str]]]]:
+        cursor = await connection.cursor(sql, *arguments)
+        while True:
+            records = await cursor.fetch(chunk_size)
+            if not records:
+                break
+            yield records, None
+
+    async def _run_statement(
+        self,
+        connection: asyncpg.Connection,
+        statement: NativeStatement,
+        sql: str,
+        arguments: List[Any],
+    ) -> NativeResult:
+        if statement.returns_rows:
+            rows = statement.to_rows(await connection.fetch(sql, *arguments))
+            return NativeResult(rows, len(rows))
+        status = await connection.execute(sql, *arguments)
+        # command tag, e.g. "UPDATE 2"
+        return NativeResult([], int(status.rpartition(" ")[2]) if status[-1:].isdigit() else -1)
+
+    def _get_native_exception(self, exc: Exception) -> Exception:
+        # asyncpg can't encode a value (its `DataError` is `ValueError` too) or postgres rejected it
+        if isinstance(exc, (ValueError, DataError, UndefinedFunctionError)):
+            return FieldValidationError(str(exc))
+        if isinstance(exc, (NotNullViolationError, ForeignKeyViolationError)):
+            return FieldValidationError(str(exc))
+        if isinstance(exc, asyncpg.UniqueViolationError):
+            return UniqueViolationError(str(exc))
+        return exc
+
+    def _get_bound_clause(self, column: Column, lookup: str, name: str) -> ClauseElement:
+        if lookup == "in":
+            # a single array parameter keeps SQL (and prepared statement) the same for any number of values
+            return column == any_(bindparam(name, type_=ARRAY(column.type)))
+        return super()._get_bound_clause(column, lookup, name)
@@ -0,0 +1,110 @@
+import bisect
+import time
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.pool import AsyncAdaptedQueuePool, Pool
+
+__all__ = (
+    "PoolStats",
+    "InstrumentedQueuePool",
+    "get_pool_options",
+    "collect_pool_stats",
+)
+
+
+class PoolStats:
+    """
+    Checkout statistics of a connection pool. Checkout time includes waiting for a connection to be returned
+    to an exhausted pool, opening new connections and pre-ping, histogram counts checkouts per time bucket.
+    """
+
+    # upper bounds of histogram buckets in seconds, the last bucket holds longer checkouts
+    buckets = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0)
+
+    def __init__(self):
+        self.checkouts = 0
+        # checkouts from exhausted pool, i.e. waiting for a connection to be returned
+        self.waits = 0
+        self.wait_time = 0.0
+        self.timeouts = 0
+        self.checkout_time = 0.0
+        self.max_checkout_time = 0.0
+        self.histogram: List[int] = [0] * (len(self.buckets) + 1)
+
+    def observe(self, duration: float, waited: bool) -> None:
+        self.checkouts += 1
+        self.checkout_time += duration
+        self.max_checkout_time = max(self.max_checkout_time, duration)
+        self.histogram[bisect.bisect_left(self.buckets, duration)] += 1
+        if waited:
+            self.waits += 1
+            self.wait_time += duration
+
+    def to_dict(self) -> Dict[str, Any]:
+        bounds = [str(bound) for bound in self.buckets] + ["inf"]
+        return {
+            "checkouts": self.checkouts,
+            "waits": self.waits,
+            "wait_time": self.wait_time,
+            "timeouts": self.timeouts,
+            "checkout_time": self.checkout_time,
+            "max_checkout_time": self.max_checkout_time,
+            "checkout_time_histogram": dict(zip(bounds, self.histogram)),
+        }
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """Queue pool of asyncio drivers collecting `PoolStats` of connection checkouts"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def connect(self):
+        waited = self.checkedin() == 0 and 0 <= self._max_overflow <= self.overflow()
+        started_at = time.perf_counter()
+        try:
+            connection = super().connect()
+        except PoolTimeoutError:
+            self.stats.timeouts += 1
+            raise
+        self.stats.observe(time.perf_counter() - started_at, waited)
+        return connection
+
+
+def get_pool_options(db_url: str, config) -> Dict[str, Any]:
+    """
+    `create_async_engine()` arguments for pool settings of `config`. Size, overflow and timeout only apply
+    to queue pools, they are instrumented with `InstrumentedQueuePool` then.
+    """
+    options: Dict[str, Any] = {"pool_pre_ping": config.pool_pre_ping}
+    if config.pool_recycle is not None:
+        options["pool_recycle"] = config.pool_recycle
+    url = make_url(db_url)
+    if issubclass(url.get_dialect().get_pool_class(url), AsyncAdaptedQueuePool):
+        options["poolclass"] = InstrumentedQueuePool
+        for name in ("pool_size", "max_overflow", "pool_timeout"):
+            value = getattr(config, name)
+            if value is not None:
+                options[name] = value
+    return options
+
+
+def collect_pool_stats(engine: AsyncEngine) -> Dict[str, Any]:
+    """Current state of `engine`'s pool and checkout statistics if it's instrumented"""
+    if not isinstance(engine, AsyncEngine):
+        return {"pool": None}  # e.g. `SQLiteEngine` keeps a single connection
+    pool: Pool = engine.sync_engine.pool
+    stats: Dict[str, Any] = {"pool": type(pool).__name__}
+    for name, method in (("size", "size"), ("checked_out", "checkedout"), ("idle", "checkedin")):
+        if hasattr(pool, method):
+            stats[name] = getattr(pool, method)()
+    if hasattr(pool, "overflow"):
+        stats["overflow"] = max(pool.overflow(), 0)  # it's negative until pool is filled up to its size
+    pool_stats: Optional[PoolStats] = getattr(pool, "stats", None)
+    if pool_stats is not None:
+        stats.update(pool_stats.to_dict())
+    return stats
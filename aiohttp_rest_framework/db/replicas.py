@@ -0,0 +1,127 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional, Sequence, Tuple
+
+from asyncpg import PostgresError
+from sqlalchemy import text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+__all__ = (
+    "BaseReplicaPolicy",
+    "RoundRobinPolicy",
+    "LeastConnectionsPolicy",
+    "LagAwarePolicy",
+    "use_primary",
+    "is_primary_pinned",
+    "unpin_primary",
+)
+
+_primary_pinned: ContextVar[bool] = ContextVar("primary_pinned", default=False)
+
+
+@contextmanager
+def use_primary() -> Iterator[None]:
+    """Route reads within the block to the primary database, e.g. reads of a write request"""
+    token = _primary_pinned.set(True)
+    try:
+        yield
+    finally:
+        _primary_pinned.reset(token)
+
+
+def is_primary_pinned() -> bool:
+    return _primary_pinned.get()
+
+
+def unpin_primary() -> None:
+    """Route reads of the current context by replica policy again, e.g. in a task outliving the request"""
+    _primary_pinned.set(False)
+
+
+class BaseReplicaPolicy:
+    """A base class from which all replica policy classes should inherit."""
+
+    async def choose(self, replicas: Sequence[AsyncEngine]) -> Optional[AsyncEngine]:
+        """Replica to read from, `None` if none of them fits, reads go to the primary then"""
+        raise NotImplementedError("`choose()` must be implemented.")
+
+
+class RoundRobinPolicy(BaseReplicaPolicy):
+    """Replicas take reads in turns"""
+
+    def __init__(self):
+        self._counter = 0
+
+    async def choose(self, replicas: Sequence[AsyncEngine]) -> Optional[AsyncEngine]:
+        if not replicas:
+            return None
+        replica = replicas[self._counter % len(replicas)]
+        self._counter += 1
+        return replica
+
+
+class LeastConnectionsPolicy(BaseReplicaPolicy):
+    """Replica with the least connections checked out of its pool (in this process)"""
+
+    async def choose(self, replicas: Sequence[AsyncEngine]) -> Optional[AsyncEngine]:
+        if not replicas:
+            return None
+        return min(replicas, key=self.get_connections)
+
+    @staticmethod
+    def get_connections(replica: AsyncEngine) -> int:
+        checkedout = getattr(replica.sync_engine.pool, "checkedout", None)
+        return checkedout() if checkedout is not None else 0  # e.g. `NullPool` doesn't count connections
+
+
+class LagAwarePolicy(BaseReplicaPolicy):
+    """
+    Replicas which are at most `max_lag` seconds behind the primary are chosen by `policy` (round-robin by default).
+    Lag is time since the last replayed transaction, it's measured at most every `check_interval` seconds.
+    It grows while the primary has no writes, so `max_lag` has to be longer than quiet periods of the database.
+    Unreachable replicas are skipped until the next check.
+    """
+
+    # time since the last replayed transaction, servers which are not in recovery (e.g. primary itself) aren't behind
+    lag_query = text(
+        "SELECT CASE WHEN pg_is_in_recovery() "
+        "THEN EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) ELSE 0 END"
+    )
+
+    def __init__(
+        self,
+        max_lag: float = 1.0,
+        check_interval: float = 1.0,
+        policy: Optional[BaseReplicaPolicy] = None,
+    ):
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self.policy = policy or RoundRobinPolicy()
+        self._lags: Dict[AsyncEngine, Tuple[float, Optional[float]]] = {}
+
+    async def choose(self, replicas: Sequence[AsyncEngine]) -> Optional[AsyncEngine]:
+        fresh = []
+        for replica in replicas:
+            lag = await self.get_lag(replica)
+            if lag is not None and lag <= self.max_lag:
+                fresh.append(replica)
+        return await self.policy.choose(fresh)
+
+    async def get_lag(self, replica: AsyncEngine) -> Optional[float]:
+        checked_at, lag = self._lags.get(replica, (None, None))
+        now = time.monotonic()
+        if checked_at is None or now - checked_at >= self.check_interval:
+            lag = await self.measure_lag(replica)
+            self._lags[replica] = (now, lag)
+        return lag
+
+    async def measure_lag(self, replica: AsyncEngine) -> Optional[float]:
+        """Replica's lag in seconds, `None` if it's unknown (e.g. nothing is replayed yet) or replica is unreachable"""
+        try:
+            async with replica.connect() as connection:
+                lag = (await connection.execute(self.lag_query)).scalar()
+        except (SQLAlchemyError, PostgresError, OSError):
+            return None
+        return float(lag) if lag is not None else None
@@ -1,4 +1,27 @@
-from typing import Any, Dict, List, Mapping, Optional, Union
+import asyncio
+import datetime
+import decimal
+import enum
+import json
+import uuid
+from collections import OrderedDict
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Iterator,
+    List,
+    Mapping,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 
 from asyncpg import (
     ForeignKeyViolationError,
@@ -15,7 +38,7 @@ from psycopg2.errorcodes import (
     UNDEFINED_FUNCTION,
     UNIQUE_VIOLATION,
 )
-from sqlalchemy import Column, Table, and_, delete, insert, update
+from sqlalchemy import Column, Table, and_, bindparam, delete, func, insert, or_, text, tuple_, update
 from sqlalchemy.engine import Row
 from sqlalchemy.exc import (
     DBAPIError,
@@ -27,79 +50,475 @@ from sqlalchemy.exc import (
     StatementError,
 )
 from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession
+from sqlalchemy.ext.compiler import compiles
 from sqlalchemy.future import select
 from sqlalchemy.sql import Executable
-from sqlalchemy.sql.elements import BooleanClauseList, literal_column
+from sqlalchemy.sql.dml import Delete, Update
+from sqlalchemy.sql.elements import BooleanClauseList, ClauseElement, literal_column
+from sqlalchemy.sql.selectable import Select
 
+from aiohttp_rest_framework.codegen import make_record_class
 from aiohttp_rest_framework.db.base import BaseDBManager
+from aiohttp_rest_framework.db.replicas import is_primary_pinned, use_primary
 from aiohttp_rest_framework.exceptions import (
     FieldValidationError,
     MultipleObjectsReturned,
     ObjectNotFound,
+    PreconditionFailed,
     UniqueViolationError,
 )
 
 
+class Explain(Executable, ClauseElement):
+    """`EXPLAIN (FORMAT JSON)` of a statement, the statement itself is not executed"""
+
+    def __init__(self, statement: Executable):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler, **kwargs) -> str:
+    statement = compiler.process(element.statement, **kwargs)
+    # result is the plan itself, don't process it as the explained statement's columns
+    compiler._result_columns = []
+    return "EXPLAIN (FORMAT JSON) " + statement
+
+
+def _escape_like(value: str) -> str:
+    return value.replace("/", "//").replace("%", "/%").replace("_", "/_")
+
+
+class StatementCache:
+    """
+    Bounded LRU cache of statements built by a db manager. Statements are keyed by operation and
+    shape of their parameters (columns, lookups, selected columns), while values are bound on execution,
+    so a statement is built once per shape. Its cache key is memoized by SQLAlchemy, compiled SQL is taken
+    from engine's compiled cache and the same SQL text lets asyncpg reuse prepared statements of a connection
+    (their number is set by `prepared_statement_cache_size` query parameter of database url).
+    """
+
+    def __init__(self, max_size: int = 256):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._statements: "OrderedDict[Hashable, Executable]" = OrderedDict()
+
+    def get_or_build(self, key: Hashable, build: Callable[[], Executable]) -> Executable:
+        statement = self._statements.get(key)
+        if statement is not None:
+            self.hits += 1
+            self._statements.move_to_end(key)
+            return statement
+        self.misses += 1
+        statement = build()
+        if self.max_size > 0:
+            self._statements[key] = statement
+            while len(self._statements) > self.max_size:
+                self._statements.popitem(last=False)
+        return statement
+
+    def clear(self) -> None:
+        self._statements.clear()
+        self.hits = self.misses = 0
+
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self), "max_size": self.max_size}
+
+    def __len__(self) -> int:
+        return len(self._statements)
+
+
+class SessionScope:
+    """Session shared by db managers within `session_scope()` block"""
+
+    def __init__(self, session: AsyncSession, engine: AsyncEngine):
+        self.session = session
+        self.engine = engine
+        # a session can't run statements concurrently, e.g. list and count queries of the same request
+        self.lock = asyncio.Lock()
+        self.closed = False
+        # roll the transaction back even if the block is left without exception
+        self.rollback_only = False
+        # once the scope has written, its reads aren't routed to replicas which may not have the changes yet
+        self.has_writes = False
+        # run once the transaction is committed, see `on_commit()`
+        self.commit_callbacks: List[Callable[[], Awaitable]] = []
+
+
+_session_scope: ContextVar[Optional[SessionScope]] = ContextVar("session_scope", default=None)
+
+
+@asynccontextmanager
+async def session_scope(engine: AsyncEngine) -> AsyncIterator[SessionScope]:
+    """
+    Run all statements of db managers (using the same `engine`) within the block in a single session,
+    so a connection is checked out once and there is a single transaction. It's committed when
+    the block is left and rolled back on exceptions or if `rollback_only` is set.
+    Tasks started within the block and outliving it (e.g. background cache refreshes) use their own sessions.
+    Callbacks registered with `on_commit()` are run after the commit.
+    """
+    committed = False
+    async with AsyncSession(engine, expire_on_commit=False) as session:
+        scope = SessionScope(session, engine)
+        token = _session_scope.set(scope)
+        try:
+            yield scope
+        except BaseException:
+            async with scope.lock:
+                scope.closed = True
+                await session.rollback()
+            raise
+        else:
+            async with scope.lock:
+                scope.closed = True
+                if scope.rollback_only:
+                    await session.rollback()
+                else:
+                    await session.commit()
+                    committed = True
+        finally:
+            scope.closed = True
+            _session_scope.reset(token)
+    if committed:
+        for callback in scope.commit_callbacks:
+            await callback()
+
+
+def leave_session_scope() -> None:
+    """Stop using current `session_scope()` in the current context, e.g. in a task outliving the block"""
+    _session_scope.set(None)
+
+
+async def on_commit(callback: Callable[[], Awaitable]) -> None:
+    """
+    Run `callback` once changes of the current `session_scope()` are committed, it's dropped if they are
+    rolled back. Outside of a scope statements are committed right away, so `callback` is run immediately.
+    """
+    scope = _session_scope.get()
+    if scope is None or scope.closed:
+        await callback()
+    else:
+        scope.commit_callbacks.append(callback)
+
+
 class SAManager(BaseDBManager):
-    def __init__(self, config, model) -> None:
+    LOOKUP_SEPARATOR = "__"
+    LOOKUPS = {
+        "exact": lambda column, value: column == value,
+        "ne": lambda column, value: column != value,
+        "gt": lambda column, value: column > value,
+        "gte": lambda column, value: column >= value,
+        "lt": lambda column, value: column < value,
+        "lte": lambda column, value: column <= value,
+        "in": lambda column, value: column.in_(value),
+        "contains": lambda column, value: column.contains(value, autoescape=True),
+        "icontains": lambda column, value: column.ilike(f"%{_escape_like(value)}%", escape="/"),
+        "startswith": lambda column, value: column.startswith(value, autoescape=True),
+        "istartswith": lambda column, value: column.ilike(f"{_escape_like(value)}%", escape="/"),
+        "isnull": lambda column, value: column.is_(None) if value else column.isnot(None),
+    }
+    # lookups taking nothing but a bound value, statements filtered with them are cached, see `statements`
+    BINDABLE_LOOKUPS = ("exact", "ne", "gt", "gte", "lt", "lte", "in")
+    # postgres protocol allows at most 32767 bind parameters in a single statement
+    MAX_BIND_PARAMS = 32767
+    # return read-only slotted records (see `get_record_class()`) instead of ORM instances,
+    # records are much cheaper to build when objects are only dumped, but changes made to them are not saved
+    use_records: bool = False
+
+    def __init__(self, config, model, use_records: Optional[bool] = None) -> None:
         from aiohttp_rest_framework.settings import Config
         self.model = model
         self.config: Config = config
         self._engine = None
         self._is_core = isinstance(self.model, Table)
+        self.statements = StatementCache(config.statement_cache_size)
+        if use_records is not None:
+            self.use_records = use_records
 
-    async def get(self, filter_params: Optional[Dict] = None, whereclause: Optional[BooleanClauseList] = None):
-        query = select(self.model)
+    async def get(
+        self,
+        filter_params: Optional[Dict] = None,
+        whereclause: Optional[BooleanClauseList] = None,
+        columns: Optional[Sequence[str]] = None,
+        as_mappings: bool = False,
+        as_records: bool = False,
+    ):
+        as_records = self._use_records(as_records)
+        as_rows = as_mappings or as_records
         if whereclause is not None:
-            query = query.where(whereclause)
+            query, parameters = self._select(columns, as_rows).where(whereclause), None
         else:
-            query = query.where(self._construct_whereclause(filter_params))
+            query, parameters = self._get_statement(
+                ("get", self._get_columns_key(columns), as_rows),
+                lambda where, _: self._select(columns, as_rows).where(where),
+                filter_params,
+            )
 
         try:
-            return await self.execute(query, operation="one")
+            return await self._fetch(query, "one", columns, as_mappings, as_records, parameters)
         except FieldValidationError as exc:
             raise ObjectNotFound(str(exc))
 
-    async def all(self) -> List[Any]:
-        query = select(self.model)
-        return await self.execute(query, operation="all")
+    async def all(
+        self,
+        order_by: Optional[Sequence[Union[str, ClauseElement]]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        columns: Optional[Sequence[str]] = None,
+        as_mappings: bool = False,
+        as_records: bool = False,
+    ) -> List[Any]:
+        as_records = self._use_records(as_records)
+        query = self._select(columns, as_mappings or as_records)
+        query = self._apply_list_options(query, order_by, limit, offset)
+        return await self._fetch(query, "all", columns, as_mappings, as_records)
 
     async def filter(
         self,
         filter_params: Optional[Dict] = None,
         whereclause: Optional[BooleanClauseList] = None,
+        order_by: Optional[Sequence[Union[str, ClauseElement]]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        columns: Optional[Sequence[str]] = None,
+        as_mappings: bool = False,
+        as_records: bool = False,
     ) -> List[Any]:
-        query = select(self.model)
+        as_records = self._use_records(as_records)
+        query = self._select(columns, as_mappings or as_records)
         if whereclause is not None:
             query = query.where(whereclause)
-        else:
+        elif filter_params:
             query = query.where(self._construct_whereclause(filter_params))
 
-        return await self.execute(query, operation="all")
+        query = self._apply_list_options(query, order_by, limit, offset)
+        return await self._fetch(query, "all", columns, as_mappings, as_records)
 
-    async def create(self, values: Mapping) -> Any:
-        query = insert(self.model).values(values).returning(literal_column("*"))
-        result = await self.execute(query, operation="one", no_scalars=True)
+    async def stream(
+        self,
+        whereclause: Optional[BooleanClauseList] = None,
+        order_by: Optional[Sequence[Union[str, ClauseElement]]] = None,
+        chunk_size: int = 1000,
+        columns: Optional[Sequence[str]] = None,
+        as_records: bool = False,
+    ) -> AsyncIterator[List[Any]]:
+        """
+        Iterate over rows in chunks of `chunk_size` using server side cursor,
+        so only one chunk is held in memory at a time. The cursor is always read in its own session,
+        it's open while the chunks are consumed and must not lock out other statements of `session_scope()`.
+        """
+        as_records = self._use_records(as_records)
+        query = self._get_stream_query(whereclause, order_by, columns, as_records)
+        async for partition in self._stream(await self.get_read_engine(), query, chunk_size, columns, as_records):
+            yield partition
+
+    def _get_stream_query(
+        self,
+        whereclause: Optional[BooleanClauseList],
+        order_by: Optional[Sequence[Union[str, ClauseElement]]],
+        columns: Optional[Sequence[str]],
+        as_records: bool,
+    ) -> Select:
+        query = self._select(columns, as_records)
+        if whereclause is not None:
+            query = query.where(whereclause)
+        return self._apply_list_options(query, order_by)
+
+    async def _stream(
+        self,
+        engine: AsyncEngine,
+        query: Select,
+        chunk_size: int,
+        columns: Optional[Sequence[str]],
+        as_records: bool,
+    ) -> AsyncIterator[List[Any]]:
+        async with AsyncSession(engine, expire_on_commit=False) as session:
+            async with session.begin():
+                try:
+                    result = await session.stream(query)
+                    if columns is None and not as_records and not self._is_core:
+                        result = result.scalars()
+                    async for partition in result.partitions(chunk_size):
+                        if as_records:
+                            partition = self.to_records(partition)
+                        elif columns is not None:
+                            partition = [self.to_model_instance(row) for row in partition]
+                        yield partition
+                        # loaded objects are not needed anymore, don't let identity map grow
+                        session.expunge_all()
+                except (SQLAlchemyError, PostgresError) as exc:
+                    raise self._get_exception(exc)
+
+    async def count(self, whereclause: Optional[BooleanClauseList] = None) -> int:
+        """Exact number of rows matching `whereclause`"""
+        query = select(func.count()).select_from(self.table)
+        if whereclause is not None:
+            query = query.where(whereclause)
+        return await self.execute(query, operation="scalar_one", no_scalars=True, read=True)
+
+    async def estimate_count(self, whereclause: Optional[BooleanClauseList] = None) -> Optional[int]:
+        """
+        Estimated number of rows matching `whereclause`, taken from postgres statistics
+        without scanning the table. Whole table size is read from `pg_class.reltuples`,
+        filtered counts are taken from the planner's row estimate.
+        Returns `None` if there are no statistics for the table yet.
+        """
+        if whereclause is None:
+            query = text(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = CAST(:table_name AS regclass)"
+            ).bindparams(bindparam("table_name", self.table.fullname))
+            estimate = await self.execute(query, operation="scalar_one", no_scalars=True, read=True)
+            return estimate if estimate > 0 else None
+
+        query = select(self.get_pk_column()).where(whereclause)
+        plan = await self.execute(Explain(query), operation="scalar_one", no_scalars=True, read=True)
+        if isinstance(plan, str):  # depends on driver's json codec
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    async def create(self, values: Mapping, columns: Optional[Sequence[str]] = None) -> Any:
+        query, parameters = self._get_statement(
+            ("create", self._get_columns_key(columns)),
+            lambda _, bound_values: insert(self.model).values(bound_values).returning(*self._get_returning(columns)),
+            values=values,
+        )
+        result = await self.execute(query, parameters, operation="one", no_scalars=True)
         return self.to_model_instance(result)
 
-    async def update(self, instance, values: Mapping):
-        query = update(
-            self.model
-        ).where(
-            self.get_pk_column() == getattr(instance, self.pk)
-        ).values(values).returning(literal_column("*"))
+    async def bulk_create(
+        self,
+        values: Sequence[Mapping],
+        columns: Optional[Sequence[str]] = None,
+        chunk_size: int = 1000,
+    ) -> List[Any]:
+        """
+        Insert all `values` in a single transaction with multi-row `INSERT ... RETURNING` statements,
+        each of them inserts at most `chunk_size` rows. Created instances are returned in the same order.
+        """
+        returning = self._get_returning(columns)
+        instances = []
+        async with self.session() as session:
+            try:
+                for chunk in self._get_bulk_chunks(values, chunk_size):
+                    query = insert(self.model).values(chunk).returning(*returning)
+                    result = await session.execute(query)
+                    instances.extend(self.to_model_instance(row) for row in result.all())
+            except (SQLAlchemyError, PostgresError) as exc:
+                raise self._get_exception(exc)
+        return instances
 
+    async def update(
+        self,
+        instance,
+        values: Mapping,
+        columns: Optional[Sequence[str]] = None,
+        precondition: Optional[Dict] = None,
+    ):
+        """
+        Update `instance` with `values`. `precondition` holds extra filter params
+        (e.g. `{"version": 3}`) the row has to match, it's checked in the same statement.
+        """
+        query, parameters = self._get_update_statement(
+            {self.pk: getattr(instance, self.pk)}, values, columns, precondition,
+        )
         try:
-            result = await self.execute(query, operation="one", no_scalars=True)
-            return self.to_model_instance(result)
+            result = await self.execute(query, parameters, operation="one_or_none", no_scalars=True)
         except (NoResultFound, FieldValidationError) as exc:
+            if precondition:
+                raise PreconditionFailed(str(exc))
             raise ObjectNotFound(str(exc))
         except MultipleResultsFound as exc:
             raise MultipleObjectsReturned(str(exc))
+        if result is None:
+            if precondition:
+                raise PreconditionFailed()
+            raise ObjectNotFound("No row was found when one was required")
+        return self.to_model_instance(result)
 
-    async def delete(self, instance) -> None:
-        query = delete(self.model).where(self.get_pk_column() == getattr(instance, self.pk))
-        await self.execute(query)
+    async def delete(self, instance, precondition: Optional[Dict] = None) -> None:
+        query, parameters = self._get_delete_statement({self.pk: getattr(instance, self.pk)}, precondition)
+        try:
+            result = await self.execute(query, parameters)
+        except FieldValidationError as exc:
+            if precondition:
+                raise PreconditionFailed(str(exc))
+            raise
+        if precondition and result.rowcount == 0:
+            raise PreconditionFailed()
+
+    async def update_by(
+        self,
+        filter_params: Mapping,
+        values: Mapping,
+        columns: Optional[Sequence[str]] = None,
+        precondition: Optional[Dict] = None,
+    ):
+        """
+        Update the row matching `filter_params` (e.g. `{"id": 1}`) without reading it first,
+        it's a single `UPDATE ... WHERE ... RETURNING` statement. `ObjectNotFound` is raised
+        if there is no such row, `PreconditionFailed` if it's there, but doesn't match `precondition`.
+        """
+        query, parameters = self._get_update_statement(filter_params, values, columns, precondition)
+        try:
+            result = await self.execute(query, parameters, operation="one_or_none", no_scalars=True)
+        except FieldValidationError as exc:  # e.g. malformed lookup value
+            raise ObjectNotFound(str(exc))
+        except MultipleResultsFound as exc:
+            raise MultipleObjectsReturned(str(exc))
+        if result is None:
+            await self._raise_not_matched(filter_params, precondition)
+        return self.to_model_instance(result)
+
+    async def delete_by(self, filter_params: Mapping, precondition: Optional[Dict] = None) -> None:
+        """
+        Delete the row matching `filter_params` without reading it first
+        with a single `DELETE ... WHERE ... RETURNING` statement, raises like `update_by()`.
+        """
+        query, parameters = self._get_delete_statement(filter_params, precondition, returning=True)
+        try:
+            result = await self.execute(query, parameters, operation="all", no_scalars=True)
+        except FieldValidationError as exc:
+            raise ObjectNotFound(str(exc))
+        if not result:
+            await self._raise_not_matched(filter_params, precondition)
+
+    async def _raise_not_matched(self, filter_params: Mapping, precondition: Optional[Dict]) -> None:
+        # a write by lookup affected no rows, the row is either missing or doesn't match precondition,
+        # telling one from another takes an extra query, but only for writes that failed anyway
+        with use_primary():
+            exists = bool(precondition) and await self.count(self._construct_whereclause(filter_params))
+        if exists:
+            raise PreconditionFailed()
+        raise ObjectNotFound("No row was found when one was required")
+
+    async def bulk_update(
+        self,
+        filter_params: Optional[Mapping],
+        values: Mapping,
+        whereclause: Optional[ClauseElement] = None,
+        returning: bool = False,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Union[int, List[Any]]:
+        """
+        Update all rows matching `filter_params`/`whereclause` with a single `UPDATE ... WHERE` statement.
+        Returns number of updated rows, or updated instances if `returning` is set.
+        """
+        query = update(self.model).values(values)
+        return await self._execute_bulk(query, filter_params, whereclause, returning, columns)
+
+    async def bulk_delete(
+        self,
+        filter_params: Optional[Mapping] = None,
+        whereclause: Optional[ClauseElement] = None,
+        returning: bool = False,
+        columns: Optional[Sequence[str]] = None,
+    ) -> Union[int, List[Any]]:
+        """
+        Delete all rows matching `filter_params`/`whereclause` with a single `DELETE ... WHERE` statement.
+        Returns number of deleted rows, or deleted instances if `returning` is set.
+        """
+        query = delete(self.model)
+        return await self._execute_bulk(query, filter_params, whereclause, returning, columns)
 
     async def execute(
         self,
@@ -107,24 +526,51 @@ class SAManager(BaseDBManager):
         parameters: Optional[Mapping] = None,
         operation: Optional[str] = None,
         no_scalars: bool = False,
+        read: bool = False,
     ) -> Any:
-        engine = await self.get_engine()
+        """Execute `query`, `read` ones may be routed to a replica, see `session()`"""
+        async with self.session(read=read) as session:
+            try:
+                result = await session.execute(query, parameters)
+                if operation:
+                    if not no_scalars and not self._is_core:
+                        result = result.scalars()
+                    result = getattr(result, operation)()
+            except (SQLAlchemyError, PostgresError) as exc:
+                raise self._get_exception(exc)
+        return result
+
+    @asynccontextmanager
+    async def session(self, read: bool = False) -> AsyncIterator[AsyncSession]:
+        """
+        Session to run statements in: the one of current `session_scope()` if there is one,
+        otherwise a new session with its own transaction which is committed when the block is left.
+        Sessions for `read` only statements are opened on a replica (see `get_read_engine()`),
+        unless the scope has already written something.
+        """
+        primary = await self.get_engine()
+        engine = await self.get_read_engine() if read else primary
+        scope = _session_scope.get()
+        if scope is not None and scope.engine is primary and (engine is primary or scope.has_writes):
+            async with scope.lock:
+                if not scope.closed:
+                    if not read:
+                        scope.has_writes = True
+                    yield scope.session
+                    return
         async with AsyncSession(engine, expire_on_commit=False) as session:
             async with session.begin():
-                try:
-                    result = await session.execute(query, parameters)
-                    if operation:
-                        if not no_scalars and not self._is_core:
-                            result = result.scalars()
-                        result = getattr(result, operation)()
-                except (SQLAlchemyError, PostgresError) as exc:
-                    raise self._get_exception(exc)
-            await session.commit()
-            return result
+                yield session
 
     async def get_engine(self) -> AsyncEngine:
         return await self.config.get_connection()
 
+    async def get_read_engine(self) -> AsyncEngine:
+        """Engine to read from: a replica chosen by config's policy, unless reads are pinned to the primary"""
+        if is_primary_pinned():
+            return await self.get_engine()
+        return await self.config.get_read_connection()
+
     @property
     def pk(self) -> Any:
         if self._is_core:
@@ -133,15 +579,311 @@ class SAManager(BaseDBManager):
             pks = self.model.__table__.primary_key.columns.keys()
         return pks[0]
 
+    @property
+    def table(self) -> Table:
+        if self._is_core:
+            return self.model
+        return self.model.__table__
+
     def get_pk_column(self) -> Column:
+        return self.get_column(self.pk)
+
+    def get_column(self, name: str) -> Column:
         if self._is_core:
-            return self.model.columns[self.pk]
-        return getattr(self.model, self.pk)
+            return self.model.columns[name]
+        return getattr(self.model, name)
+
+    def get_keyset_whereclause(self, ordering: Sequence[str], position: Sequence) -> ClauseElement:
+        """
+        Build a clause selecting rows that come strictly after `position` for `ordering`.
+        `ordering` items are column names, prefixed with "-" for descending order,
+        `position` holds values of these columns for the last seen row.
+        """
+        assert len(ordering) == len(position), "`position` has to contain a value for every ordering field"
+        descending = [name.startswith("-") for name in ordering]
+        columns = [self.get_column(name.lstrip("-")) for name in ordering]
+        if all(descending) or not any(descending):
+            # row-value comparison can be resolved with a single (composite) index scan
+            if descending[0]:
+                return tuple_(*columns) < tuple_(*position)
+            return tuple_(*columns) > tuple_(*position)
+
+        clauses = []
+        for index, (column, value) in enumerate(zip(columns, position)):
+            equals = [columns[i] == position[i] for i in range(index)]
+            comparison = column < value if descending[index] else column > value
+            clauses.append(and_(*equals, comparison))
+        return or_(*clauses)
+
+    def to_python(self, name: str, value: Any) -> Any:
+        """Convert json-compatible `value` (e.g. taken from a cursor) back to column's python type"""
+        if value is None:
+            return None
+        try:
+            python_type = self.table.columns[name].type.python_type
+        except NotImplementedError:
+            return value
+        if issubclass(python_type, enum.Enum):
+            return python_type[value]
+        if python_type in (datetime.datetime, datetime.date, datetime.time):
+            return python_type.fromisoformat(value)
+        if python_type is datetime.timedelta:
+            return datetime.timedelta(seconds=value)
+        if python_type in (decimal.Decimal, uuid.UUID, int, float):
+            return python_type(value)
+        return value
+
+    def get_columns(self, names: Optional[Sequence[str]] = None) -> List[Column]:
+        """Table columns for `names` (all columns if not specified), primary key is always included"""
+        if names is None:
+            return list(self.table.columns)
+        names = dict.fromkeys((self.pk, *names))  # ordered set
+        return [self.table.columns[name] for name in names]
+
+    async def _execute_bulk(
+        self,
+        query: Union[Update, Delete],
+        filter_params: Optional[Mapping],
+        whereclause: Optional[ClauseElement],
+        returning: bool,
+        columns: Optional[Sequence[str]],
+    ) -> Union[int, List[Any]]:
+        if filter_params:
+            query = query.where(self._construct_whereclause(filter_params))
+        if whereclause is not None:
+            query = query.where(whereclause)
+        # instances a shared session holds are only read, there is no need to evaluate criteria against them
+        query = query.execution_options(synchronize_session=False)
+        if not returning:
+            result = await self.execute(query)
+            return result.rowcount
+        query = query.returning(*self._get_returning(columns))
+        rows = await self.execute(query, operation="all", no_scalars=True)
+        return [self.to_model_instance(row) for row in rows]
+
+    def _get_bulk_chunks(self, values: Sequence[Mapping], chunk_size: int) -> Iterator[List[Mapping]]:
+        """
+        Split `values` into chunks for multi-row inserts. Rows of a chunk must have the same keys,
+        otherwise missing values would be inserted as `NULL` instead of column defaults,
+        so a new chunk is started whenever the keys change.
+        """
+        chunk: List[Mapping] = []
+        chunk_keys = None
+        max_rows = chunk_size
+        for row in values:
+            keys = row.keys()
+            if chunk and (keys != chunk_keys or len(chunk) >= max_rows):
+                yield chunk
+                chunk = []
+            if not chunk:
+                chunk_keys = keys
+                max_rows = max(min(chunk_size, self.MAX_BIND_PARAMS // max(len(keys), 1)), 1)
+            chunk.append(row)
+        if chunk:
+            yield chunk
+
+    def _select(self, columns: Optional[Sequence[str]] = None, as_rows: bool = False) -> Select:
+        """Select model or its `columns`, with `as_rows` columns are always selected (all if not specified)"""
+        if columns is None and not as_rows:
+            return select(self.model)
+        return select(*self.get_columns(columns))
+
+    def _get_returning(self, columns: Optional[Sequence[str]] = None) -> List[ClauseElement]:
+        if columns is None:
+            return [literal_column("*")]
+        return self.get_columns(columns)
+
+    async def _fetch(
+        self,
+        query: Select,
+        operation: str,
+        columns: Optional[Sequence[str]] = None,
+        as_mappings: bool = False,
+        as_records: bool = False,
+        parameters: Optional[Mapping] = None,
+    ) -> Any:
+        """
+        Execute select query, projected rows (when `columns` specified) are still returned as models.
+        With `as_mappings` rows are returned as column name to value mappings (`Row._mapping`)
+        and with `as_records` as slotted records, no model instances are constructed at all.
+        """
+        if columns is None and not as_mappings and not as_records:
+            return await self.execute(query, parameters, operation=operation, read=True)
+        result = await self.execute(query, parameters, operation=operation, no_scalars=True, read=True)
+        if as_mappings:
+            if operation == "all":
+                return [row._mapping for row in result]  # noqa
+            return result._mapping  # noqa
+        if as_records:
+            if operation == "all":
+                return self.to_records(result)
+            return self.to_records([result])[0]
+        if operation == "all":
+            return [self.to_model_instance(row) for row in result]
+        return self.to_model_instance(result)
+
+    def _apply_list_options(
+        self,
+        query: Select,
+        order_by: Optional[Sequence[Union[str, ClauseElement]]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+    ) -> Select:
+        if order_by:
+            query = query.order_by(*(self._get_order_by_clause(item) for item in order_by))
+        if limit is not None:
+            query = query.limit(limit)
+        if offset:
+            query = query.offset(offset)
+        return query
+
+    def _get_order_by_clause(self, item: Union[str, ClauseElement]) -> ClauseElement:
+        if not isinstance(item, str):
+            return item
+        if item.startswith("-"):
+            return self.get_column(item[1:]).desc()
+        return self.get_column(item).asc()
+
+    def get_lookup_clause(self, name: str, lookup: str, value: Any) -> ClauseElement:
+        assert lookup in self.LOOKUPS, (
+            f"unknown lookup `{lookup}`, has to be one of {', '.join(self.LOOKUPS)}"
+        )
+        return self.LOOKUPS[lookup](self.get_column(name), value)
+
+    def _get_update_statement(
+        self,
+        filter_params: Mapping,
+        values: Mapping,
+        columns: Optional[Sequence[str]],
+        precondition: Optional[Dict],
+    ) -> Tuple[Update, Optional[Dict]]:
+        return self._get_statement(
+            ("update", self._get_columns_key(columns)),
+            lambda where, bound_values: update(self.model).where(where).values(bound_values).returning(
+                *self._get_returning(columns)
+            ).execution_options(synchronize_session=False),
+            filter_params,
+            precondition,
+            values,
+        )
+
+    def _get_delete_statement(
+        self,
+        filter_params: Mapping,
+        precondition: Optional[Dict],
+        returning: bool = False,
+    ) -> Tuple[Delete, Optional[Dict]]:
+        def build(where, _) -> Delete:
+            query = delete(self.model).where(where).execution_options(synchronize_session=False)
+            return query.returning(self.get_pk_column()) if returning else query
+
+        return self._get_statement(("delete", returning), build, filter_params, precondition)
+
+    def _get_statement(
+        self,
+        key: Tuple,
+        build: Callable[[Optional[ClauseElement], Optional[Mapping]], Executable],
+        filter_params: Optional[Mapping] = None,
+        precondition: Optional[Mapping] = None,
+        values: Optional[Mapping] = None,
+    ) -> Tuple[Executable, Optional[Dict]]:
+        """
+        `(statement, parameters)` to execute. `build(whereclause, values)` is called with bind parameters
+        in place of values and the statement is cached by `key` and shape of `filter_params`, `precondition`
+        and `values`. If some of them can't be bound (e.g. `isnull` lookup), a one-off statement
+        with literal values is built, `parameters` are `None` then.
+        """
+        where_shape = self._get_params_shape(filter_params) if filter_params is not None else ()
+        precondition_shape = self._get_params_shape(precondition or {})
+        values_shape = self._get_values_shape(values) if values is not None else ()
+        if where_shape is None or precondition_shape is None or values_shape is None:
+            whereclause = None
+            if filter_params is not None:
+                whereclause = self._with_precondition(self._construct_whereclause(filter_params), precondition)
+            return build(whereclause, values), None
+
+        def build_bound() -> Executable:
+            whereclause = None
+            if filter_params is not None:
+                whereclause = self._get_bound_whereclause(where_shape, "w")
+                if precondition_shape:
+                    whereclause = and_(whereclause, self._get_bound_whereclause(precondition_shape, "c"))
+            bound_values = None
+            if values is not None:
+                bound_values = {name: bindparam(f"v{index}") for index, name in enumerate(values_shape)}
+            return build(whereclause, bound_values)
+
+        statement = self.statements.get_or_build((*key, where_shape, precondition_shape, values_shape), build_bound)
+        parameters = {}
+        if filter_params is not None:
+            parameters.update(self._get_bind_values(filter_params, where_shape, "w"))
+        if precondition_shape:
+            parameters.update(self._get_bind_values(precondition, precondition_shape, "c"))
+        if values is not None:
+            parameters.update((f"v{index}", value) for index, value in enumerate(values.values()))
+        return statement, parameters
+
+    def _get_params_shape(self, params: Mapping) -> Optional[Tuple[Tuple[str, str], ...]]:
+        """
+        Column names and lookups of filter `params`, `None` if some of them can't be bound:
+        other lookups and `None` values (which are `IS NULL` rather than `= NULL`) change the statement itself
+        """
+        shape = []
+        for key, value in params.items():
+            name, lookup = self._parse_lookup(key)
+            if lookup not in self.BINDABLE_LOOKUPS or value is None or isinstance(value, ClauseElement):
+                return None
+            shape.append((name, lookup))
+        return tuple(shape)
+
+    @staticmethod
+    def _get_values_shape(values: Mapping) -> Optional[Tuple[str, ...]]:
+        if any(isinstance(value, ClauseElement) for value in values.values()):
+            return None
+        return tuple(values)
+
+    def _get_bound_whereclause(self, shape: Sequence[Tuple[str, str]], prefix: str) -> ClauseElement:
+        clauses = []
+        for index, (name, lookup) in enumerate(shape):
+            clauses.append(self._get_bound_clause(self.get_column(name), lookup, f"{prefix}{index}"))
+        return and_(*clauses)
+
+    def _get_bound_clause(self, column: Column, lookup: str, name: str) -> ClauseElement:
+        value = bindparam(name, type_=column.type, expanding=lookup == "in")
+        return self.LOOKUPS[lookup](column, value)
+
+    @staticmethod
+    def _get_bind_values(params: Mapping, shape: Sequence[Tuple[str, str]], prefix: str) -> Dict[str, Any]:
+        return {
+            f"{prefix}{index}": list(value) if lookup == "in" else value
+            for index, ((_, lookup), value) in enumerate(zip(shape, params.values()))
+        }
+
+    @staticmethod
+    def _get_columns_key(columns: Optional[Sequence[str]]) -> Optional[Tuple[str, ...]]:
+        return tuple(columns) if columns is not None else None
+
+    def _with_precondition(self, whereclause: ClauseElement, precondition: Optional[Dict]) -> ClauseElement:
+        if precondition:
+            whereclause = and_(whereclause, self._construct_whereclause(precondition))
+        return whereclause
 
     def _construct_whereclause(self, params: Dict) -> BooleanClauseList:
-        if self._is_core:
-            return and_(self.model.columns[key] == value for key, value in params.items())
-        return and_(getattr(self.model, key) == value for key, value in params.items())
+        """
+        Construct whereclause from `params`, keys are column names optionally
+        followed by a lookup, e.g. `{"email": "john@mail.com", "created_at__gte": date}`
+        """
+        clauses = []
+        for key, value in params.items():
+            name, lookup = self._parse_lookup(key)
+            clauses.append(self.get_lookup_clause(name, lookup, value))
+        return and_(*clauses)
+
+    def _parse_lookup(self, key: str) -> Tuple[str, str]:
+        name, _, lookup = key.rpartition(self.LOOKUP_SEPARATOR)
+        if not name or lookup not in self.LOOKUPS:
+            return key, "exact"
+        return name, lookup
 
     def _get_exception(self, exc: Union[SQLAlchemyError, PostgresError]) -> Exception:
         if isinstance(exc, StatementError):
@@ -180,4 +922,25 @@ class SAManager(BaseDBManager):
     def to_model_instance(self, result: Row) -> Any:
         if self._is_core:
             return result
+        if self.use_records:
+            return self.to_records([result])[0]
         return self.model(**result._asdict())
+
+    def to_records(self, rows: Sequence[Row]) -> List[Any]:
+        """
+        Build records for `rows` of the same columns, Core rows are light enough and returned as is.
+        Falls back to model instances if there can't be a record class for the columns.
+        """
+        if not rows or self._is_core:
+            return list(rows)
+        record_class = self.get_record_class(rows[0]._fields)  # noqa
+        if record_class is None:
+            return [self.model(**row._asdict()) for row in rows]
+        return [record_class(*row) for row in rows]
+
+    def get_record_class(self, fields: Sequence[str]) -> Optional[type]:
+        """Slotted record class of model with `fields`, `None` if it can't be generated for them"""
+        return make_record_class(f"{getattr(self.model, '__name__', self.table.name)}Record", fields)
+
+    def _use_records(self, as_records: bool) -> bool:
+        return (as_records or self.use_records) and not self._is_core
@@ -0,0 +1,305 @@
+import asyncio
+import heapq
+import zlib
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import partial
+from itertools import chain
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Iterator, List, Mapping, Optional, Sequence, Union
+
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.sql.elements import BooleanClauseList, ClauseElement
+
+from aiohttp_rest_framework.db.sa import SAManager
+from aiohttp_rest_framework.exceptions import FieldValidationError, MultipleObjectsReturned, ObjectNotFound
+
+__all__ = (
+    "ShardMap",
+    "ShardedSAManager",
+    "use_shard",
+    "get_current_shard",
+)
+
+_current_shard: ContextVar[Optional[str]] = ContextVar("current_shard", default=None)
+
+
+@contextmanager
+def use_shard(name: str) -> Iterator[None]:
+    """Run statements of sharded models within the block in shard `name`, whatever their shard keys are"""
+    token = _current_shard.set(name)
+    try:
+        yield
+    finally:
+        _current_shard.reset(token)
+
+
+def get_current_shard() -> Optional[str]:
+    return _current_shard.get()
+
+
+class ShardMap:
+    """
+    Shards of a model: engines by shard name and a column (`key`) whose value decides which shard a row lives in.
+    `route(value)` returns shard name of a key value, by default it's a stable hash of the value modulo
+    number of shards. `shards` mapping isn't copied, so engines may be added to it on application startup.
+
+        shard_map = ShardMap({"eu": eu_engine, "us": us_engine}, key="region", route=lambda region: region)
+    """
+
+    def __init__(self, shards: Mapping[str, AsyncEngine], key: str, route: Optional[Callable[[Any], str]] = None):
+        self.shards = shards
+        self.key = key
+        self.route = route
+
+    @property
+    def names(self) -> List[str]:
+        return sorted(self.shards)
+
+    def get_shard(self, value: Any) -> str:
+        """Shard of rows with `value` of the key column"""
+        if self.route is not None:
+            return self.route(value)
+        names = self.names
+        return names[zlib.crc32(str(value).encode()) % len(names)]
+
+    def get_engine(self, name: str) -> AsyncEngine:
+        return self.shards[name]
+
+
+class ShardedSAManager(SAManager):
+    """
+    Db manager of a model spread over several databases by `shard_map`. Statements with the shard key
+    in their filter params (exact match) or values go to its shard only, as well as all statements within
+    `use_shard()` block. Others are run in all shards concurrently and their results are merged:
+    lists are merge-sorted by `order_by` (column names only) and cut by `limit`/`offset`, counts are summed up.
+    Writes to several shards are not atomic, every shard has its own transaction.
+    Streamed rows are ordered within every shard, shards are streamed one after another.
+    """
+
+    def __init__(self, config, model, shard_map: ShardMap, use_records: Optional[bool] = None) -> None:
+        super().__init__(config, model, use_records=use_records)
+        self.shard_map = shard_map
+
+    async def get_engine(self) -> AsyncEngine:
+        shard = get_current_shard()
+        assert shard is not None, (
+            f"shard of `{self.table.name}` statement is unknown, run it within `use_shard()`"
+        )
+        return self.shard_map.get_engine(shard)
+
+    async def get_read_engine(self) -> AsyncEngine:
+        return await self.get_engine()
+
+    def route(self, params: Optional[Mapping]) -> Optional[str]:
+        """Shard of filter params or values, `None` if it's unknown, i.e. all shards have to be queried"""
+        shard = get_current_shard()
+        if shard is not None or not params:
+            return shard
+        for key, value in params.items():
+            if self._parse_lookup(key) == (self.shard_map.key, "exact"):
+                return self.shard_map.get_shard(value)
+        return None
+
+    async def get(
+        self,
+        filter_params: Optional[Dict] = None,
+        whereclause: Optional[BooleanClauseList] = None,
+        **kwargs,
+    ):
+        get = partial(super().get, filter_params, whereclause, **kwargs)
+        shard = self.route(filter_params)
+        if shard is not None:
+            return await self._run(shard, get)
+        return self._get_single(await self._scatter(get))
+
+    async def all(self, *args, **kwargs) -> List[Any]:
+        return await self.filter(None, None, *args, **kwargs)
+
+    async def filter(
+        self,
+        filter_params: Optional[Dict] = None,
+        whereclause: Optional[BooleanClauseList] = None,
+        order_by: Optional[Sequence[Union[str, ClauseElement]]] = None,
+        limit: Optional[int] = None,
+        offset: Optional[int] = None,
+        **kwargs,
+    ) -> List[Any]:
+        shard = self.route(filter_params)
+        if shard is not None:
+            return await self._run(
+                shard, partial(super().filter, filter_params, whereclause, order_by, limit, offset, **kwargs),
+            )
+        # every shard may hold all rows of the page, so their first `offset + limit` rows are merged
+        offset = offset or 0
+        shard_limit = offset + limit if limit is not None else None
+        results = await self._scatter(
+            partial(super().filter, filter_params, whereclause, order_by, shard_limit, None, **kwargs),
+        )
+        rows = self._merge(self._raise_errors(results), order_by)
+        return rows[offset:shard_limit]
+
+    async def stream(
+        self,
+        whereclause: Optional[BooleanClauseList] = None,
+        order_by: Optional[Sequence[Union[str, ClauseElement]]] = None,
+        chunk_size: int = 1000,
+        columns: Optional[Sequence[str]] = None,
+        as_records: bool = False,
+    ) -> AsyncIterator[List[Any]]:
+        as_records = self._use_records(as_records)
+        query = self._get_stream_query(whereclause, order_by, columns, as_records)
+        shard = get_current_shard()
+        # engines are passed explicitly, current shard set around `yield` would leak to the consumer
+        for name in [shard] if shard is not None else self.shard_map.names:
+            engine = self.shard_map.get_engine(name)
+            async for partition in self._stream(engine, query, chunk_size, columns, as_records):
+                yield partition
+
+    async def count(self, whereclause: Optional[BooleanClauseList] = None) -> int:
+        if get_current_shard() is not None:
+            return await super().count(whereclause)
+        return sum(self._raise_errors(await self._scatter(partial(super().count, whereclause))))
+
+    async def estimate_count(self, whereclause: Optional[BooleanClauseList] = None) -> Optional[int]:
+        if get_current_shard() is not None:
+            return await super().estimate_count(whereclause)
+        estimates = self._raise_errors(await self._scatter(partial(super().estimate_count, whereclause)))
+        if all(estimate is None for estimate in estimates):
+            return None
+        return sum(estimate or 0 for estimate in estimates)
+
+    async def create(self, values: Mapping, columns: Optional[Sequence[str]] = None) -> Any:
+        return await self._run(self._get_values_shard(values), partial(super().create, values, columns))
+
+    async def bulk_create(
+        self,
+        values: Sequence[Mapping],
+        columns: Optional[Sequence[str]] = None,
+        chunk_size: int = 1000,
+    ) -> List[Any]:
+        indexes: Dict[str, List[int]] = {}
+        for index, item in enumerate(values):
+            indexes.setdefault(self._get_values_shard(item), []).append(index)
+        shards = list(indexes)
+        bulk_create = super().bulk_create
+        results = await asyncio.gather(*(
+            self._run(shard, partial(bulk_create, [values[index] for index in indexes[shard]], columns, chunk_size))
+            for shard in shards
+        ))
+        instances: List[Any] = [None] * len(values)
+        for shard, created in zip(shards, results):
+            for index, instance in zip(indexes[shard], created):
+                instances[index] = instance
+        return instances
+
+    async def update(
+        self,
+        instance,
+        values: Mapping,
+        columns: Optional[Sequence[str]] = None,
+        precondition: Optional[Dict] = None,
+    ):
+        shard = self._get_instance_shard(instance)
+        if self.shard_map.key in values and self.shard_map.get_shard(values[self.shard_map.key]) != shard:
+            raise FieldValidationError(f"`{self.shard_map.key}` can't be changed to a value of another shard")
+        return await self._run(shard, partial(super().update, instance, values, columns, precondition))
+
+    async def delete(self, instance, precondition: Optional[Dict] = None) -> None:
+        await self._run(self._get_instance_shard(instance), partial(super().delete, instance, precondition))
+
+    async def update_by(self, filter_params: Mapping, values: Mapping, *args, **kwargs):
+        shard = await self._locate(filter_params)
+        return await self._run(shard, partial(super().update_by, filter_params, values, *args, **kwargs))
+
+    async def delete_by(self, filter_params: Mapping, precondition: Optional[Dict] = None) -> None:
+        shard = await self._locate(filter_params)
+        await self._run(shard, partial(super().delete_by, filter_params, precondition))
+
+    async def bulk_update(self, filter_params: Optional[Mapping], values: Mapping, *args, **kwargs):
+        return await self._run_bulk(filter_params, partial(super().bulk_update, filter_params, values, *args, **kwargs))
+
+    async def bulk_delete(self, filter_params: Optional[Mapping] = None, *args, **kwargs):
+        return await self._run_bulk(filter_params, partial(super().bulk_delete, filter_params, *args, **kwargs))
+
+    async def _run(self, shard: str, operation: Callable[[], Awaitable]) -> Any:
+        with use_shard(shard):
+            return await operation()
+
+    async def _scatter(self, operation: Callable[[], Awaitable]) -> List[Any]:
+        """Run `operation` in all shards concurrently, results hold exceptions raised by it as well"""
+        return await asyncio.gather(
+            *(self._run(shard, operation) for shard in self.shard_map.names), return_exceptions=True,
+        )
+
+    async def _run_bulk(self, filter_params: Optional[Mapping], operation: Callable[[], Awaitable]):
+        shard = self.route(filter_params)
+        if shard is not None:
+            return await self._run(shard, operation)
+        results = self._raise_errors(await self._scatter(operation))
+        if results and isinstance(results[0], list):  # `returning` objects
+            return list(chain.from_iterable(results))
+        return sum(results)
+
+    async def _locate(self, filter_params: Mapping) -> str:
+        """
+        Shard of the only row matching `filter_params`. Without the shard key the row is looked up
+        in all shards first, so a write by lookup never touches several shards before failing.
+        """
+        shard = self.route(filter_params)
+        if shard is not None:
+            return shard
+        names = self.shard_map.names
+        results = await self._scatter(partial(super().get, filter_params, columns=[self.pk]))
+        self._get_single(results)
+        return next(name for name, result in zip(names, results) if not isinstance(result, BaseException))
+
+    @staticmethod
+    def _raise_errors(results: List[Any]) -> List[Any]:
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+        return results
+
+    def _get_single(self, results: List[Any]) -> Any:
+        """Result of the only shard holding the object, the object is looked up in all of them"""
+        found = self._raise_errors([result for result in results if not isinstance(result, ObjectNotFound)])
+        if not found:
+            raise ObjectNotFound("No row was found when one was required")
+        if len(found) > 1:
+            raise MultipleObjectsReturned("Multiple rows were found when exactly one was required")
+        return found[0]
+
+    def _get_values_shard(self, values: Mapping) -> str:
+        shard = self.route(values)
+        if shard is None:
+            raise FieldValidationError(f"`{self.shard_map.key}` is required to choose a shard")
+        return shard
+
+    def _get_instance_shard(self, instance) -> str:
+        shard = get_current_shard()
+        if shard is not None:
+            return shard
+        return self.shard_map.get_shard(getattr(instance, self.shard_map.key))
+
+    def _merge(self, results: List[List[Any]], order_by: Optional[Sequence[Union[str, ClauseElement]]]) -> List[Any]:
+        """Merge lists of shards, each of them is already sorted by `order_by`"""
+        if not order_by:
+            return list(chain.from_iterable(results))
+        assert all(isinstance(item, str) for item in order_by), "sharded lists can only be ordered by column names"
+        ordering = [(item.lstrip("-"), item.startswith("-")) for item in order_by]
+        if len({descending for _, descending in ordering}) == 1:
+            names = [name for name, _ in ordering]
+            return list(heapq.merge(
+                *results, key=lambda row: [self._get_sort_value(row, name) for name in names], reverse=ordering[0][1],
+            ))
+        # mixed directions, stable sorts from the least significant column
+        rows = list(chain.from_iterable(results))
+        for name, descending in reversed(ordering):
+            rows.sort(key=partial(self._get_sort_value, name=name), reverse=descending)
+        return rows
+
+    @staticmethod
+    def _get_sort_value(row: Any, name: str) -> Any:
+        value = row[name] if isinstance(row, Mapping) else getattr(row, name)
+        # postgres puts nulls after other values in ascending order (and before them in descending one)
+        return (value is None, 0 if value is None else value)
@@ -0,0 +1,155 @@
+import asyncio
+import sqlite3
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, List, Optional, Sequence
+
+from sqlalchemy import MetaData
+from sqlalchemy.dialects.postgresql.base import PGCompiler
+from sqlalchemy.dialects.sqlite.base import SQLiteCompiler
+from sqlalchemy.dialects.sqlite.pysqlite import SQLiteDialect_pysqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.schema import CreateIndex, CreateTable, DropTable
+from sqlalchemy.sql.elements import BooleanClauseList
+from sqlalchemy.sql.selectable import Select
+
+from aiohttp_rest_framework.db.native import NativeManager, NativeResult, NativeStatement
+from aiohttp_rest_framework.exceptions import FieldValidationError, UniqueViolationError
+
+__all__ = (
+    "SQLiteEngine",
+    "SQLiteManager",
+)
+
+
+class _SQLiteCompiler(SQLiteCompiler):
+    # sqlite supports `RETURNING` since 3.35, its syntax is the same as postgres one
+    returning_clause = PGCompiler.returning_clause
+
+
+class _SQLiteDialect(SQLiteDialect_pysqlite):
+    statement_compiler = _SQLiteCompiler
+
+
+class SQLiteEngine:
+    """
+    Embedded SQLite database of `url`, e.g. "sqlite:///data.db" ("sqlite://" is an in-memory one).
+    Statements run on a single aiosqlite connection opened on first use, `connect_kwargs` are passed
+    to `aiosqlite.connect()`. SQLite serializes writes anyway, so the connection is taken exclusively
+    by every statement and transaction. Foreign keys are enforced.
+    """
+
+    def __init__(self, url: str, **connect_kwargs):
+        self.url = make_url(url)
+        assert self.url.get_backend_name() == "sqlite", "SQLite database url has to start with `sqlite://`"
+        self.dialect = _SQLiteDialect()
+        self.connect_kwargs = connect_kwargs
+        self._connection = None
+        self._lock = asyncio.Lock()
+
+    @asynccontextmanager
+    async def connect(self, transaction: bool = False) -> AsyncIterator[Any]:
+        """aiosqlite connection, statements run in a transaction with `transaction`, otherwise in autocommit mode"""
+        async with self._lock:
+            connection = await self._get_connection()
+            if not transaction:
+                yield connection
+                return
+            await connection.execute("BEGIN")
+            try:
+                yield connection
+            except BaseException:
+                await connection.execute("ROLLBACK")
+                raise
+            await connection.execute("COMMIT")
+
+    async def _get_connection(self):
+        if self._connection is None:
+            import aiosqlite  # optional dependency, `pip install aiohttp-rest-framework[sqlite]`
+
+            # no implicit transactions, they are begun explicitly
+            kwargs = {"isolation_level": None, **self.connect_kwargs}
+            connection = await aiosqlite.connect(self.url.database or ":memory:", **kwargs)
+            await connection.execute("PRAGMA foreign_keys = ON")
+            self._connection = connection
+        return self._connection
+
+    async def create_all(self, metadata: MetaData) -> None:
+        async with self.connect(transaction=True) as connection:
+            for table in metadata.sorted_tables:
+                await connection.execute(str(CreateTable(table, if_not_exists=True).compile(dialect=self.dialect)))
+                for index in table.indexes:
+                    await connection.execute(str(CreateIndex(index).compile(dialect=self.dialect)))
+
+    async def drop_all(self, metadata: MetaData) -> None:
+        async with self.connect(transaction=True) as connection:
+            for table in reversed(metadata.sorted_tables):
+                await connection.execute(str(DropTable(table, if_exists=True).compile(dialect=self.dialect)))
+
+    async def dispose(self) -> None:
+        if self._connection is not None:
+            connection, self._connection = self._connection, None
+            await connection.close()
+
+
+class SQLiteManager(NativeManager):
+    """
+    Db manager of models stored in `SQLiteEngine`, `get_connection` of the config has to return one.
+    Estimated counts aren't available, streamed rows are read at once, so the shared connection
+    isn't held while the chunks are consumed. `session_scope()` isn't supported.
+    """
+
+    # default `SQLITE_MAX_VARIABLE_NUMBER` of sqlite 3.32+
+    MAX_BIND_PARAMS = 32766
+    driver_errors = (sqlite3.Error, OverflowError)
+
+    async def estimate_count(self, whereclause: Optional[BooleanClauseList] = None) -> Optional[int]:
+        return None
+
+    def connection(self, engine: SQLiteEngine, transaction: bool = False):
+        return engine.connect(transaction)
+
+    def get_dialect(self, engine: SQLiteEngine):
+        return engine.dialect
+
+    async def _stream(
+        self,
+        engine: SQLiteEngine,
+        query: Select,
+        chunk_size: int,
+        columns: Optional[Sequence[str]],
+        as_records: bool,
+    ) -> AsyncIterator[List[Any]]:
+        async with self.connection(engine) as connection:
+            rows = (await self._run(connection, engine, query)).rows
+        for start in range(0, len(rows), chunk_size):
+            partition = rows[start:start + chunk_size]
+            if as_records:
+                partition = self.to_records(partition)
+            elif not self._is_core:
+                partition = [self.to_model_instance(row) for row in partition]
+            yield partition
+
+    async def _run_statement(
+        self,
+        connection: Any,
+        statement: NativeStatement,
+        sql: str,
+        arguments: List[Any],
+    ) -> NativeResult:
+        async with connection.execute(sql, arguments) as cursor:
+            if not statement.returns_rows:
+                return NativeResult([], cursor.rowcount)
+            records = await cursor.fetchall()
+            names = [column[0] for column in cursor.description] if cursor.description else None
+            rows = statement.to_rows(records, names)
+            return NativeResult(rows, len(rows))
+
+    def _get_native_exception(self, exc: Exception) -> Exception:
+        if isinstance(exc, sqlite3.IntegrityError):
+            if str(exc).startswith("UNIQUE"):
+                return UniqueViolationError(str(exc))
+            return FieldValidationError(str(exc))  # NOT NULL, FOREIGN KEY and CHECK constraints
+        # a value can't be bound, e.g. integer is too big
+        if isinstance(exc, (sqlite3.InterfaceError, sqlite3.DataError, OverflowError)):
+            return FieldValidationError(str(exc))
+        return exc
@@ -1,5 +1,3 @@
-import json
-
 from aiohttp import hdrs, web
 
 __all__ = [
@@ -9,8 +7,11 @@ __all__ = [
     "MultipleObjectsReturned",
     "FieldValidationError",
     "UniqueViolationError",
+    "PreconditionFailed",
     "ValidationError",
     "HTTPNotFound",
+    "HTTPPreconditionFailed",
+    "HTTPRequestEntityTooLarge",
 ]
 
 
@@ -56,17 +57,45 @@ class UniqueViolationError(DatabaseException):
         super().__init__(message)
 
 
+class PreconditionFailed(DatabaseException):
+    """Object didn't match write precondition (e.g. its version has changed)"""
+
+    def __init__(self, message: str = "Precondition failed"):
+        super().__init__(message)
+
+
+def _render_json(data) -> bytes:
+    from aiohttp_rest_framework.settings import render_json  # settings depend on this module
+
+    return render_json(data)
+
+
 class ValidationError(web.HTTPBadRequest):
     """Like ma's ValidationError`, but raises Http 400"""
 
     def __init__(self, detail=None, **kwargs):
         super().__init__(**kwargs)
+        self.detail = detail
         self._headers[hdrs.CONTENT_TYPE] = "application/json"
-        self.text = json.dumps(detail)
+        self.body = _render_json(detail)
 
 
 class HTTPNotFound(web.HTTPNotFound):
     def __init__(self, detail: str = None, **kwargs):
         super().__init__(**kwargs)
         self._headers[hdrs.CONTENT_TYPE] = "application/json"
-        self.text = json.dumps({"error": detail or "Not found"})
+        self.body = _render_json({"error": detail or "Not found"})
+
+
+class HTTPPreconditionFailed(web.HTTPPreconditionFailed):
+    def __init__(self, detail: str = None, **kwargs):
+        super().__init__(**kwargs)
+        self._headers[hdrs.CONTENT_TYPE] = "application/json"
+        self.body = _render_json({"error": detail or "Precondition failed"})
+
+
+class HTTPRequestEntityTooLarge(web.HTTPRequestEntityTooLarge):
+    def __init__(self, max_size: int, actual_size: int, **kwargs):
+        super().__init__(max_size, actual_size, **kwargs)
+        self._headers[hdrs.CONTENT_TYPE] = "application/json"
+        self.body = _render_json({"error": f"Request body is too large, maximum size is {max_size} bytes"})
@@ -50,10 +50,11 @@ def patch_marshmallow_fields():
 
     globals().update(**ma_fields)
 
-    # also update mapping with patched classes
-    for key, value in sa_ma_pg_field_mapping.items():
-        if value.__name__ in ma_fields:
-            sa_ma_pg_field_mapping[key] = ma_fields[value.__name__]  # noqa
+    # also update mappings with patched classes
+    for mapping in (sa_ma_pg_field_mapping, sa_ma_sqlite_field_mapping):
+        for key, value in mapping.items():
+            if value.__name__ in ma_fields:
+                mapping[key] = ma_fields[value.__name__]  # noqa
 
     _MA_FIELDS_PATCHED = True
 
@@ -196,6 +197,11 @@ sa_ma_pg_field_mapping: SASerializerFieldMapping = {
     JSON: ma.fields.Dict,
 }
 
+sa_ma_sqlite_field_mapping: SASerializerFieldMapping = {
+    **sa_ma_field_mapping,
+    sa.JSON: ma.fields.Dict,
+}
+
 
 class FieldBuilderABC(metaclass=abc.ABCMeta):
     @abc.abstractmethod
@@ -208,6 +214,8 @@ class FieldBuilderABC(metaclass=abc.ABCMeta):
 
 
 class SAFieldBuilder(FieldBuilderABC):
+    field_mapping: SASerializerFieldMapping = sa_ma_pg_field_mapping
+
     def build(
         self,
         name: str,
@@ -225,7 +233,7 @@ class SAFieldBuilder(FieldBuilderABC):
             f"in {table.name} model"
         )
 
-        mapping = ClassLookupDict(sa_ma_pg_field_mapping)
+        mapping = ClassLookupDict(self.field_mapping)
         field_cls = mapping.get(column.type, ma.fields.Inferred)
 
         self._set_db_specific_kwargs(column, kwargs)
@@ -260,3 +268,7 @@ class SAFieldBuilder(FieldBuilderABC):
 
         if issubclass(field_cls, UUID):
             kwargs["as_uuid"] = column.type.as_uuid
+
+
+class SQLiteFieldBuilder(SAFieldBuilder):
+    field_mapping = sa_ma_sqlite_field_mapping
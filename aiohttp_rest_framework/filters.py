@@ -0,0 +1,108 @@
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+import marshmallow as ma
+from aiohttp import web
+from sqlalchemy import and_
+
+from aiohttp_rest_framework.db.base import BaseDBManager
+from aiohttp_rest_framework.exceptions import ValidationError
+
+__all__ = (
+    "BaseFilterBackend",
+    "FieldFilterBackend",
+)
+
+
+class BaseFilterBackend:
+    """A base class from which all filter backend classes should inherit."""
+
+    def filter_whereclause(
+        self,
+        request: web.Request,
+        whereclause: Optional[Any],
+        db_manager: BaseDBManager,
+        view,
+    ) -> Optional[Any]:
+        """Return a whereclause narrowed down by filters of this backend"""
+        raise NotImplementedError("`filter_whereclause()` must be implemented.")
+
+
+class FieldFilterBackend(BaseFilterBackend):
+    """
+    Filters list by query parameters declared in view's `filterset_fields`.
+
+    `filterset_fields` is either a sequence of field names (only exact match is allowed),
+    or a mapping of field names to allowed lookups, e.g.:
+
+        filterset_fields = {
+            "status": ["exact", "in"],
+            "created_at": ["gte", "lte"],
+        }
+
+    which allows `?status=active&created_at__gte=2021-01-01T00:00:00&status__in=active,pending`.
+    Values are deserialized with corresponding serializer fields,
+    so they are validated and typed before they are passed to the database.
+    """
+
+    lookup_separator: str = "__"
+    list_separator: str = ","
+    list_lookups: Tuple[str, ...] = ("in",)
+    boolean_lookups: Tuple[str, ...] = ("isnull",)
+
+    def filter_whereclause(
+        self,
+        request: web.Request,
+        whereclause: Optional[Any],
+        db_manager: BaseDBManager,
+        view,
+    ) -> Optional[Any]:
+        filterset = self.get_filterset_fields(view)
+        if not filterset:
+            return whereclause
+
+        serializer = view.get_serializer(only=None)  # filter by any field, not only requested ones
+        clauses = []
+        errors: Dict[str, List[str]] = {}
+        for param, raw_value in request.query.items():
+            name, lookup = self.parse_param(param)
+            if lookup not in filterset.get(name, ()):
+                continue
+            field = serializer.fields.get(name)
+            assert field is not None, (
+                f"`{name}` from `filterset_fields` has to be a field of {serializer.__class__.__name__}"
+            )
+            try:
+                value = self.to_internal_value(field, lookup, raw_value)
+            except ma.ValidationError as exc:
+                errors[param] = exc.messages
+                continue
+            clauses.append(db_manager.get_lookup_clause(field.attribute or name, lookup, value))
+
+        if errors:
+            raise ValidationError(errors)
+        if whereclause is not None:
+            clauses.insert(0, whereclause)
+        if not clauses:
+            return None
+        return and_(*clauses)
+
+    def get_filterset_fields(self, view) -> Mapping[str, Sequence[str]]:
+        filterset_fields = getattr(view, "filterset_fields", None)
+        if not filterset_fields:
+            return {}
+        if isinstance(filterset_fields, Mapping):
+            return filterset_fields
+        return {name: ("exact",) for name in filterset_fields}
+
+    def parse_param(self, param: str) -> Tuple[str, str]:
+        name, separator, lookup = param.rpartition(self.lookup_separator)
+        if not separator:
+            return param, "exact"
+        return name, lookup
+
+    def to_internal_value(self, field: ma.fields.Field, lookup: str, raw_value: str) -> Any:
+        if lookup in self.boolean_lookups:
+            return ma.fields.Boolean().deserialize(raw_value)
+        if lookup in self.list_lookups:
+            return [field.deserialize(item) for item in raw_value.split(self.list_separator)]
+        return field.deserialize(raw_value)
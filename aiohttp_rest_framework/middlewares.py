@@ -0,0 +1,104 @@
+import math
+import time
+from typing import Callable, Optional
+
+from aiohttp import hdrs, web
+
+from aiohttp_rest_framework import APP_CONFIG_KEY
+from aiohttp_rest_framework.db.replicas import use_primary
+from aiohttp_rest_framework.db.sa import session_scope
+from aiohttp_rest_framework.db.shards import use_shard
+
+__all__ = (
+    "session_middleware",
+    "read_your_writes_middleware",
+    "shard_middleware",
+    "READ_YOUR_WRITES_COOKIE",
+)
+
+# holds the time client's reads are routed to the primary until
+READ_YOUR_WRITES_COOKIE = "arf_primary_until"
+SAFE_METHODS = (hdrs.METH_GET, hdrs.METH_HEAD, hdrs.METH_OPTIONS)
+
+
+@web.middleware
+async def session_middleware(request: web.Request, handler):
+    """
+    Run every request in a single database session and transaction shared by views, serializers
+    and db managers, e.g. `PATCH` reads and updates the object using one connection and commits once.
+    Transaction is committed unless request fails, i.e. unhandled exception or an error status (4xx, 5xx).
+
+        app = web.Application(middlewares=[session_middleware])
+    """
+    config = request.app[APP_CONFIG_KEY]
+    engine = await config.get_connection()
+    async with session_scope(engine) as scope:
+        try:
+            response = await handler(request)
+        except web.HTTPException as exc:
+            if exc.status >= 400:
+                raise
+            response = exc  # e.g. `204 No Content` of deleted object, raised after commit
+        if response.status >= 400:
+            scope.rollback_only = True
+    if isinstance(response, web.HTTPException):
+        raise response
+    return response
+
+
+@web.middleware
+async def read_your_writes_middleware(request: web.Request, handler):
+    """
+    Route all reads of a write request and of the client's requests for `Config.read_your_writes_timeout`
+    seconds after its successful write to the primary database, so the client sees its own changes
+    even if replicas are behind. The client is recognized by a cookie set on responses to its writes.
+
+        app = web.Application(middlewares=[read_your_writes_middleware])
+    """
+    is_write = request.method not in SAFE_METHODS
+    if not is_write and not _is_pinned_to_primary(request):
+        return await handler(request)
+
+    config = request.app[APP_CONFIG_KEY]
+    with use_primary():
+        try:
+            response = await handler(request)
+        except web.HTTPException as exc:
+            if is_write and exc.status < 400:  # e.g. `204 No Content` of deleted object
+                _pin_to_primary(exc, config.read_your_writes_timeout)
+            raise
+    if is_write and response.status < 400:
+        _pin_to_primary(response, config.read_your_writes_timeout)
+    return response
+
+
+def _is_pinned_to_primary(request: web.Request) -> bool:
+    try:
+        return float(request.cookies.get(READ_YOUR_WRITES_COOKIE, 0)) > time.time()
+    except ValueError:
+        return False
+
+
+def _pin_to_primary(response: web.StreamResponse, timeout: float) -> None:
+    if timeout > 0 and not response.prepared:
+        deadline = time.time() + timeout
+        response.set_cookie(READ_YOUR_WRITES_COOKIE, f"{deadline:.3f}", max_age=math.ceil(timeout), httponly=True)
+
+
+def shard_middleware(get_shard: Callable[[web.Request], Optional[str]]):
+    """
+    Run statements of sharded models in the shard returned by `get_shard(request)`, e.g. tenant's shard
+    taken from a header or the url. Statements of requests it returns `None` for are routed by shard keys.
+
+        app = web.Application(middlewares=[shard_middleware(lambda request: request.headers.get("X-Shard"))])
+    """
+
+    @web.middleware
+    async def middleware(request: web.Request, handler):
+        shard = get_shard(request)
+        if shard is None:
+            return await handler(request)
+        with use_shard(shard):
+            return await handler(request)
+
+    return middleware
@@ -1,71 +1,248 @@
-from aiohttp import web
+import asyncio
+from typing import Any, AsyncIterator
 
+from aiohttp import hdrs, web
+
+from aiohttp_rest_framework.exceptions import ValidationError
+from aiohttp_rest_framework.parsers import JSONArrayParser
 from aiohttp_rest_framework.serializers import Serializer
 
 __all__ = (
     "CreateModelMixin",
     "ListModelMixin",
+    "StreamingListModelMixin",
     "RetrieveModelMixin",
     "UpdateModelMixin",
     "DestroyModelMixin",
+    "BulkUpdateModelMixin",
+    "BulkDestroyModelMixin",
 )
 
 
 class CreateModelMixin:
     async def create(self):
-        data = await self.request.text()
-        serializer = self.get_serializer(data=data, as_text=True)
-        serializer.is_valid(raise_exception=True)
+        chunks = self.iter_body()
+        head = b""
+        async for chunk in chunks:  # read until the type of JSON document is known
+            head += chunk
+            if head.strip():
+                break
+
+        if self.allow_bulk_create and head.lstrip().startswith(b"["):
+            # JSON array creates all objects at once, items are validated while the rest is being uploaded
+            serializer = self.get_serializer(many=True)
+            await serializer.is_valid_iter(self.iter_json_array(head, chunks), raise_exception=True)
+        else:
+            data = head + b"".join([chunk async for chunk in chunks])
+            serializer = self.get_serializer(data=data, as_text=True)
+            await self.validate(serializer, len(data))
 
         await self.perform_create(serializer)
-        return web.json_response(serializer.data, status=201)
+        return self.json_response(serializer.data, status=201)
+
+    async def iter_json_array(self, head: bytes, chunks: AsyncIterator[bytes]) -> AsyncIterator[Any]:
+        """Items of JSON array from request body chunks, every item is yielded as soon as it's received"""
+        parser = JSONArrayParser(self.rest_config.json_loads)
+        try:
+            for item in parser.feed(head):
+                yield item
+            async for chunk in chunks:
+                for item in parser.feed(chunk):
+                    yield item
+            parser.close()
+        except ValueError:
+            raise ValidationError({"error": "invalid json"})
 
     async def perform_create(self, serializer: Serializer):
-        return await serializer.save()
+        instance = await serializer.save()
+        await self.invalidate_cache()
+        return instance
 
 
 class ListModelMixin:
     async def list(self):
-        instances = await self.get_list()
+        response = await self.cache_response(self.get_list_response)
+        return self.make_conditional(response)
+
+    async def get_list_response(self) -> web.Response:
+        # count query (if enabled) runs concurrently with the list query
+        instances, total_count = await asyncio.gather(self.get_list(), self.get_total_count())
         serializer = self.get_serializer(instances, many=True)
-        return web.json_response(serializer.data)
+        if self.should_offload(rows=len(instances)):
+            # big lists are dumped (and rendered if possible) out of the event loop
+            executor = self.get_offload_executor()
+            if self.paginator is not None:
+                response = self.get_paginated_response(await serializer.data_in_executor(executor))
+            else:
+                response = self.json_response(body=await serializer.render_json_in_executor(executor))
+        elif self.paginator is not None:
+            response = self.get_paginated_response(serializer.data)
+        else:
+            response = self.json_response(serializer.data)
+        if total_count is not None:
+            response.headers[self.total_count_header] = str(total_count)
+        return response
+
+
+class StreamingListModelMixin:
+    """
+    Streams the whole list as a JSON array (or NDJSON) without buffering it.
+    Rows are read from the database with a server side cursor in chunks of
+    `stream_chunk_size` and every chunk is serialized and written right away.
+    """
+
+    JSON = "json"
+    NDJSON = "ndjson"
+
+    stream_format: str = JSON
+
+    async def stream_list(self):
+        stream_format = self.get_stream_format()
+        response = web.StreamResponse()
+        response.content_type = "application/x-ndjson" if stream_format == self.NDJSON else "application/json"
+        response.enable_chunked_encoding()
+        await response.prepare(self.request)
+
+        is_first_chunk = True
+        if stream_format == self.JSON:
+            await response.write(b"[")
+        async for instances in self.get_list_stream():
+            serializer = self.get_serializer(instances, many=True)
+            chunk = self.render_stream_chunk(serializer.data, stream_format, is_first_chunk)
+            if chunk:
+                await response.write(chunk)
+                is_first_chunk = False
+        if stream_format == self.JSON:
+            await response.write(b"]")
+
+        await response.write_eof()
+        return response
+
+    def get_stream_format(self) -> str:
+        if "application/x-ndjson" in self.request.headers.get(hdrs.ACCEPT, ""):
+            return self.NDJSON
+        return self.stream_format
+
+    def render_stream_chunk(self, data: list, stream_format: str, is_first_chunk: bool) -> bytes:
+        if not data:
+            return b""
+        if stream_format == self.NDJSON:
+            return b"".join(self.render_json(item) + b"\n" for item in data)
+        items = self.render_json(data)[1:-1]  # strip brackets, the array is opened and closed once per response
+        return items if is_first_chunk else b"," + items
 
 
 class RetrieveModelMixin:
     async def retrieve(self):
+        response = await self.cache_response(self.get_retrieve_response)
+        return self.make_conditional(response)
+
+    async def get_retrieve_response(self) -> web.Response:
         instance = await self.get_object()
+        etag, last_modified = self.get_version_validators(instance)
+        if etag is not None and not self.is_cache_enabled() and self.is_not_modified(etag, last_modified):
+            # object's version is known, no need to serialize it at all
+            return self.get_not_modified_response(etag, last_modified)
         serializer = self.get_serializer(instance)
-        return web.json_response(serializer.data)
+        response = self.json_response(serializer.data)
+        self._set_validators(response, etag, last_modified)
+        return response
 
 
 class UpdateModelMixin:
     async def update(self):
-        instance = await self.get_object()
+        # with `write_by_lookup` the object isn't fetched, it's updated in the same statement that finds it
+        by_lookup = self.can_write_by_lookup()
+        instance = None if by_lookup else await self.get_object()
+        await self.check_write_precondition(instance)
 
-        data = await self.request.text()
+        data = await self.read_body()
         partial = self.kwargs.pop("partial", False)
         serializer = self.get_serializer(instance, data=data, as_text=True,
                                          partial=partial)
-        serializer.is_valid(raise_exception=True)
+        await self.validate(serializer, len(data))
 
-        await self.perform_update(serializer)
+        if by_lookup:
+            await self.perform_update_by_lookup(serializer)
+        else:
+            await self.perform_update(serializer)
 
-        return web.json_response(serializer.data)
+        etag, last_modified = self.get_version_validators(serializer.instance)
+        return self.make_conditional(self.json_response(serializer.data), etag, last_modified)
 
     def partial_update(self):
         self.kwargs["partial"] = True
         return self.update()
 
     async def perform_update(self, serializer: Serializer):
-        return await serializer.save()
+        instance = await serializer.save()
+        await self.invalidate_cache()
+        return instance
+
+    async def perform_update_by_lookup(self, serializer: Serializer):
+        instance = await serializer.save_by_lookup(self.get_lookup())
+        await self.invalidate_cache()
+        return instance
 
 
 class DestroyModelMixin:
     async def destroy(self):
+        if self.can_write_by_lookup():
+            await self.check_write_precondition(None)
+            await self.perform_destroy_by_lookup(self.get_serializer())
+            raise web.HTTPNoContent()
+
         instance = await self.get_object()
+        await self.check_write_precondition(instance)
         serializer = self.get_serializer(instance)
         await self.perform_destroy(serializer)
         raise web.HTTPNoContent()
 
     async def perform_destroy(self, serializer: Serializer):
         await serializer.delete()
+        await self.invalidate_cache()
+
+    async def perform_destroy_by_lookup(self, serializer: Serializer):
+        await serializer.delete_by_lookup(self.get_lookup())
+        await self.invalidate_cache()
+
+
+class BulkUpdateModelMixin:
+    """
+    Updates all objects matching `filter_backends` filters with a single `UPDATE ... WHERE` statement.
+    Request body is validated as a partial object, response holds the number of updated objects
+    or the objects themselves, see `get_bulk_returning()`.
+    """
+
+    async def bulk_update(self):
+        whereclause = await self.get_bulk_whereclause()
+        data = await self.read_body()
+        serializer = self.get_serializer(data=data, as_text=True, partial=True)
+        await self.validate(serializer, len(data))
+        if not serializer.validated_data:
+            raise ValidationError({"error": "No data provided"})
+
+        returning = self.get_bulk_returning()
+        result = await self.perform_bulk_update(serializer, whereclause, returning)
+        return self.get_bulk_response(result, returning)
+
+    async def perform_bulk_update(self, serializer: Serializer, whereclause, returning: bool):
+        result = await serializer.bulk_update(serializer.validated_data, whereclause, returning=returning)
+        await self.invalidate_cache()
+        return result
+
+
+class BulkDestroyModelMixin:
+    """Deletes all objects matching `filter_backends` filters with a single `DELETE ... WHERE` statement"""
+
+    async def bulk_destroy(self):
+        whereclause = await self.get_bulk_whereclause()
+        returning = self.get_bulk_returning()
+        serializer = self.get_serializer()
+        result = await self.perform_bulk_destroy(serializer, whereclause, returning)
+        return self.get_bulk_response(result, returning)
+
+    async def perform_bulk_destroy(self, serializer: Serializer, whereclause, returning: bool):
+        result = await serializer.bulk_delete(whereclause, returning=returning)
+        await self.invalidate_cache()
+        return result
@@ -0,0 +1,329 @@
+import base64
+import binascii
+import datetime
+import decimal
+import enum
+import json
+import uuid
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from aiohttp import web
+from sqlalchemy import and_
+
+from aiohttp_rest_framework.db.base import BaseDBManager
+from aiohttp_rest_framework.exceptions import ValidationError
+
+__all__ = (
+    "BasePagination",
+    "LimitOffsetPagination",
+    "CursorPagination",
+)
+
+
+def _positive_int(value: str, strict: bool = False, cutoff: Optional[int] = None) -> int:
+    """Cast a string to a strictly positive integer"""
+    ret = int(value)
+    if ret < 0 or (ret == 0 and strict):
+        raise ValueError()
+    if cutoff:
+        return min(ret, cutoff)
+    return ret
+
+
+class BasePagination:
+    async def paginate_list(
+        self,
+        db_manager: BaseDBManager,
+        request: web.Request,
+        view,
+        whereclause: Optional[Any] = None,
+        columns: Optional[Sequence[str]] = None,
+        as_mappings: bool = False,
+        as_records: bool = False,
+    ) -> List[Any]:
+        raise NotImplementedError("`paginate_list()` must be implemented.")
+
+    def get_paginated_response(self, data) -> web.Response:
+        raise NotImplementedError("`get_paginated_response()` must be implemented.")
+
+    @staticmethod
+    def _get_row_kwargs(as_mappings: bool, as_records: bool) -> Dict[str, bool]:
+        # options are only passed when they are set, so custom db managers don't have to support them
+        if as_mappings:
+            return {"as_mappings": True}
+        if as_records:
+            return {"as_records": True}
+        return {}
+
+    def get_ordering(self, db_manager: BaseDBManager) -> Tuple[str, ...]:
+        """
+        Ordering of the pages. Primary key is always added as the last ordering field,
+        so pages are stable even if other ordering fields are not unique.
+        """
+        ordering = tuple(getattr(self, "ordering", None) or ())
+        if db_manager.pk not in (name.lstrip("-") for name in ordering):
+            ordering += (db_manager.pk,)
+        return ordering
+
+
+class LimitOffsetPagination(BasePagination):
+    """
+    Simple limit/offset pagination, e.g. `GET /users?limit=100&offset=400`.
+    Every page is fetched with a single `ORDER BY ... LIMIT ... OFFSET ...` query,
+    prefer `CursorPagination` for really big tables where clients go deep into the list.
+    """
+
+    default_limit: int = 100
+    max_limit: int = 1000
+    limit_query_param: str = "limit"
+    offset_query_param: str = "offset"
+    ordering: Optional[Sequence[str]] = None
+
+    limit: int = None
+    offset: int = None
+    request: web.Request = None
+    view = None
+    _has_next: bool = False
+
+    async def paginate_list(
+        self,
+        db_manager: BaseDBManager,
+        request: web.Request,
+        view,
+        whereclause: Optional[Any] = None,
+        columns: Optional[Sequence[str]] = None,
+        as_mappings: bool = False,
+        as_records: bool = False,
+    ) -> List[Any]:
+        self.request = request
+        self.view = view
+        self.limit = self.get_limit(request)
+        self.offset = self.get_offset(request)
+
+        # fetch one extra row to find out if there is a next page without counting rows
+        instances = await db_manager.filter(
+            whereclause=whereclause,
+            order_by=self.get_ordering(db_manager),
+            limit=self.limit + 1,
+            offset=self.offset,
+            columns=columns,
+            **self._get_row_kwargs(as_mappings, as_records),
+        )
+        self._has_next = len(instances) > self.limit
+        return instances[:self.limit]
+
+    def get_paginated_response(self, data) -> web.Response:
+        return self.view.json_response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_limit(self, request: web.Request) -> int:
+        try:
+            return _positive_int(
+                request.query[self.limit_query_param],
+                strict=True,
+                cutoff=self.max_limit,
+            )
+        except (KeyError, ValueError):
+            return min(self.default_limit, self.max_limit)
+
+    def get_offset(self, request: web.Request) -> int:
+        try:
+            return _positive_int(request.query[self.offset_query_param])
+        except (KeyError, ValueError):
+            return 0
+
+    def get_next_link(self) -> Optional[str]:
+        if not self._has_next:
+            return None
+        url = self.request.url.update_query({
+            self.limit_query_param: self.limit,
+            self.offset_query_param: self.offset + self.limit,
+        })
+        return str(url)
+
+    def get_previous_link(self) -> Optional[str]:
+        if self.offset <= 0:
+            return None
+        url = self.request.url.update_query({
+            self.limit_query_param: self.limit,
+            self.offset_query_param: max(self.offset - self.limit, 0),
+        })
+        return str(url)
+
+
+class CursorPagination(BasePagination):
+    """
+    Keyset pagination with opaque cursors, e.g. `GET /users?cursor=eyJwIjpbIjIwMjEtMDEtMDEi...`.
+    Instead of `OFFSET` every page is selected with `WHERE (ordering fields) > (last seen values)`,
+    so the cost of a page doesn't depend on how deep the client is in the list as long as
+    ordering fields are covered by an index.
+    """
+
+    cursor_query_param: str = "cursor"
+    page_size: int = 100
+    page_size_query_param: Optional[str] = None
+    max_page_size: int = 1000
+    # column names, prefix with "-" for descending order; primary key is used when not set
+    ordering: Optional[Sequence[str]] = None
+
+    request: web.Request = None
+    view = None
+    page_size_value: int = None
+    _next_position: Optional[Sequence] = None
+    _previous_position: Optional[Sequence] = None
+
+    async def paginate_list(
+        self,
+        db_manager: BaseDBManager,
+        request: web.Request,
+        view,
+        whereclause: Optional[Any] = None,
+        columns: Optional[Sequence[str]] = None,
+        as_mappings: bool = False,
+        as_records: bool = False,
+    ) -> List[Any]:
+        self.request = request
+        self.view = view
+        self.page_size_value = self.get_page_size(request)
+        ordering = self.get_ordering(db_manager)
+        position, reverse = self.decode_cursor(request, db_manager, ordering)
+
+        query_ordering = self._invert_ordering(ordering) if reverse else ordering
+        clauses = [whereclause] if whereclause is not None else []
+        if position is not None:
+            clauses.append(db_manager.get_keyset_whereclause(query_ordering, position))
+
+        instances = await db_manager.filter(
+            whereclause=and_(*clauses) if clauses else None,
+            order_by=query_ordering,
+            limit=self.page_size_value + 1,
+            columns=self._get_columns(columns, ordering),
+            **self._get_row_kwargs(as_mappings, as_records),
+        )
+        has_more = len(instances) > self.page_size_value
+        instances = instances[:self.page_size_value]
+        if reverse:
+            instances.reverse()
+
+        if reverse:
+            has_next, has_previous = position is not None, has_more
+        else:
+            has_next, has_previous = has_more, position is not None
+
+        self._next_position = None
+        self._previous_position = None
+        if instances:
+            if has_next:
+                self._next_position = self._get_position(instances[-1], ordering)
+            if has_previous:
+                self._previous_position = self._get_position(instances[0], ordering)
+        return instances
+
+    def get_paginated_response(self, data) -> web.Response:
+        return self.view.json_response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_ordering(self, db_manager: BaseDBManager) -> Tuple[str, ...]:
+        """
+        Ordering columns have to be `NOT NULL`: keyset conditions compared to `NULL` are never true,
+        so pages would silently stop at or skip rows with `NULL` values.
+        """
+        ordering = super().get_ordering(db_manager)
+        nullable = [name for name in ordering if db_manager.table.columns[name.lstrip("-")].nullable]
+        assert not nullable, (
+            f"`{type(self).__name__}.ordering` can't include nullable columns: {', '.join(nullable)}"
+        )
+        return ordering
+
+    def get_page_size(self, request: web.Request) -> int:
+        if self.page_size_query_param:
+            try:
+                return _positive_int(
+                    request.query[self.page_size_query_param],
+                    strict=True,
+                    cutoff=self.max_page_size,
+                )
+            except (KeyError, ValueError):
+                pass
+        return min(self.page_size, self.max_page_size)
+
+    def get_next_link(self) -> Optional[str]:
+        if self._next_position is None:
+            return None
+        return self._build_link(self._next_position, reverse=False)
+
+    def get_previous_link(self) -> Optional[str]:
+        if self._previous_position is None:
+            return None
+        return self._build_link(self._previous_position, reverse=True)
+
+    def decode_cursor(
+        self,
+        request: web.Request,
+        db_manager: BaseDBManager,
+        ordering: Sequence[str],
+    ) -> Tuple[Optional[Sequence], bool]:
+        encoded = request.query.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            padding = "=" * (-len(encoded) % 4)
+            cursor = json.loads(base64.urlsafe_b64decode(encoded + padding))
+            values, reverse = cursor["p"], bool(cursor.get("r"))
+            if len(values) != len(ordering):
+                raise ValueError()
+            position = [
+                db_manager.to_python(name.lstrip("-"), value)
+                for name, value in zip(ordering, values)
+            ]
+        except (TypeError, ValueError, KeyError, LookupError, binascii.Error):
+            raise ValidationError({"error": "invalid cursor"})
+        return position, reverse
+
+    def encode_cursor(self, position: Sequence, reverse: bool = False) -> str:
+        cursor = {"p": list(position)}
+        if reverse:
+            cursor["r"] = 1
+        dumped = json.dumps(cursor, default=self._encode_value, separators=(",", ":"))
+        return base64.urlsafe_b64encode(dumped.encode()).decode().rstrip("=")
+
+    def _build_link(self, position: Sequence, reverse: bool) -> str:
+        url = self.request.url.update_query({
+            self.cursor_query_param: self.encode_cursor(position, reverse=reverse),
+        })
+        return str(url)
+
+    @staticmethod
+    def _get_columns(columns: Optional[Sequence[str]], ordering: Sequence[str]) -> Optional[Tuple[str, ...]]:
+        """Cursor position is taken from ordering fields, so they have to be selected"""
+        if columns is None:
+            return None
+        return tuple(dict.fromkeys((*columns, *(name.lstrip("-") for name in ordering))))
+
+    @staticmethod
+    def _get_position(instance, ordering: Sequence[str]) -> Tuple:
+        if isinstance(instance, Mapping):  # row mapping
+            return tuple(instance[name.lstrip("-")] for name in ordering)
+        return tuple(getattr(instance, name.lstrip("-")) for name in ordering)
+
+    @staticmethod
+    def _invert_ordering(ordering: Sequence[str]) -> Tuple[str, ...]:
+        return tuple(name[1:] if name.startswith("-") else f"-{name}" for name in ordering)
+
+    @staticmethod
+    def _encode_value(value: Any) -> Any:
+        if isinstance(value, enum.Enum):
+            return value.name
+        if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+            return value.isoformat()
+        if isinstance(value, datetime.timedelta):
+            return value.total_seconds()
+        if isinstance(value, (decimal.Decimal, uuid.UUID)):
+            return str(value)
+        raise TypeError(f"Object of type {value.__class__.__name__} is not JSON serializable")
@@ -0,0 +1,115 @@
+import json
+import re
+from typing import Any, Callable, List, Optional, Union
+
+__all__ = (
+    "JSONArrayParser",
+)
+
+_TOKEN_RE = re.compile(rb'[\[\]{},"]')
+_STRING_TOKEN_RE = re.compile(rb'["\\]')
+_WHITESPACE = b" \t\n\r"
+_CLOSING_BRACKETS = {ord("]"): ord("["), ord("}"): ord("{")}
+
+
+class JSONArrayParser:
+    """
+    Incremental parser of a JSON array, e.g. a request body being uploaded.
+    Chunks are fed as they arrive and every complete item of the array is returned
+    as soon as it's received, so it can be processed before the rest of the array is here.
+    Only item boundaries are found by the parser itself, items are decoded with `json_loads`.
+    """
+
+    def __init__(self, json_loads: Callable[[Union[str, bytes]], Any] = json.loads):
+        self.json_loads = json_loads
+        self._buffer = bytearray()
+        self._pos = 0
+        # opening brackets of the array and its items which aren't closed yet
+        self._brackets = bytearray()
+        self._in_string = False
+        self._item_start: Optional[int] = None
+        self._items_count = 0
+        self._started = False
+        self._finished = False
+
+    def feed(self, chunk: bytes) -> List[Any]:
+        """Feed next chunk, returns items completed by it. Raises `ValueError` for malformed input."""
+        if self._finished:
+            if chunk.strip(_WHITESPACE):
+                raise ValueError("Extra data after the end of JSON array")
+            return []
+        buffer = self._buffer
+        buffer += chunk
+        if not self._started:
+            stripped = buffer.lstrip(_WHITESPACE)
+            if not stripped:
+                buffer.clear()
+                return []
+            if stripped[:1] != b"[":
+                raise ValueError("JSON array expected")
+            del buffer[:len(buffer) - len(stripped) + 1]
+            self._started = True
+            self._brackets = bytearray(b"[")
+            self._item_start = 0
+
+        items = []
+        pos = self._pos
+        while True:
+            if self._in_string:
+                match = _STRING_TOKEN_RE.search(buffer, pos)
+                if match is None:
+                    pos = len(buffer)
+                    break
+                if match.group() == b"\\":
+                    if match.end() >= len(buffer):  # escaped character is in the next chunk
+                        pos = match.start()
+                        break
+                    pos = match.end() + 1
+                    continue
+                self._in_string = False
+                pos = match.end()
+                continue
+
+            match = _TOKEN_RE.search(buffer, pos)
+            if match is None:
+                pos = len(buffer)
+                break
+            token = match.group()
+            pos = match.end()
+            if token == b'"':
+                self._in_string = True
+            elif token in (b"[", b"{"):
+                self._brackets += token
+            elif token in (b"]", b"}"):
+                if self._brackets.pop() != _CLOSING_BRACKETS[token[0]]:
+                    raise ValueError("Mismatched closing bracket in JSON array")
+                if not self._brackets:  # end of the array
+                    self._add_item(buffer[self._item_start:match.start()], items, is_last=True)
+                    self._finished = True
+                    if buffer[pos:].strip(_WHITESPACE):
+                        raise ValueError("Extra data after the end of JSON array")
+                    buffer.clear()
+                    self._pos = 0
+                    return items
+            elif len(self._brackets) == 1:  # comma between items
+                self._add_item(buffer[self._item_start:match.start()], items)
+                self._item_start = pos
+
+        # bytes of already parsed items aren't needed anymore
+        del buffer[:self._item_start]
+        self._pos = pos - self._item_start
+        self._item_start = 0
+        return items
+
+    def close(self) -> None:
+        """Make sure the whole array was received"""
+        if not self._finished:
+            raise ValueError("Unexpected end of JSON array")
+
+    def _add_item(self, raw_item: bytearray, items: List[Any], is_last: bool = False) -> None:
+        if not raw_item.strip(_WHITESPACE):
+            if is_last and not self._items_count:  # empty array
+                return
+            raise ValueError("Empty JSON array item")
+        items.append(self.json_loads(bytes(raw_item)))
+        self._items_count += 1
@@ -1,13 +1,29 @@
+import asyncio
 import copy
+from concurrent.futures import Executor, ProcessPoolExecutor
 from itertools import chain
-from json import JSONDecodeError
-from typing import Any, Generic, Mapping, Optional, Sequence, TypeVar, cast
+from typing import Any, AsyncIterable, Dict, Generic, Mapping, Optional, Sequence, Tuple, TypeVar, Union, cast
 
 import marshmallow as ma
-
+from sqlalchemy.engine import RowMapping
+
+from aiohttp_rest_framework.codegen import (
+    DumpFunctions,
+    LoadFunction,
+    get_dump_functions,
+    get_load_function,
+    get_row_dump_functions,
+)
 from aiohttp_rest_framework.db.base import BaseDBManager
-from aiohttp_rest_framework.exceptions import DatabaseException, ValidationError
-from aiohttp_rest_framework.settings import Config, get_global_config
+from aiohttp_rest_framework.exceptions import (
+    DatabaseException,
+    HTTPNotFound,
+    HTTPPreconditionFailed,
+    ObjectNotFound,
+    PreconditionFailed,
+    ValidationError,
+)
+from aiohttp_rest_framework.settings import Config, get_global_config, get_worker_config
 
 __all__ = (
     "empty",
@@ -39,6 +55,10 @@ class SerializerOpts(ma.SchemaOpts):
         if not hasattr(meta, "unknown"):
             meta.unknown = ma.EXCLUDE  # by default exclude unknown fields, like in drf
         super().__init__(meta, ordered)
+        # dump with generated functions instead of marshmallow's generic `dump` when possible
+        self.compile_dump = getattr(meta, "compile_dump", True)
+        # load with generated function instead of marshmallow's generic `load` when possible
+        self.compile_load = getattr(meta, "compile_load", True)
 
 
 class SerializerMeta(ma.schema.SchemaMeta):
@@ -81,17 +101,54 @@ class Serializer(Generic[T], ma.Schema):
         super().__init__(**kwargs)
 
     def to_internal_value(self, data):
-        try:
-            if self.as_text:
-                return self.loads(data)
-            return self.load(data)
-        except JSONDecodeError:
-            raise ValidationError({"error": "invalid json"})
+        if self.as_text:
+            try:
+                data = self.config.json_loads(data)
+            except ValueError:  # `JSONDecodeError` of stdlib json and most of the other json libraries
+                raise ValidationError({"error": "invalid json"})
+        return self.load_data(data)
+
+    def load_data(self, data, many: Optional[bool] = None):
+        """`load()` with generated function if serializer has one"""
+        many = self.many if many is None else many
+        load = self.get_load_function()
+        if load is None or (many and not isinstance(data, list)):
+            return self.load(data, many=many)
+        return load(data, many)
 
     def to_representation(self, instance: T):
-        return self.dump(instance)
+        dump_functions = self.get_dump_functions()
+        if dump_functions is None or instance is None:
+            return self.dump(instance)
+        dump_one, dump_many = dump_functions
+        if not self.many:
+            if hasattr(instance, "__getitem__"):  # mappings are read by keys, leave it to marshmallow
+                return self.dump(instance)
+            return dump_one(instance)
+        instances = instance if isinstance(instance, list) else list(instance)
+        if instances and hasattr(instances[0], "__getitem__"):
+            return self.dump(instances)
+        return dump_many(instances)
+
+    def get_dump_functions(self) -> Optional[DumpFunctions]:
+        """Generated dump functions of this serializer, `None` if it has to be dumped with marshmallow"""
+        if not self.opts.compile_dump:
+            return None
+        if not hasattr(self, "_dump_functions"):
+            self._dump_functions = get_dump_functions(self)
+        return self._dump_functions
+
+    def get_load_function(self) -> Optional[LoadFunction]:
+        """Generated load function of this serializer, `None` if it has to be loaded with marshmallow"""
+        if not self.opts.compile_load:
+            return None
+        if not hasattr(self, "_load_function"):
+            self._load_function = get_load_function(self)
+        return self._load_function
 
     def get_initial(self):
+        if isinstance(self.initial_data, (str, bytes)):  # immutable, nothing to protect
+            return self.initial_data
         return copy.deepcopy(self.initial_data)
 
     async def delete(self) -> None:
@@ -103,6 +160,9 @@ class Serializer(Generic[T], ma.Schema):
     async def create(self, validated_data) -> T:
         raise NotImplementedError("`create()` must be implemented.")
 
+    async def bulk_create(self, validated_data: Sequence[Mapping]) -> Sequence[T]:
+        raise NotImplementedError("`bulk_create()` must be implemented.")
+
     async def save(self, **kwargs) -> T:
         assert hasattr(self, "_errors"), (
             "You must call `.is_valid()` before calling `.save()`."
@@ -112,6 +172,12 @@ class Serializer(Generic[T], ma.Schema):
             "You cannot call `.save()` on a serializer with invalid data."
         )
 
+        if self.many:
+            assert self.instance is None, "`save()` with `many=True` can only create objects."
+            validated_data = [{**item, **kwargs} for item in self.validated_data]
+            self.instance = await self.bulk_create(validated_data)
+            return self.instance
+
         validated_data = dict(
             list(self.validated_data.items()) + list(cast(Any, kwargs.items()))
         )
@@ -148,6 +214,8 @@ class Serializer(Generic[T], ma.Schema):
                 self._data = self.to_representation(self.validated_data)
             else:
                 self._data = self.get_initial()
+                if self.as_text:  # exposed parsed, text body can't be rendered as it is
+                    self._data = self.config.json_loads(self._data)
         return self._data
 
     @property
@@ -188,6 +256,90 @@ class Serializer(Generic[T], ma.Schema):
 
         return not bool(self._errors)
 
+    async def is_valid_iter(self, items: AsyncIterable, raise_exception=False) -> bool:
+        """
+        Like `is_valid()` of `many=True` serializer, but items are taken from async iterable
+        and each of them is validated as soon as it's received. Errors are reported by item index.
+        """
+        assert self.many, "`is_valid_iter()` can only be used with `many=True`."
+
+        validated_data = []
+        errors = {}
+        index = 0
+        async for item in items:
+            try:
+                validated_data.append(self.load_data(item, many=False))
+            except ma.ValidationError as exc:
+                errors[index] = exc.messages
+            index += 1
+        if not index:
+            raise ValidationError({"error": "No data provided"})
+
+        self._validated_data = [] if errors else validated_data
+        self._errors = errors
+        if self._errors and raise_exception:
+            raise ValidationError(self._errors)
+
+        return not bool(self._errors)
+
+    async def is_valid_in_executor(self, executor: Optional[Executor] = None, raise_exception=False) -> bool:
+        """
+        `is_valid()` run in `executor` (loop's default one if not set), so validation of big payloads
+        doesn't block the event loop. Process pool workers get serializer class and options
+        from `get_executor_kwargs()` instead of the serializer itself, so they have to be picklable as well as data.
+        Workers build their config of `Config.get_worker_options()`, so they don't need the global one.
+        """
+        loop = asyncio.get_running_loop()
+        if not isinstance(executor, ProcessPoolExecutor):
+            await loop.run_in_executor(executor, self.is_valid)
+            return self.is_valid(raise_exception=raise_exception)
+
+        validated_data, errors, is_fatal = await loop.run_in_executor(
+            executor, _validate_in_worker, type(self), self.initial_data,
+            self.get_executor_kwargs(), self.config.get_worker_options(),
+        )
+        if is_fatal:  # e.g. invalid json, raised regardless of `raise_exception` like in `is_valid()`
+            raise ValidationError(errors)
+        self._validated_data = validated_data
+        self._errors = errors
+        return self.is_valid(raise_exception=raise_exception)
+
+    async def data_in_executor(self, executor: Optional[Executor] = None) -> Any:
+        """`data` dumped in `executor`, see `is_valid_in_executor()`"""
+        loop = asyncio.get_running_loop()
+        if not isinstance(executor, ProcessPoolExecutor):
+            return await loop.run_in_executor(executor, lambda: self.data)
+        return await loop.run_in_executor(
+            executor, _dump_in_worker, type(self), _to_picklable(self.instance),
+            self.get_executor_kwargs(), self.config.get_worker_options(),
+        )
+
+    async def render_json_in_executor(self, executor: Optional[Executor] = None) -> bytes:
+        """`data` dumped and rendered to JSON in `executor`, see `is_valid_in_executor()`"""
+        loop = asyncio.get_running_loop()
+        if not isinstance(executor, ProcessPoolExecutor):
+            return await loop.run_in_executor(executor, lambda: self.config.render_json(self.data))
+        return await loop.run_in_executor(
+            executor, _render_json_in_worker, type(self), _to_picklable(self.instance),
+            self.get_executor_kwargs(), self.config.get_worker_options(),
+        )
+
+    def get_executor_kwargs(self) -> Dict[str, Any]:
+        """
+        Options serializer is re-created with in process pool workers.
+        Context isn't passed, it usually holds request and view which can't be pickled.
+        """
+        return {
+            "many": self.many,
+            "only": tuple(self.only) if self.only is not None else None,
+            "exclude": tuple(self.exclude),
+            "load_only": tuple(self.load_only),
+            "dump_only": tuple(self.dump_only),
+            "partial": self.partial,
+            "unknown": self.unknown,
+            "as_text": self.as_text,
+        }
+
     @property
     def serializer_context(self):
         return self._serializer_context
@@ -202,6 +354,16 @@ class Serializer(Generic[T], ma.Schema):
         return self._config
 
 
+def _copy_field(field_obj: ma.fields.Field) -> ma.fields.Field:
+    """Shallow copy of an unbound field, with its own containers which may be changed by the instance"""
+    field_copy = object.__new__(type(field_obj))
+    field_copy.__dict__.update(field_obj.__dict__)
+    field_copy.validators = list(field_obj.validators)
+    field_copy.metadata = dict(field_obj.metadata)
+    field_copy.error_messages = dict(field_obj.error_messages)
+    return field_copy
+
+
 class ModelSerializerOpts(SerializerOpts):
     def __init__(self, meta, ordered: bool = True):
         super().__init__(meta, ordered)
@@ -215,6 +377,7 @@ class ModelSerializerMeta(SerializerMeta):
         is_fields_all = mcs.get_is_fields_all(meta, bases, attrs)
 
         klass = super().__new__(mcs, name, bases, attrs)
+        klass._fields_cache = {}  # field setup is resolved once per class, see `_get_fields_cache()`
         if not klass.opts.abstract:  # if not abstract, has to specify model
             assert klass.opts.model is not None, (
                 f"{name} has to include `model` attribute in it's Meta"
@@ -242,44 +405,184 @@ class ModelSerializer(Serializer[T], metaclass=ModelSerializerMeta):
     opts: ModelSerializerOpts = None
 
     def _init_fields(self) -> None:
+        """
+        Field names are resolved (and validated) by marshmallow once per class and schema options,
+        then instances only bind their copies of declared fields and copies of fields built for the model.
+        """
         if self._is_fields_all:  # is set in meta class
-            # add model fields to declared on serializer fields
-            combined_fields = chain(self._get_model_field_names(), self.declared_fields.keys())
-            self.opts.fields = self.set_class(combined_fields)
-        super()._init_fields()
-        # replace marshmallow inferred fields with database/schema specific fields
-        field_builder = self.config.field_builder()
-        for field_name, field_obj in self.fields.items():
-            if isinstance(field_obj, ma.fields.Inferred):
-                new_field = field_builder.build(
-                    name=field_name, serializer=self, model=self.opts.model
-                )
-                self._bind_field(field_name, new_field)
-                self.fields[field_name] = new_field
-
-                if field_name in self.dump_fields:
-                    self.dump_fields[field_name] = new_field
-                if field_name in self.load_fields:
-                    self.load_fields[field_name] = new_field
+            self.opts.fields = self._get_all_field_names()
+        layouts = self._get_fields_cache().setdefault("layouts", {})
+        layout_key = (
+            None if self.only is None else tuple(self.only),
+            frozenset(self.exclude),
+            frozenset(self.load_only),
+            frozenset(self.dump_only),
+        )
+        layout = layouts.get(layout_key)
+        if layout is None:
+            super()._init_fields()
+            # unbound fields built for the model, `None` for declared ones
+            layout = tuple(
+                (field_name, None if field_name in self.declared_fields else self._get_inferred_field(field_name))
+                for field_name in self.fields
+            )
+            layouts[layout_key] = layout
+
+        fields_dict = self.dict_class()
+        for field_name, field_obj in layout:
+            if field_obj is None:
+                field_obj = self.declared_fields[field_name]  # marshmallow already copied it for the instance
+                if field_obj.parent is not None:  # bound by marshmallow's `_init_fields()` above
+                    fields_dict[field_name] = field_obj
+                    continue
+            else:
+                field_obj = _copy_field(field_obj)
+            self._bind_field(field_name, field_obj)
+            fields_dict[field_name] = field_obj
+
+        self.fields = fields_dict
+        self.load_fields = self.dict_class(
+            (field_name, field_obj) for field_name, field_obj in fields_dict.items() if not field_obj.dump_only
+        )
+        self.dump_fields = self.dict_class(
+            (field_name, field_obj) for field_name, field_obj in fields_dict.items() if not field_obj.load_only
+        )
+
+    def _get_fields_cache(self) -> Dict[str, Any]:
+        """
+        Cache of the field setup shared by all instances of the serializer class.
+        It only depends on the model and config's schema specific helpers, so they are the key.
+        """
+        key = (self.config.field_builder, self.config.get_model_fields)
+        return self._fields_cache.setdefault(key, {})
+
+    def _get_all_field_names(self):
+        """Model fields followed by fields declared on serializer, for `fields = "__all__"`"""
+        cache = self._get_fields_cache()
+        if "all_field_names" not in cache:
+            combined_fields = chain(self._get_model_field_names(), self._declared_fields.keys())
+            cache["all_field_names"] = self.set_class(combined_fields)
+        return cache["all_field_names"]
+
+    def _get_inferred_field(self, field_name: str) -> ma.fields.Field:
+        """Unbound field built by config's field builder for model field `field_name`"""
+        inferred_fields = self._get_fields_cache().setdefault("inferred_fields", {})
+        if field_name not in inferred_fields:
+            field_builder = self.config.field_builder()
+            inferred_fields[field_name] = field_builder.build(
+                name=field_name, serializer=self, model=self.opts.model
+            )
+        return inferred_fields[field_name]
+
+    def _get_model_fields(self) -> Tuple[str, ...]:
+        cache = self._get_fields_cache()
+        if "model_fields" not in cache:
+            cache["model_fields"] = tuple(self.config.get_model_fields(self.opts.model))
+        return cache["model_fields"]
 
     def _get_model_field_names(self) -> Sequence[str]:
         """
         Override this method for custom logic getting model fields when __all__ specified
         By default it's specified in config for concrete db/orm mapping
         """
-        return self.config.get_model_fields(self.opts.model)
+        return self._get_model_fields()
+
+    def to_representation(self, instance: T):
+        first = instance[0] if self.many and isinstance(instance, list) and instance else instance
+        if isinstance(first, Mapping):
+            row_dump_functions = self.get_row_dump_functions()
+            if row_dump_functions is not None:
+                dump_one, dump_many = row_dump_functions
+                return dump_many(instance) if self.many else dump_one(instance)
+        return super().to_representation(instance)
+
+    def get_row_dump_functions(self) -> Optional[DumpFunctions]:
+        """
+        Generated functions dumping database rows (`Row._mapping`) straight away, without model instances.
+        Only serializers which fields are all inferred from model columns can dump rows,
+        e.g. `fields = "__all__"` with no declared fields, otherwise it's `None`.
+        """
+        if not self.opts.compile_dump:
+            return None
+        if not hasattr(self, "_row_dump_functions"):
+            row_dump_functions = None
+            if self.get_dump_columns() is not None and self._declared_fields.keys().isdisjoint(self.dump_fields):
+                row_dump_functions = get_row_dump_functions(self)
+            self._row_dump_functions = row_dump_functions
+        return self._row_dump_functions
+
+    def get_dump_columns(self) -> Optional[Tuple[str, ...]]:
+        """
+        Names of model columns this serializer dumps, so only they are selected from the database.
+        Returns `None` (all columns are needed) when it can't be told, e.g. a field is
+        a method field or it's sourced from a model property.
+        """
+        model_fields = self._get_model_fields()
+        columns = []
+        for field_name, field_obj in self.dump_fields.items():
+            attribute = field_obj.attribute or field_name
+            if not field_obj._CHECK_ATTRIBUTE or attribute not in model_fields:  # noqa
+                return None
+            columns.append(attribute)
+        return tuple(columns)
+
+    def get_write_precondition(self) -> Optional[Mapping]:
+        """
+        Filter params the object has to match to be updated or deleted,
+        e.g. version from `If-Match` header, passed by view in serializer context.
+        """
+        return self.serializer_context.get("precondition")
 
     async def update(self, instance: T, validated_data: Mapping) -> T:
         db_service = await self.get_db_manager()
         try:
-            return await db_service.update(instance, validated_data)
+            return await db_service.update(
+                instance,
+                validated_data,
+                columns=self.get_dump_columns(),
+                precondition=self.get_write_precondition(),
+            )
+        except PreconditionFailed:
+            raise HTTPPreconditionFailed()
         except DatabaseException as e:
             raise ValidationError({"error": e.message})
 
     async def create(self, validated_data: Mapping) -> T:
         db_service = await self.get_db_manager()
         try:
-            return await db_service.create(validated_data)
+            return await db_service.create(validated_data, columns=self.get_dump_columns())
+        except DatabaseException as e:
+            raise ValidationError({"error": e.message})
+
+    async def bulk_create(self, validated_data: Sequence[Mapping]) -> Sequence[T]:
+        db_service = await self.get_db_manager()
+        try:
+            return await db_service.bulk_create(validated_data, columns=self.get_dump_columns())
+        except DatabaseException as e:
+            raise ValidationError({"error": e.message})
+
+    async def bulk_update(
+        self,
+        validated_data: Mapping,
+        whereclause: Any,
+        returning: bool = False,
+    ) -> Union[int, Sequence[T]]:
+        db_service = await self.get_db_manager()
+        try:
+            return await db_service.bulk_update(
+                None, validated_data, whereclause=whereclause, returning=returning,
+                columns=self.get_dump_columns() if returning else None,
+            )
+        except DatabaseException as e:
+            raise ValidationError({"error": e.message})
+
+    async def bulk_delete(self, whereclause: Any, returning: bool = False) -> Union[int, Sequence[T]]:
+        db_service = await self.get_db_manager()
+        try:
+            return await db_service.bulk_delete(
+                whereclause=whereclause, returning=returning,
+                columns=self.get_dump_columns() if returning else None,
+            )
         except DatabaseException as e:
             raise ValidationError({"error": e.message})
 
@@ -288,12 +591,89 @@ class ModelSerializer(Serializer[T], metaclass=ModelSerializerMeta):
         instance = self.instance or instance
         db_service = await self.get_db_manager()
         try:
-            return await db_service.delete(instance)
+            return await db_service.delete(instance, precondition=self.get_write_precondition())
+        except PreconditionFailed:
+            raise HTTPPreconditionFailed()
+        except DatabaseException as e:
+            raise ValidationError({"error": e.message})
+
+    async def save_by_lookup(self, lookup: Mapping, **kwargs) -> T:
+        """
+        Update the object matching `lookup` (e.g. `{"id": 1}`) with validated data
+        without fetching it first, `HTTPNotFound` is raised if there is no such object.
+        """
+        assert hasattr(self, "_errors"), (
+            "You must call `.is_valid()` before calling `.save_by_lookup()`."
+        )
+        assert not self.errors, (
+            "You cannot call `.save_by_lookup()` on a serializer with invalid data."
+        )
+        assert not self.many, "`save_by_lookup()` updates a single object."
+
+        validated_data = {**self.validated_data, **kwargs}
+        db_service = await self.get_db_manager()
+        try:
+            self.instance = await db_service.update_by(
+                lookup,
+                validated_data,
+                columns=self.get_dump_columns(),
+                precondition=self.get_write_precondition(),
+            )
+        except ObjectNotFound:
+            raise HTTPNotFound()
+        except PreconditionFailed:
+            raise HTTPPreconditionFailed()
+        except DatabaseException as e:
+            raise ValidationError({"error": e.message})
+        return self.instance
+
+    async def delete_by_lookup(self, lookup: Mapping) -> None:
+        """Delete the object matching `lookup` without fetching it first"""
+        db_service = await self.get_db_manager()
+        try:
+            await db_service.delete_by(lookup, precondition=self.get_write_precondition())
+        except ObjectNotFound:
+            raise HTTPNotFound()
+        except PreconditionFailed:
+            raise HTTPPreconditionFailed()
         except DatabaseException as e:
             raise ValidationError({"error": e.message})
 
     async def get_db_manager(self) -> BaseDBManager:
-        return self.config.db_manager_class(self.config, self.opts.model)
+        return self.config.get_db_manager(self.opts.model)
 
     class Meta:
         abstract = True
+
+
+def _to_picklable(instance: Any) -> Any:
+    """Database rows are sent to process pool workers as dicts, unpickling of `RowMapping` isn't reliable"""
+    if isinstance(instance, RowMapping):
+        return dict(instance)
+    if isinstance(instance, list) and instance and isinstance(instance[0], RowMapping):
+        return [dict(row) for row in instance]
+    return instance
+
+
+def _validate_in_worker(serializer_class, data, kwargs, config_options) -> Tuple[Any, Any, bool]:
+    """`(validated data, errors, whether errors have to be raised right away)` of `data`"""
+    serializer = _get_worker_serializer(serializer_class, config_options, data=data, **kwargs)
+    try:
+        serializer.is_valid()
+    except ValidationError as exc:
+        return None, exc.detail, True
+    return serializer.validated_data, serializer.errors, False
+
+
+def _dump_in_worker(serializer_class, instance, kwargs, config_options) -> Any:
+    return _get_worker_serializer(serializer_class, config_options, instance, **kwargs).data
+
+
+def _render_json_in_worker(serializer_class, instance, kwargs, config_options) -> bytes:
+    serializer = _get_worker_serializer(serializer_class, config_options, instance, **kwargs)
+    return serializer.config.render_json(serializer.data)
+
+
+def _get_worker_serializer(serializer_class, config_options, *args, **kwargs) -> Serializer:
+    config = get_worker_config(config_options)
+    return serializer_class(*args, serializer_context={"config": config}, **kwargs)
@@ -1,32 +1,53 @@
 import asyncio
+import json
+import pickle
 import re
-from typing import Awaitable, Callable, Optional
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Any, Awaitable, Callable, Dict, Mapping, Optional, Sequence, Tuple, Union
 
 from aiohttp import web
 
+from aiohttp_rest_framework.cache import BaseCacheBackend, LocMemCache
 from aiohttp_rest_framework.db.base import BaseDBManager
+from aiohttp_rest_framework.db.native import AsyncpgManager
+from aiohttp_rest_framework.db.pool import collect_pool_stats
+from aiohttp_rest_framework.db.replicas import BaseReplicaPolicy, RoundRobinPolicy
 from aiohttp_rest_framework.db.sa import SAManager
-from aiohttp_rest_framework.fields import SAFieldBuilder
+from aiohttp_rest_framework.db.shards import ShardedSAManager, ShardMap
+from aiohttp_rest_framework.db.sqlite import SQLiteManager
+from aiohttp_rest_framework.fields import SAFieldBuilder, SQLiteFieldBuilder, patch_marshmallow_fields
 from aiohttp_rest_framework.types import DbOrmMapping
 from aiohttp_rest_framework.utils import get_model_fields_sa
 
 __all__ = (
     "SA",
+    "SQLITE",
     "Config",
     "get_global_config",
     "set_global_config",
     "DEFAULT_APP_CONN_PROP",
+    "render_json",
+    "get_worker_config",
 )
 
 SA = "sa"
-SCHEMA_TYPES = (SA,)
+SQLITE = "sqlite"
+SCHEMA_TYPES = (SA, SQLITE)
 
 db_orm_mappings: DbOrmMapping = {
     SA: {
         "manager": SAManager,
+        "sharded_manager": ShardedSAManager,
+        "asyncpg_manager": AsyncpgManager,
         "field_builder": SAFieldBuilder,
         "model_fields_getter": get_model_fields_sa,
     },
+    # the same SQLAlchemy models stored in an embedded database
+    SQLITE: {
+        "manager": SQLiteManager,
+        "field_builder": SQLiteFieldBuilder,
+        "model_fields_getter": get_model_fields_sa,
+    },
 }
 
 DEFAULT_APP_CONN_PROP = "db"
@@ -42,6 +63,22 @@ class Config:
         get_connection: Optional[Callable[[], Awaitable]] = None,
         db_manager: Optional[BaseDBManager] = None,
         schema_type: str = SA,
+        cache_backend: Optional[BaseCacheBackend] = None,
+        json_loads: Callable[[Union[str, bytes]], Any] = json.loads,
+        json_dumps: Callable[[Any], Union[str, bytes]] = json.dumps,
+        offload_executor: Optional[Executor] = None,
+        offload_rows_threshold: Optional[int] = None,
+        offload_bytes_threshold: Optional[int] = None,
+        statement_cache_size: int = 256,
+        get_replicas: Optional[Callable[[], Awaitable[Sequence]]] = None,
+        replica_policy: Optional[BaseReplicaPolicy] = None,
+        read_your_writes_timeout: float = 5,
+        shard_maps: Optional[Mapping[Any, ShardMap]] = None,
+        pool_size: Optional[int] = None,
+        max_overflow: Optional[int] = None,
+        pool_timeout: Optional[float] = None,
+        pool_recycle: Optional[float] = None,
+        pool_pre_ping: bool = False,
     ):
         assert isinstance(app_connection_property, str), (
             "`app_connection_property` has to be a string"
@@ -67,9 +104,120 @@ class Config:
         )
 
         self.db_manager_class = db_manager or self._db_orm_mapping["manager"]
+        self._db_managers: Dict[Any, BaseDBManager] = {}
         self.field_builder = self._db_orm_mapping["field_builder"]
         self.get_model_fields = self._db_orm_mapping["model_fields_getter"]
 
+        self.cache_backend = cache_backend or LocMemCache()
+        assert isinstance(self.cache_backend, BaseCacheBackend), (
+            "`cache_backend` has to be an instance of `BaseCacheBackend`"
+        )
+
+        assert callable(json_loads) and callable(json_dumps), (
+            "`json_loads` and `json_dumps` have to be callable"
+        )
+        self.json_loads = json_loads
+        self.json_dumps = json_dumps
+
+        # dumping at least `offload_rows_threshold` rows and validating request bodies of at least
+        # `offload_bytes_threshold` bytes is run in `offload_executor` (loop's default one if not set)
+        assert offload_executor is None or isinstance(offload_executor, Executor), (
+            "`offload_executor` has to be an instance of `concurrent.futures.Executor`"
+        )
+        self.offload_executor = offload_executor
+        self._worker_options: Optional[Tuple] = None
+        if isinstance(offload_executor, ProcessPoolExecutor):
+            self.get_worker_options()  # fail early if process pool workers can't get the config
+        self.offload_rows_threshold = offload_rows_threshold
+        self.offload_bytes_threshold = offload_bytes_threshold
+
+        # number of built statements every db manager keeps for reuse, `0` turns the cache off
+        assert isinstance(statement_cache_size, int) and statement_cache_size >= 0, (
+            "`statement_cache_size` has to be a non-negative integer"
+        )
+        self.statement_cache_size = statement_cache_size
+
+        # reads are routed to one of engines returned by `get_replicas` chosen by `replica_policy`,
+        # writes and reads of write requests go to the primary one returned by `get_connection`
+        assert get_replicas is None or asyncio.iscoroutinefunction(get_replicas), (
+            "`get_replicas` has to be async callable"
+        )
+        self.get_replicas = get_replicas
+        self.replica_policy = replica_policy or RoundRobinPolicy()
+        assert isinstance(self.replica_policy, BaseReplicaPolicy), (
+            "`replica_policy` has to be an instance of `BaseReplicaPolicy`"
+        )
+        # client's reads go to the primary for this many seconds after its write, see `read_your_writes_middleware`
+        self.read_your_writes_timeout = read_your_writes_timeout
+
+        # models spread over several databases, their db managers route statements by `ShardMap`
+        self.shard_maps = shard_maps or {}
+        assert all(isinstance(shard_map, ShardMap) for shard_map in self.shard_maps.values()), (
+            "`shard_maps` values have to be instances of `ShardMap`"
+        )
+        assert not self.shard_maps or "sharded_manager" in self._db_orm_mapping, (
+            f"`shard_maps` aren't supported by `{schema_type}` schema type"
+        )
+
+        # connection pool settings applied by `create_connection()`, engine's defaults are used for unset ones:
+        # number of kept connections, extra connections opened when they are all checked out,
+        # seconds to wait for a connection, seconds after which connections are reopened
+        # and whether connections are checked with a ping before every checkout
+        assert pool_size is None or pool_size >= 0, "`pool_size` has to be a non-negative integer"
+        self.pool_size = pool_size
+        self.max_overflow = max_overflow
+        self.pool_timeout = pool_timeout
+        self.pool_recycle = pool_recycle
+        self.pool_pre_ping = pool_pre_ping
+
+    def get_db_manager(self, model) -> BaseDBManager:
+        """Db manager of `model`, managers don't keep any per request state, so there is one per model"""
+        db_manager = self._db_managers.get(model)
+        if db_manager is None:
+            shard_map = self.shard_maps.get(model)
+            if shard_map is None:
+                db_manager = self.db_manager_class(self, model)
+            else:
+                db_manager = self._db_orm_mapping["sharded_manager"](self, model, shard_map)
+            self._db_managers[model] = db_manager
+        return db_manager
+
+    async def get_read_connection(self):
+        """Replica chosen by `replica_policy`, the primary if there are no replicas or none of them fits"""
+        if self.get_replicas is not None:
+            replica = await self.replica_policy.choose(await self.get_replicas())
+            if replica is not None:
+                return replica
+        return await self.get_connection()
+
+    async def get_pool_stats(self) -> Dict[str, Any]:
+        """Connection pool statistics of the primary engine and replicas (if any) in this process"""
+        stats: Dict[str, Any] = {"primary": collect_pool_stats(await self.get_connection())}
+        if self.get_replicas is not None:
+            stats["replicas"] = [collect_pool_stats(replica) for replica in await self.get_replicas()]
+        return stats
+
+    def render_json(self, data: Any) -> bytes:
+        """Encode `data` with `json_dumps`, it may return either `str` (stdlib json) or `bytes` (e.g. orjson)"""
+        rendered = self.json_dumps(data)
+        if isinstance(rendered, str):
+            return rendered.encode()
+        return rendered
+
+    def get_worker_options(self) -> Tuple[str, Callable, Callable]:
+        """
+        Options process pool workers build their config of with `get_worker_config()`. Workers don't depend
+        on the global config, so they may be started with any multiprocessing start method.
+        """
+        if self._worker_options is None:
+            options = (self.schema_type, self.json_loads, self.json_dumps)
+            assert _is_picklable(options), (
+                "`json_loads` and `json_dumps` have to be picklable (e.g. module level functions) "
+                "to be used by process pool workers"
+            )
+            self._worker_options = options
+        return self._worker_options
+
 
 _config: Optional[Config] = None
 
@@ -83,3 +231,33 @@ def get_global_config() -> Config:
 def set_global_config(config: Config) -> None:
     global _config
     _config = config
+
+
+def render_json(data: Any) -> bytes:
+    """Encode `data` with global config's `json_dumps`, stdlib json is used if framework isn't set up"""
+    if _config is None:
+        return json.dumps(data).encode()
+    return _config.render_json(data)
+
+
+# configs of process pool workers by `Config.get_worker_options()` of the configs they run serializers for
+_worker_configs: Dict[Tuple, Config] = {}
+
+
+def get_worker_config(options: Tuple[str, Callable, Callable]) -> Config:
+    """Config of serializers re-created in a process pool worker, see `Config.get_worker_options()`"""
+    config = _worker_configs.get(options)
+    if config is None:
+        schema_type, json_loads, json_dumps = options
+        patch_marshmallow_fields()
+        config = Config(None, schema_type=schema_type, json_loads=json_loads, json_dumps=json_dumps)
+        _worker_configs[options] = config
+    return config
+
+
+def _is_picklable(obj: Any) -> bool:
+    try:
+        pickle.dumps(obj)
+    except Exception:  # e.g. `PicklingError`, `AttributeError` and `TypeError` of local and unpicklable objects
+        return False
+    return True
@@ -69,33 +69,59 @@ def safe_issubclass(first, other) -> bool:
 
 
 async def create_connection(db_url: str, **kwargs) -> AsyncEngine:
-    from aiohttp_rest_framework.settings import SA, get_global_config
+    """
+    Engine of `db_url` with connection pool settings of the config, `kwargs` are passed
+    to `create_async_engine()` as they are and take precedence over the config.
+    With "sqlite" schema type it's `SQLiteEngine`, `kwargs` are passed to `aiosqlite.connect()` then.
+    """
+    from aiohttp_rest_framework.db.pool import get_pool_options
+    from aiohttp_rest_framework.db.sqlite import SQLiteEngine
+    from aiohttp_rest_framework.settings import SA, SQLITE, get_global_config
 
     config = get_global_config()
     if config.schema_type == SA:
-        return create_async_engine(db_url, **kwargs)
+        options = get_pool_options(db_url, config) if "poolclass" not in kwargs else {}
+        return create_async_engine(db_url, **{**options, **kwargs})
+    if config.schema_type == SQLITE:
+        return SQLiteEngine(db_url, **kwargs)
     raise NotImplementedError()
 
 
 async def create_tables(metadata: MetaData, connection: Optional[Any] = None, db_url: Optional[str] = None) -> None:
     assert db_url or connection, "either db_url or connection must be provided"
-    from aiohttp_rest_framework.settings import SA, get_global_config
+    from aiohttp_rest_framework.db.sqlite import SQLiteEngine
+    from aiohttp_rest_framework.settings import SA, SQLITE, get_global_config
 
     config = get_global_config()
     if config.schema_type == SA:
         engine = connection or create_async_engine(db_url)
         async with engine.begin() as conn:
             return await conn.run_sync(metadata.create_all)
+    if config.schema_type == SQLITE:
+        engine = connection or SQLiteEngine(db_url)
+        try:
+            return await engine.create_all(metadata)
+        finally:
+            if connection is None:
+                await engine.dispose()
     raise NotImplementedError()
 
 
 async def drop_tables(metadata: MetaData, connection: Optional[Any] = None, db_url: Optional[str] = None) -> None:
     assert db_url or connection, "either db_url or connection must be provided"
-    from aiohttp_rest_framework.settings import SA, get_global_config
+    from aiohttp_rest_framework.db.sqlite import SQLiteEngine
+    from aiohttp_rest_framework.settings import SA, SQLITE, get_global_config
 
     config = get_global_config()
     if config.schema_type == SA:
         engine = connection or create_async_engine(db_url)
         async with engine.begin() as conn:
             return await conn.run_sync(metadata.drop_all)
+    if config.schema_type == SQLITE:
+        engine = connection or SQLiteEngine(db_url)
+        try:
+            return await engine.drop_all(metadata)
+        finally:
+            if connection is None:
+                await engine.dispose()
     raise NotImplementedError()
@@ -1,17 +1,46 @@
+import asyncio
+import datetime
+import hashlib
+import logging
 import typing
+from concurrent.futures import Executor
+from contextlib import nullcontext
+from functools import partial
 
-from aiohttp import web
+from aiohttp import hdrs, web
 
 from aiohttp_rest_framework import APP_CONFIG_KEY
+from aiohttp_rest_framework.cache import BaseCacheBackend, CachedResponse
+from aiohttp_rest_framework.conditional import (
+    etag_from_body,
+    etag_from_version,
+    etag_matches,
+    is_not_modified,
+    parse_etags,
+    version_from_etag,
+)
 from aiohttp_rest_framework.db.base import BaseDBManager
-from aiohttp_rest_framework.exceptions import HTTPNotFound, ObjectNotFound
+from aiohttp_rest_framework.db.replicas import unpin_primary, use_primary
+from aiohttp_rest_framework.db.sa import leave_session_scope, on_commit
+from aiohttp_rest_framework.exceptions import (
+    HTTPNotFound,
+    HTTPPreconditionFailed,
+    HTTPRequestEntityTooLarge,
+    ObjectNotFound,
+    ValidationError,
+)
+from aiohttp_rest_framework.filters import BaseFilterBackend
 from aiohttp_rest_framework.mixins import (
+    BulkDestroyModelMixin,
+    BulkUpdateModelMixin,
     CreateModelMixin,
     DestroyModelMixin,
     ListModelMixin,
     RetrieveModelMixin,
+    StreamingListModelMixin,
     UpdateModelMixin,
 )
+from aiohttp_rest_framework.pagination import BasePagination
 from aiohttp_rest_framework.serializers import Serializer
 from aiohttp_rest_framework.settings import Config
 
@@ -20,6 +49,7 @@ __all__ = (
     "GenericAPIView",
     "CreateAPIView",
     "ListAPIView",
+    "StreamingListAPIView",
     "RetrieveAPIView",
     "DestroyAPIView",
     "UpdateAPIView",
@@ -27,8 +57,14 @@ __all__ = (
     "RetrieveUpdateAPIView",
     "RetrieveDestroyAPIView",
     "RetrieveUpdateDestroyAPIView",
+    "BulkUpdateAPIView",
+    "BulkDestroyAPIView",
+    "BulkUpdateDestroyAPIView",
+    "PoolStatsView",
 )
 
+logger = logging.getLogger(__name__)
+
 
 class APIView(web.View):
     """Base API View.
@@ -37,6 +73,9 @@ class APIView(web.View):
     for particular view.
     """
 
+    # max size of request body in bytes, application's `client_max_size` is used if not set
+    max_body_size: typing.Optional[int] = None
+
     @property
     def rest_config(self) -> Config:
         try:
@@ -48,6 +87,39 @@ class APIView(web.View):
             )
             raise AssertionError(msg)
 
+    def render_json(self, data) -> bytes:
+        return self.rest_config.render_json(data)
+
+    def get_max_body_size(self) -> int:
+        if self.max_body_size is not None:
+            return self.max_body_size
+        return self.request._client_max_size  # noqa, the same limit `request.read()` has
+
+    async def iter_body(self) -> typing.AsyncIterator[bytes]:
+        """Iterate over request body chunks as they arrive, size of the body is limited by `get_max_body_size()`"""
+        max_size = self.get_max_body_size()
+        content_length = self.request.content_length
+        if max_size and content_length is not None and content_length > max_size:
+            raise HTTPRequestEntityTooLarge(max_size=max_size, actual_size=content_length)
+        size = 0
+        async for chunk in self.request.content.iter_any():
+            size += len(chunk)
+            if max_size and size > max_size:
+                raise HTTPRequestEntityTooLarge(max_size=max_size, actual_size=size)
+            yield chunk
+
+    async def read_body(self) -> bytes:
+        return b"".join([chunk async for chunk in self.iter_body()])
+
+    def json_response(self, data=None, status: int = 200, *, body: bytes = None, **kwargs) -> web.Response:
+        """
+        Like `web.json_response`, but rendered straight to bytes with configured `json_dumps`.
+        Already rendered `body` is sent as is.
+        """
+        if body is None:
+            body = self.render_json(data)
+        return web.Response(body=body, status=status, content_type="application/json", charset="utf-8", **kwargs)
+
 
 class GenericAPIView(APIView):
     """
@@ -59,6 +131,75 @@ class GenericAPIView(APIView):
 
     serializer_class: typing.Type[Serializer] = None
 
+    # query parameter to request only some of the fields, e.g. `?fields=id,name`
+    sparse_fields_query_param: typing.Optional[str] = None
+
+    filter_backends: typing.Sequence[typing.Type[BaseFilterBackend]] = ()
+    filterset_fields: typing.Union[typing.Sequence[str], typing.Mapping[str, typing.Sequence[str]]] = None
+
+    pagination_class: typing.Type[BasePagination] = None
+
+    stream_chunk_size: int = 1000
+
+    # dump lists straight from database rows when serializer fields are all model columns
+    dump_rows: bool = True
+    # read objects as slotted records instead of ORM instances on read requests, see `SAManager.use_records`
+    read_records: bool = False
+
+    # accept JSON array in create requests, all objects are inserted in a single transaction
+    allow_bulk_create: bool = True
+    # bulk update/delete without any filter would touch the whole table, so it's refused unless allowed
+    allow_unfiltered_bulk: bool = False
+    # respond to bulk update/delete with affected objects instead of their number,
+    # clients can ask for it with `Prefer: return=representation` header as well
+    bulk_return_objects: bool = False
+
+    EXACT_COUNT = "exact"
+    ESTIMATED_COUNT = "estimated"
+
+    # `EXACT_COUNT` or `ESTIMATED_COUNT` to send total number of rows in `total_count_header`
+    total_count_mode: typing.Optional[str] = None
+    total_count_header: str = "X-Total-Count"
+    # estimates lower than this are considered cheap to count exactly
+    total_count_exact_threshold: int = 10000
+
+    # send `ETag` with read responses and honor `If-None-Match` and `If-Match` headers
+    use_etag: bool = True
+    # column with object's version (e.g. version number or `updated_at`), used to build ETag
+    # instead of response body, so `If-Match` is checked by the database in the same write statement
+    etag_version_field: typing.Optional[str] = None
+
+    write_precondition: typing.Optional[typing.Mapping] = None
+
+    # validate request body first and update/delete object by `lookup_field` with a single statement,
+    # without fetching it. `If-Match` requests fall back to fetching unless `etag_version_field` is set
+    write_by_lookup: bool = False
+
+    # responses of read requests are cached for `cache_timeout` seconds, caching is off if it's not set
+    cache_timeout: typing.Optional[float] = None
+    # after `cache_timeout` stale response is still served for this long, while it's refreshed in background
+    cache_stale_timeout: float = 0
+    # `404 Not Found` of missing objects is cached for this long, if set
+    cache_not_found_timeout: typing.Optional[float] = None
+    # request headers making a difference for the response, they are a part of the cache key
+    cache_vary_headers: typing.Sequence[str] = (hdrs.ACCEPT, hdrs.AUTHORIZATION)
+    # entries of the namespace are invalidated together on writes, model's table name by default
+    cache_namespace: typing.Optional[str] = None
+    # `Config.cache_backend` is used if not set
+    cache_backend: typing.Optional[BaseCacheBackend] = None
+    cache_key_prefix: str = "arf"
+
+    # dumping at least this many rows runs in `offload_executor`, `Config.offload_rows_threshold` if not set
+    offload_rows_threshold: typing.Optional[int] = None
+    # validation of request bodies of at least this many bytes runs in `offload_executor`,
+    # `Config.offload_bytes_threshold` if not set
+    offload_bytes_threshold: typing.Optional[int] = None
+    # `Config.offload_executor` if not set, loop's default (thread pool) executor if it's not set either
+    offload_executor: typing.Optional[Executor] = None
+
+    # background refreshes of stale entries, shared by all views, so every entry is refreshed once at a time
+    _cache_revalidations: typing.Dict[str, asyncio.Future] = {}
+
     _db_manager: BaseDBManager = None
 
     def __init__(self, request: web.Request) -> None:
@@ -74,7 +215,7 @@ class GenericAPIView(APIView):
     async def get_db_manager(self):
         """Get db manager applicable for current engine"""
         if not self._db_manager:
-            self._db_manager = self.rest_config.db_manager_class(self.rest_config, self.model)
+            self._db_manager = self.rest_config.get_db_manager(self.model)
         return self._db_manager
 
     @property
@@ -92,28 +233,396 @@ class GenericAPIView(APIView):
     def get_serializer(self, *args, **kwargs) -> Serializer:
         serializer_class = self.get_serializer_class()
         kwargs.setdefault("serializer_context", self.get_serializer_context())
+        if "only" not in kwargs and self.request.method in (hdrs.METH_GET, hdrs.METH_HEAD):
+            sparse_fields = self.get_sparse_fields()
+            if sparse_fields is not None:
+                try:
+                    return serializer_class(*args, only=sparse_fields, **kwargs)
+                except ValueError as exc:  # marshmallow raises `ValueError` for unknown fields in `only`
+                    raise ValidationError({self.sparse_fields_query_param: [str(exc)]})
         return serializer_class(*args, **kwargs)
 
+    def get_sparse_fields(self) -> typing.Optional[typing.Tuple[str, ...]]:
+        """Fields requested by the client with `sparse_fields_query_param`"""
+        if not self.sparse_fields_query_param:
+            return None
+        fields = self.request.query.get(self.sparse_fields_query_param)
+        if not fields:
+            return None
+        return tuple(field.strip() for field in fields.split(",") if field.strip())
+
+    def get_select_columns(self) -> typing.Optional[typing.Sequence[str]]:
+        """
+        Model columns needed by the serializer to dump response,
+        only these columns are selected from the database. `None` means all columns.
+        """
+        serializer = self.get_serializer()
+        get_dump_columns = getattr(serializer, "get_dump_columns", None)
+        if get_dump_columns is None:
+            return None
+        columns = get_dump_columns()
+        if columns is not None and self.use_etag and self.etag_version_field:
+            columns = (*columns, self.etag_version_field)
+        return columns
+
+    def get_version_validators(
+        self,
+        instance,
+    ) -> typing.Tuple[typing.Optional[str], typing.Optional[datetime.datetime]]:
+        """`ETag` and `Last-Modified` of `instance` taken from `etag_version_field`"""
+        if not self.use_etag or not self.etag_version_field:
+            return None, None
+        version = getattr(instance, self.etag_version_field, None)
+        if version is None:
+            return None, None
+        last_modified = version if isinstance(version, datetime.datetime) else None
+        return etag_from_version(version), last_modified
+
+    def is_not_modified(
+        self,
+        etag: typing.Optional[str],
+        last_modified: typing.Optional[datetime.datetime] = None,
+    ) -> bool:
+        if not self.use_etag or self.request.method not in (hdrs.METH_GET, hdrs.METH_HEAD):
+            return False
+        return is_not_modified(self.request, etag, last_modified)
+
+    def get_not_modified_response(
+        self,
+        etag: typing.Optional[str],
+        last_modified: typing.Optional[datetime.datetime] = None,
+    ) -> web.Response:
+        response = web.Response(status=304)
+        self._set_validators(response, etag, last_modified)
+        return response
+
+    def make_conditional(
+        self,
+        response: web.Response,
+        etag: typing.Optional[str] = None,
+        last_modified: typing.Optional[datetime.datetime] = None,
+    ) -> web.Response:
+        """
+        Add `ETag` (computed from the body if not provided) and `Last-Modified` headers to `response`
+        or replace it with `304 Not Modified` if client already has this representation.
+        """
+        if not self.use_etag or response.status != 200:
+            return response
+        if etag is None:
+            etag = response.headers.get(hdrs.ETAG)
+        if last_modified is None:
+            last_modified = response.last_modified
+        if etag is None and isinstance(response.body, bytes):
+            etag = etag_from_body(response.body)
+        if self.is_not_modified(etag, last_modified):
+            return self.get_not_modified_response(etag, last_modified)
+        self._set_validators(response, etag, last_modified)
+        return response
+
+    async def check_write_precondition(self, instance) -> None:
+        """
+        Check `If-Match` header of a write request. With `etag_version_field` the version
+        is passed to the serializer as `write_precondition` and enforced by the database
+        in the same statement as the write, otherwise ETag of current representation is compared.
+        """
+        if_match = self.request.headers.get(hdrs.IF_MATCH)
+        if not self.use_etag or not if_match:
+            return
+        etags = parse_etags(if_match)
+        if any(etag == "*" for etag, _ in etags):  # any current representation
+            return
+
+        if self.etag_version_field:
+            db_manager = await self.get_db_manager()
+            try:
+                versions = [
+                    db_manager.to_python(self.etag_version_field, version_from_etag(etag))
+                    for etag, is_weak in etags
+                    if not is_weak  # `If-Match` uses strong comparison
+                ]
+            except (TypeError, ValueError, LookupError):
+                raise HTTPPreconditionFailed()
+            if not versions:
+                raise HTTPPreconditionFailed()
+            self.write_precondition = {f"{self.etag_version_field}__in": versions}
+            return
+
+        serializer = self.get_serializer(instance)
+        if not etag_matches(etag_from_body(self.render_json(serializer.data)), if_match):
+            raise HTTPPreconditionFailed()
+
+    def is_cache_enabled(self) -> bool:
+        return bool(self.cache_timeout) and self.request.method in (hdrs.METH_GET, hdrs.METH_HEAD)
+
+    def get_cache_backend(self) -> BaseCacheBackend:
+        return self.cache_backend or self.rest_config.cache_backend
+
+    def get_cache_namespace(self) -> str:
+        if self.cache_namespace:
+            return self.cache_namespace
+        # orm models have `__tablename__`, core tables are rendered as their names
+        return getattr(self.model, "__tablename__", None) or str(self.model)
+
+    def get_cached_headers(self) -> typing.Tuple[str, ...]:
+        """Headers set by the view which are cached along with the response body"""
+        return (self.total_count_header,)
+
+    async def get_cache_key(self) -> str:
+        namespace = self.get_cache_namespace()
+        generation = await self.get_cache_backend().get_generation(namespace)
+        vary = "\n".join(self.request.headers.get(name, "") for name in self.cache_vary_headers)
+        digest = hashlib.blake2b(f"{self.request.path_qs}\n{vary}".encode(), digest_size=16).hexdigest()
+        return f"{self.cache_key_prefix}:{namespace}:{generation}:{digest}"
+
+    async def cache_response(
+        self,
+        get_response: typing.Callable[[], typing.Awaitable[web.Response]],
+    ) -> web.Response:
+        """
+        Return cached response if there is one, otherwise call `get_response()` and cache its result.
+        Stale responses are returned within `cache_stale_timeout` and refreshed in background.
+        """
+        if not self.is_cache_enabled():
+            return await get_response()
+        key = await self.get_cache_key()
+        cached = await self.get_cache_backend().get(key)
+        if cached is None:
+            return await self.fetch_response(key, get_response)
+        if not cached.is_fresh:
+            self.revalidate_cache(key, get_response)
+        return cached.to_response()
+
+    async def fetch_response(
+        self,
+        key: str,
+        get_response: typing.Callable[[], typing.Awaitable[web.Response]],
+    ) -> web.Response:
+        backend = self.get_cache_backend()
+        try:
+            response = await get_response()
+        except web.HTTPNotFound as exc:
+            if self.cache_not_found_timeout:
+                cached = CachedResponse.from_response(exc, self.cache_not_found_timeout, self.get_cached_headers())
+                await backend.set(key, cached, self.cache_not_found_timeout)
+            else:
+                await backend.delete(key)  # object is gone, don't serve it stale anymore
+            raise
+        if response.status == 200 and isinstance(response.body, bytes):
+            if self.use_etag and hdrs.ETAG not in response.headers:
+                response.headers[hdrs.ETAG] = etag_from_body(response.body)
+            cached = CachedResponse.from_response(response, self.cache_timeout, self.get_cached_headers())
+            await backend.set(key, cached, self.cache_timeout + self.cache_stale_timeout)
+        return response
+
+    def revalidate_cache(
+        self,
+        key: str,
+        get_response: typing.Callable[[], typing.Awaitable[web.Response]],
+    ) -> None:
+        if key in self._cache_revalidations:
+            return
+        task = asyncio.ensure_future(self._refresh_response(key, get_response))
+        self._cache_revalidations[key] = task
+        task.add_done_callback(partial(self._on_cache_revalidated, key))
+
+    async def _refresh_response(
+        self,
+        key: str,
+        get_response: typing.Callable[[], typing.Awaitable[web.Response]],
+    ) -> web.Response:
+        # the task gets a copy of request's context, but it outlives the request,
+        # so it must not join request's session or keep reads of the request on the primary
+        leave_session_scope()
+        unpin_primary()
+        return await self.fetch_response(key, get_response)
+
+    def _on_cache_revalidated(self, key: str, task: asyncio.Future) -> None:
+        self._cache_revalidations.pop(key, None)
+        if task.cancelled():
+            return
+        exc = task.exception()
+        if exc is not None and not isinstance(exc, web.HTTPNotFound):
+            logger.warning("Failed to refresh cached response of %s", self.request.path_qs, exc_info=exc)
+
+    async def invalidate_cache(self) -> None:
+        """
+        Drop cached responses of the view's namespace, called after every write. Within `session_scope()`
+        it's done once the transaction is committed, so concurrent reads can't cache the old rows again.
+        """
+        await on_commit(partial(self.get_cache_backend().incr_generation, self.get_cache_namespace()))
+
+    @staticmethod
+    def _set_validators(
+        response: web.StreamResponse,
+        etag: typing.Optional[str],
+        last_modified: typing.Optional[datetime.datetime] = None,
+    ) -> None:
+        if etag is not None:
+            response.headers[hdrs.ETAG] = etag
+        if last_modified is not None:
+            response.last_modified = last_modified
+
     def get_serializer_context(self):
         return {
             "request": self.request,
             "view": self,
             "config": self.rest_config,
+            "precondition": self.write_precondition,
         }
 
-    async def get_object(self):
+    def get_lookup(self) -> typing.Dict[str, typing.Any]:
+        """Filter params of the object the request is about"""
         lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
-        params = {self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        return {self.lookup_field: self.kwargs[lookup_url_kwarg]}
+
+    def can_write_by_lookup(self) -> bool:
+        if not self.write_by_lookup:
+            return False
+        # ETag of current representation can't be compared to `If-Match` without fetching the object
+        return bool(self.etag_version_field) or not self.use_etag or hdrs.IF_MATCH not in self.request.headers
+
+    async def get_object(self):
+        params = self.get_lookup()
         db_manager = await self.get_db_manager()
+        # object is only dumped on read requests, while writes may need other columns as well
+        is_read = self.request.method in (hdrs.METH_GET, hdrs.METH_HEAD)
+        columns = self.get_select_columns() if is_read else None
+        kwargs = {"as_records": True} if is_read and self.read_records else {}
+        # object of a write request is read from the primary, a replica may not have its latest version yet
+        routing = nullcontext() if is_read else use_primary()
         try:
-            obj = await db_manager.get(params)
+            with routing:
+                obj = await db_manager.get(params, columns=columns, **kwargs)
         except ObjectNotFound:
             raise HTTPNotFound()
         return obj
 
+    def should_offload(self, rows: typing.Optional[int] = None, size: typing.Optional[int] = None) -> bool:
+        """Whether dumping of `rows` or validation of `size` bytes has to be run in offload executor"""
+        if rows is not None:
+            threshold = self.offload_rows_threshold
+            if threshold is None:
+                threshold = self.rest_config.offload_rows_threshold
+            return threshold is not None and rows >= threshold
+        if size is not None:
+            threshold = self.offload_bytes_threshold
+            if threshold is None:
+                threshold = self.rest_config.offload_bytes_threshold
+            return threshold is not None and size >= threshold
+        return False
+
+    def get_offload_executor(self) -> typing.Optional[Executor]:
+        return self.offload_executor or self.rest_config.offload_executor
+
+    async def validate(self, serializer: Serializer, size: int) -> None:
+        """Validate serializer of `size` bytes request body, in offload executor if the body is big enough"""
+        if self.should_offload(size=size):
+            await serializer.is_valid_in_executor(self.get_offload_executor(), raise_exception=True)
+        else:
+            serializer.is_valid(raise_exception=True)
+
     async def get_list(self):
         db_manager = await self.get_db_manager()
-        return await db_manager.all()
+        whereclause = await self.filter_whereclause()
+        columns = self.get_select_columns()
+        kwargs = self.get_list_row_kwargs()
+        if self.paginator is not None:
+            return await self.paginator.paginate_list(
+                db_manager, self.request, self, whereclause=whereclause, columns=columns, **kwargs,
+            )
+        if whereclause is not None:
+            return await db_manager.filter(whereclause=whereclause, columns=columns, **kwargs)
+        return await db_manager.all(columns=columns, **kwargs)
+
+    def get_list_row_kwargs(self) -> typing.Dict[str, bool]:
+        """
+        How db manager returns list rows. Options are only passed when they are set,
+        so custom db managers don't have to support them.
+        """
+        if self.can_dump_rows():
+            return {"as_mappings": True}
+        if self.read_records:
+            return {"as_records": True}
+        return {}
+
+    def can_dump_rows(self) -> bool:
+        """
+        Whether list rows can be dumped by the serializer straight from database rows,
+        so no model instances have to be built for them. See `ModelSerializer.get_row_dump_functions()`.
+        """
+        if not self.dump_rows:
+            return False
+        serializer = self.get_serializer()
+        get_row_dump_functions = getattr(serializer, "get_row_dump_functions", None)
+        return get_row_dump_functions is not None and get_row_dump_functions() is not None
+
+    async def get_total_count(self) -> typing.Optional[int]:
+        """Total number of (filtered) list rows according to `total_count_mode`"""
+        if not self.total_count_mode:
+            return None
+        assert self.total_count_mode in (self.EXACT_COUNT, self.ESTIMATED_COUNT), (
+            f"`total_count_mode` has to be one of {self.EXACT_COUNT}, {self.ESTIMATED_COUNT}"
+        )
+        db_manager = await self.get_db_manager()
+        whereclause = await self.filter_whereclause()
+        if self.total_count_mode == self.ESTIMATED_COUNT:
+            estimate = await db_manager.estimate_count(whereclause)
+            if estimate is not None and estimate >= self.total_count_exact_threshold:
+                return estimate
+        return await db_manager.count(whereclause)
+
+    async def filter_whereclause(self, whereclause=None):
+        """Narrow down list with every backend from `filter_backends`"""
+        db_manager = await self.get_db_manager()
+        for backend in self.filter_backends:
+            whereclause = backend().filter_whereclause(self.request, whereclause, db_manager, self)
+        return whereclause
+
+    async def get_list_stream(self) -> typing.AsyncIterator[typing.List]:
+        """Iterate over list instances chunk by chunk, used for streaming responses"""
+        db_manager = await self.get_db_manager()
+        whereclause = await self.filter_whereclause()
+        stream = db_manager.stream(
+            whereclause=whereclause,
+            chunk_size=self.stream_chunk_size,
+            columns=self.get_select_columns(),
+            **({"as_records": True} if self.read_records else {}),
+        )
+        async for instances in stream:
+            yield instances
+
+    async def get_bulk_whereclause(self):
+        """Filters of bulk update/delete, they are taken from `filter_backends`"""
+        whereclause = await self.filter_whereclause()
+        if whereclause is None and not self.allow_unfiltered_bulk:
+            raise ValidationError({"error": "At least one filter is required"})
+        return whereclause
+
+    def get_bulk_returning(self) -> bool:
+        """Whether bulk update/delete responds with affected objects, honors `Prefer` header (RFC 7240)"""
+        preferences = {item.strip() for item in self.request.headers.get("Prefer", "").split(",")}
+        if "return=representation" in preferences:
+            return True
+        if "return=minimal" in preferences:
+            return False
+        return self.bulk_return_objects
+
+    def get_bulk_response(self, result, returning: bool) -> web.Response:
+        if returning:
+            serializer = self.get_serializer(result, many=True)
+            return self.json_response(serializer.data)
+        return self.json_response({"count": result})
+
+    @property
+    def paginator(self) -> typing.Optional[BasePagination]:
+        """The paginator instance associated with the view, or `None`"""
+        if not hasattr(self, "_paginator"):
+            self._paginator = self.pagination_class() if self.pagination_class else None
+        return self._paginator
+
+    def get_paginated_response(self, data) -> web.Response:
+        assert self.paginator is not None, "`pagination_class` is not set"
+        return self.paginator.get_paginated_response(data)
 
 
 class CreateAPIView(CreateModelMixin,
@@ -128,6 +637,12 @@ class ListAPIView(ListModelMixin,
         return await self.list()
 
 
+class StreamingListAPIView(StreamingListModelMixin,
+                           GenericAPIView):
+    async def get(self):
+        return await self.stream_list()
+
+
 class RetrieveAPIView(RetrieveModelMixin,
                       GenericAPIView):
     async def get(self):
@@ -197,3 +712,35 @@ class RetrieveUpdateDestroyAPIView(RetrieveModelMixin,
 
     async def delete(self):
         return await self.destroy()
+
+
+class BulkUpdateAPIView(BulkUpdateModelMixin,
+                        GenericAPIView):
+    async def patch(self):
+        return await self.bulk_update()
+
+
+class BulkDestroyAPIView(BulkDestroyModelMixin,
+                         GenericAPIView):
+    async def delete(self):
+        return await self.bulk_destroy()
+
+
+class BulkUpdateDestroyAPIView(BulkUpdateModelMixin,
+                               BulkDestroyModelMixin,
+                               GenericAPIView):
+    async def patch(self):
+        return await self.bulk_update()
+
+    async def delete(self):
+        return await self.bulk_destroy()
+
+
+class PoolStatsView(APIView):
+    """
+    Connection pool statistics of the worker process handling the request, see `Config.get_pool_stats()`.
+    Every worker has its own pools, so each of them reports its own numbers.
+    """
+
+    async def get(self):
+        return self.json_response(await self.rest_config.get_pool_stats())
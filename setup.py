@@ -28,6 +28,9 @@ setup(
         "psycopg2",
         "asyncpg",
     ],
+    extras_require={
+        "sqlite": ["aiosqlite"],
+    },
     classifiers=[
         "Development Status :: 3 - Alpha",
         "Environment :: Web Environment",
@@ -0,0 +1,64 @@
+from unittest import IsolatedAsyncioTestCase, mock
+
+from aiohttp import web
+
+from aiohttp_rest_framework.cache import CachedResponse, LocMemCache
+
+
+class LocMemCacheTestCase(IsolatedAsyncioTestCase):
+    async def test_get_set_delete(self) -> None:
+        cache = LocMemCache()
+        self.assertIsNone(await cache.get("key"))
+        await cache.set("key", "value")
+        self.assertEqual(await cache.get("key"), "value")
+        await cache.delete("key")
+        self.assertIsNone(await cache.get("key"))
+
+    async def test_least_recently_used_entry_is_evicted(self) -> None:
+        cache = LocMemCache(max_entries=2)
+        await cache.set("first", 1)
+        await cache.set("second", 2)
+        await cache.get("first")
+        await cache.set("third", 3)
+        self.assertEqual(len(cache), 2)
+        self.assertIsNone(await cache.get("second"))
+        self.assertEqual(await cache.get("first"), 1)
+        self.assertEqual(await cache.get("third"), 3)
+
+    async def test_entry_expires(self) -> None:
+        cache = LocMemCache(default_timeout=10)
+        with mock.patch("aiohttp_rest_framework.cache.time.monotonic", return_value=100):
+            await cache.set("key", "value")
+            await cache.set("short", "value", timeout=1)
+        with mock.patch("aiohttp_rest_framework.cache.time.monotonic", return_value=105):
+            self.assertEqual(await cache.get("key"), "value")
+            self.assertIsNone(await cache.get("short"))
+        with mock.patch("aiohttp_rest_framework.cache.time.monotonic", return_value=110):
+            self.assertIsNone(await cache.get("key"))
+
+    async def test_generations_are_not_evicted(self) -> None:
+        cache = LocMemCache(max_entries=1)
+        self.assertEqual(await cache.get_generation("users"), 0)
+        self.assertEqual(await cache.incr_generation("users"), 1)
+        await cache.set("first", 1)
+        await cache.set("second", 2)
+        self.assertEqual(await cache.get_generation("users"), 1)
+
+
+class CachedResponseTestCase(IsolatedAsyncioTestCase):
+    def test_response_roundtrip(self) -> None:
+        response = web.json_response({"key": "value"})
+        response.headers["ETag"] = '"etag"'
+        response.headers["X-Other"] = "not cached"
+        cached = CachedResponse.from_response(response, timeout=10)
+        self.assertTrue(cached.is_fresh)
+
+        restored = cached.to_response()
+        self.assertEqual(restored.status, 200)
+        self.assertEqual(restored.body, response.body)
+        self.assertEqual(restored.content_type, "application/json")
+        self.assertEqual(restored.headers["ETag"], '"etag"')
+        self.assertNotIn("X-Other", restored.headers)
+
+        cached = CachedResponse.from_response(response, timeout=10, extra_headers=("X-Other",))
+        self.assertEqual(cached.to_response().headers["X-Other"], "not cached")
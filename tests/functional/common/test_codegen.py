@@ -0,0 +1,148 @@
+import datetime
+from types import SimpleNamespace
+from unittest import TestCase
+
+import marshmallow as ma
+
+from aiohttp_rest_framework import fields
+from aiohttp_rest_framework.codegen import get_dump_functions, get_load_function
+from aiohttp_rest_framework.serializers import Serializer
+
+
+class ItemSerializer(Serializer):
+    id = fields.Int()
+    title = fields.Str(data_key="name")
+    created = fields.DateTime(attribute="created_at")
+    status = fields.Str(default="new")
+    missing_attribute = fields.Str()
+    upper_title = fields.Method("get_upper_title")
+    secret = fields.Str(load_only=True)
+
+    def get_upper_title(self, obj):
+        return obj.title.upper()
+
+
+class PostDumpSerializer(ItemSerializer):
+    @ma.post_dump
+    def add_key(self, data, **kwargs):
+        data["extra"] = True
+        return data
+
+
+class LoadSerializer(Serializer):
+    id = fields.Int(required=True)
+    title = fields.Str(data_key="name", required=True)
+    age = fields.Int(validate=ma.validate.Range(min=0))
+    active = fields.Bool(missing=True)
+    created = fields.DateTime(attribute="created_at", allow_none=True)
+    comment = fields.Str(allow_none=True)
+
+
+class PostLoadSerializer(LoadSerializer):
+    @ma.post_load
+    def add_key(self, data, **kwargs):
+        data["extra"] = True
+        return data
+
+
+def get_items():
+    return [
+        SimpleNamespace(id=i, title=f"title {i}", created_at=datetime.datetime(2021, 1, i + 1), secret="secret")
+        for i in range(3)
+    ]
+
+
+class DumpCodegenTestCase(TestCase):
+    def test_compiled_dump_matches_marshmallow(self) -> None:
+        items = get_items()
+        for serializer in [ItemSerializer(), ItemSerializer(only=("id", "upper_title"))]:
+            dump_one, dump_many = get_dump_functions(serializer)
+            self.assertEqual(dump_one(items[0]), serializer.dump(items[0]))
+            self.assertEqual(dump_many(items), serializer.dump(items, many=True))
+
+        data = ItemSerializer().to_representation(items[0])
+        self.assertEqual(data["name"], "title 0")
+        self.assertEqual(data["created"], "2021-01-01T00:00:00")
+        self.assertEqual(data["status"], "new")
+        self.assertEqual(data["upper_title"], "TITLE 0")
+        self.assertNotIn("missing_attribute", data)
+        self.assertNotIn("secret", data)
+
+    def test_dump_functions_are_cached_per_layout(self) -> None:
+        get_dump_functions(ItemSerializer())
+        cache = ItemSerializer._dump_functions_cache
+        layouts_count = len(cache)
+        get_dump_functions(ItemSerializer())
+        self.assertEqual(len(cache), layouts_count)
+        get_dump_functions(ItemSerializer(only=("id", "created")))
+        self.assertEqual(len(cache), layouts_count + 1)
+
+    def test_fallback_to_marshmallow(self) -> None:
+        self.assertIsNone(get_dump_functions(PostDumpSerializer()))
+        items = get_items()
+        self.assertTrue(PostDumpSerializer(many=True).to_representation(items)[0]["extra"])
+
+        class NoCompileSerializer(ItemSerializer):
+            class Meta:
+                compile_dump = False
+
+        self.assertIsNone(NoCompileSerializer().get_dump_functions())
+        self.assertEqual(NoCompileSerializer().to_representation(items[0]), ItemSerializer().dump(items[0]))
+
+    def test_mappings_are_dumped_with_marshmallow(self) -> None:
+        item = {"id": 1, "title": "title", "created_at": datetime.datetime(2021, 1, 1)}
+        data = ItemSerializer(many=True, only=("id", "title")).to_representation([item])
+        self.assertEqual(data[0]["name"], "title")
+
+
+class LoadCodegenTestCase(TestCase):
+    def assertLoadsLikeMarshmallow(self, serializer, data, many=False) -> None:
+        load = get_load_function(serializer)
+        self.assertIsNotNone(load)
+        try:
+            expected = serializer.load(data, many=many)
+        except ma.ValidationError as exc:
+            with self.assertRaises(ma.ValidationError) as ctx:
+                load(data, many)
+            self.assertEqual(ctx.exception.messages, exc.messages)
+            self.assertEqual(ctx.exception.valid_data, exc.valid_data)
+        else:
+            self.assertEqual(load(data, many), expected)
+
+    def test_compiled_load_matches_marshmallow(self) -> None:
+        valid = {"id": 1, "name": "title", "age": 3, "active": False, "created": "2021-01-01T00:00:00", "unknown": 1}
+        cases = [
+            valid,
+            {"id": "1", "name": "title", "created": None, "comment": None},
+            {"id": 1.5, "name": 1, "age": -1, "active": "maybe", "created": "invalid"},
+            {"name": None},
+            {},
+            [],
+            "invalid",
+        ]
+        for data in cases:
+            self.assertLoadsLikeMarshmallow(LoadSerializer(), data)
+            self.assertLoadsLikeMarshmallow(LoadSerializer(partial=True), data)
+        self.assertLoadsLikeMarshmallow(LoadSerializer(many=True), [valid, {"id": "invalid"}, valid, 1], many=True)
+        self.assertLoadsLikeMarshmallow(LoadSerializer(many=True), [valid, valid], many=True)
+
+        data = LoadSerializer().load_data(valid)
+        self.assertEqual(data["title"], "title")
+        self.assertEqual(data["created_at"], datetime.datetime(2021, 1, 1))
+        self.assertNotIn("unknown", data)
+
+    def test_fallback_to_marshmallow(self) -> None:
+        self.assertIsNone(get_load_function(PostLoadSerializer()))
+        self.assertIsNone(get_load_function(LoadSerializer(partial=("id",))))
+        self.assertIsNone(get_load_function(LoadSerializer(unknown=ma.RAISE)))
+        self.assertTrue(PostLoadSerializer().load_data({"id": 1, "name": "title"})["extra"])
+
+        class NoCompileSerializer(LoadSerializer):
+            class Meta:
+                compile_load = False
+
+        self.assertIsNone(NoCompileSerializer().get_load_function())
+        # not a list, marshmallow reports it
+        with self.assertRaises(ma.ValidationError) as ctx:
+            LoadSerializer(many=True).load_data({"id": 1})
+        self.assertIn("_schema", ctx.exception.messages)
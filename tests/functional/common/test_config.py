@@ -1,9 +1,13 @@
 import asyncio
+import json
+from concurrent.futures import ProcessPoolExecutor
 from unittest import IsolatedAsyncioTestCase
 
 from aiohttp_rest_framework import APP_CONFIG_KEY
-from aiohttp_rest_framework.settings import DEFAULT_APP_CONN_PROP, SA
+from aiohttp_rest_framework.db.shards import ShardMap
+from aiohttp_rest_framework.settings import DEFAULT_APP_CONN_PROP, SA, SQLITE, set_global_config
 from tests.test_app.base_app import get_base_app
+from tests.test_app.sa.orm.models import Company, User
 
 
 class ConfigTestCase(IsolatedAsyncioTestCase):
@@ -17,6 +21,13 @@ class ConfigTestCase(IsolatedAsyncioTestCase):
         self.assertEqual(cfg.app_connection_property, DEFAULT_APP_CONN_PROP)
         self.assertTrue(cfg.schema_type, SA)
 
+    def test_db_managers_are_cached_per_model(self) -> None:
+        cfg = get_base_app()[APP_CONFIG_KEY]
+        db_manager = cfg.get_db_manager(User)
+        self.assertIsInstance(db_manager, cfg.db_manager_class)
+        self.assertIs(cfg.get_db_manager(User), db_manager)
+        self.assertIsNot(cfg.get_db_manager(Company), db_manager)
+
     def test_wrong_get_connection_config_setup(self) -> None:
         for get_connection in ["wrong_get_conn", lambda: "some connection"]:
             rest_config = {"get_connection": get_connection}
@@ -54,3 +65,33 @@ class ConfigTestCase(IsolatedAsyncioTestCase):
         with self.assertRaises(AssertionError) as exc_info:
             get_base_app(rest_config)
         self.assertIn("`schema_type` has to be one of", exc_info.exception.args[0])
+
+    def test_process_pool_requires_picklable_json_codec(self) -> None:
+        with ProcessPoolExecutor(max_workers=1) as executor:
+            rest_config = {"offload_executor": executor, "json_dumps": lambda data: b"bytes"}
+            with self.assertRaises(AssertionError) as exc_info:
+                get_base_app(rest_config)
+            self.assertIn("have to be picklable", exc_info.exception.args[0])
+
+            cfg = get_base_app({"offload_executor": executor})[APP_CONFIG_KEY]
+            self.assertEqual(cfg.get_worker_options(), (SA, json.loads, json.dumps))
+
+    def test_sharding_unsupported_by_schema_type(self) -> None:
+        rest_config = {"schema_type": SQLITE, "shard_maps": {User: ShardMap({}, "id")}}
+        with self.assertRaises(AssertionError) as exc_info:
+            get_base_app(rest_config)
+        self.assertIn("`shard_maps` aren't supported", exc_info.exception.args[0])
+
+    def test_json_codec(self) -> None:
+        cfg = get_base_app()[APP_CONFIG_KEY]
+        self.assertEqual(cfg.render_json({"key": "value"}), b'{"key": "value"}')
+
+        self.addCleanup(set_global_config, cfg)  # don't leave broken codec in global config
+        rest_config = {"json_dumps": lambda data: b"bytes", "json_loads": lambda data: "loaded"}
+        cfg = get_base_app(rest_config)[APP_CONFIG_KEY]
+        self.assertEqual(cfg.render_json({"key": "value"}), b"bytes")
+        self.assertEqual(cfg.json_loads("{}"), "loaded")
+
+        with self.assertRaises(AssertionError) as exc_info:
+            get_base_app({"json_dumps": "not callable"})
+        self.assertIn("`json_loads` and `json_dumps` have to be callable", exc_info.exception.args[0])
@@ -0,0 +1,48 @@
+import json
+from unittest import TestCase
+
+from aiohttp_rest_framework.parsers import JSONArrayParser
+
+
+class JSONArrayParserTestCase(TestCase):
+    def parse_by_chunks(self, raw: bytes, chunk_size: int) -> list:
+        parser = JSONArrayParser()
+        items = []
+        for i in range(0, len(raw), chunk_size):
+            items.extend(parser.feed(raw[i:i + chunk_size]))
+        parser.close()
+        return items
+
+    def test_items_split_between_chunks(self) -> None:
+        data = [
+            {"name": 'tricky ,]}"{[ \\ string', "nested": [1, 2, {"key": None}]},
+            "string \\",
+            [],
+            {},
+            1.5,
+            "unicode ✓",
+        ]
+        raw = json.dumps(data, ensure_ascii=False).encode()
+        for chunk_size in [1, 2, 3, 7, len(raw)]:
+            self.assertEqual(self.parse_by_chunks(raw, chunk_size), data, chunk_size)
+
+    def test_items_are_returned_as_soon_as_received(self) -> None:
+        parser = JSONArrayParser()
+        self.assertEqual(parser.feed(b' [{"id": 1}, {"id"'), [{"id": 1}])
+        self.assertEqual(parser.feed(b": 2}"), [])
+        self.assertEqual(parser.feed(b"]\n"), [{"id": 2}])
+        parser.close()
+
+    def test_empty_array(self) -> None:
+        self.assertEqual(self.parse_by_chunks(b" [ ] ", 1), [])
+
+    def test_invalid_json(self) -> None:
+        for raw in [b"[1,]", b"[,1]", b"{}", b"[1", b"[1] 2", b"[1 2]", b'["unclosed]']:
+            with self.assertRaises(ValueError, msg=raw):
+                self.parse_by_chunks(raw, 2)
+
+    def test_mismatched_brackets(self) -> None:
+        for raw in [b"[1, 2}", b'[{"a": 1}}', b'[{"a": [1}]]', b"[[1, 2}]"]:
+            for chunk_size in [1, len(raw)]:
+                with self.assertRaises(ValueError, msg=raw):
+                    self.parse_by_chunks(raw, chunk_size)
@@ -0,0 +1,46 @@
+from unittest import IsolatedAsyncioTestCase, mock
+
+from aiohttp_rest_framework.db.replicas import (
+    LagAwarePolicy,
+    LeastConnectionsPolicy,
+    RoundRobinPolicy,
+    is_primary_pinned,
+    use_primary,
+)
+
+
+def get_replica(connections: int = 0) -> mock.Mock:
+    replica = mock.Mock()
+    replica.sync_engine.pool.checkedout.return_value = connections
+    return replica
+
+
+class ReplicaPoliciesTestCase(IsolatedAsyncioTestCase):
+    async def test_round_robin(self) -> None:
+        policy = RoundRobinPolicy()
+        replicas = [get_replica(), get_replica()]
+        chosen = [await policy.choose(replicas) for _ in range(4)]
+        self.assertEqual(chosen, replicas * 2)
+        self.assertIsNone(await policy.choose([]))
+
+    async def test_least_connections(self) -> None:
+        policy = LeastConnectionsPolicy()
+        replicas = [get_replica(3), get_replica(1), get_replica(2)]
+        self.assertIs(await policy.choose(replicas), replicas[1])
+        self.assertIsNone(await policy.choose([]))
+
+    async def test_lag_aware(self) -> None:
+        policy = LagAwarePolicy(max_lag=1, check_interval=10)
+        behind, fresh, unreachable = get_replica(), get_replica(), get_replica()
+        lags = {behind: 5.0, fresh: 0.5, unreachable: None}
+        with mock.patch.object(policy, "measure_lag", side_effect=lambda replica: lags[replica]) as measure_lag:
+            self.assertIs(await policy.choose([behind, fresh, unreachable]), fresh)
+            self.assertIs(await policy.choose([behind, fresh, unreachable]), fresh)
+            self.assertEqual(measure_lag.call_count, 3)  # lags are measured once per `check_interval`
+            self.assertIsNone(await policy.choose([behind, unreachable]))
+
+    def test_use_primary(self) -> None:
+        self.assertFalse(is_primary_pinned())
+        with use_primary():
+            self.assertTrue(is_primary_pinned())
+        self.assertFalse(is_primary_pinned())
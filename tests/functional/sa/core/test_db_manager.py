@@ -1,9 +1,9 @@
 import uuid
 
 from aiohttp.test_utils import unittest_run_loop
-from sqlalchemy import and_
+from sqlalchemy import and_, text
 
-from aiohttp_rest_framework.exceptions import MultipleObjectsReturned, ObjectNotFound
+from aiohttp_rest_framework.exceptions import FieldValidationError, MultipleObjectsReturned, ObjectNotFound
 from tests.functional.sa.core.base import BaseTestCase
 from tests.functional.sa.utils import get_fixtures_by_name
 from tests.test_app.sa.core import models
@@ -24,6 +24,29 @@ class DBManagerTestCase(BaseTestCase):
         self.assertIsInstance(users_from_db, list)
         self.assertGreater(len(users_from_db), 1)
 
+    @unittest_run_loop
+    async def test_db_all_ordered_and_limited(self) -> None:
+        service = await self.get_db_manager(models.User)
+        users_from_db = await service.all(order_by=["-email"], limit=2, offset=1)
+        emails = sorted((user["email"] for user in get_fixtures_by_name("User")), reverse=True)
+        self.assertEqual([user.email for user in users_from_db], emails[1:3])
+
+    @unittest_run_loop
+    async def test_db_filter_keyset(self) -> None:
+        service = await self.get_db_manager(models.User)
+        emails = sorted(user["email"] for user in get_fixtures_by_name("User"))
+        whereclause = service.get_keyset_whereclause(["email"], [emails[0]])
+        users_from_db = await service.filter(whereclause=whereclause, order_by=["email"])
+        self.assertEqual([user.email for user in users_from_db], emails[1:])
+
+    @unittest_run_loop
+    async def test_db_stream(self) -> None:
+        service = await self.get_db_manager(models.User)
+        chunks = [chunk async for chunk in service.stream(order_by=["email"], chunk_size=2)]
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 1])
+        emails = sorted(user["email"] for user in get_fixtures_by_name("User"))
+        self.assertEqual([user.email for chunk in chunks for user in chunk], emails)
+
     @unittest_run_loop
     async def test_db_filter_with_operator(self):
         service = await self.get_db_manager(models.User)
@@ -31,6 +54,102 @@ class DBManagerTestCase(BaseTestCase):
         self.assertIsInstance(users_from_db, list)
         self.assertEqual(users_from_db[0].id, self.user.id)
 
+    @unittest_run_loop
+    async def test_db_filter_with_lookups(self) -> None:
+        service = await self.get_db_manager(models.User)
+        fixtures = get_fixtures_by_name("User")
+        emails = [fixtures[0]["email"], fixtures[1]["email"]]
+        users_from_db = await service.filter({"email__in": emails, "name__icontains": fixtures[0]["name"][:3].upper()})
+        self.assertEqual([user.email for user in users_from_db], emails[:1])
+
+    @unittest_run_loop
+    async def test_db_select_columns(self) -> None:
+        service = await self.get_db_manager(models.User)
+        users_from_db = await service.all(columns=["email"])
+        self.assertEqual(len(users_from_db), len(get_fixtures_by_name("User")))
+        for user in users_from_db:
+            self.assertTrue(user.id)  # primary key is always selected
+            self.assertTrue(user.email)
+
+        user_from_db = await service.get({"id": self.user.id}, columns=["name"])
+        self.assertEqual(user_from_db.id, self.user.id)
+        self.assertEqual(user_from_db.name, self.user.name)
+
+    @unittest_run_loop
+    async def test_db_create_returning_columns(self) -> None:
+        service = await self.get_db_manager(models.User)
+        test_user_data = self.get_test_user_data()
+        user_from_db = await service.create(test_user_data, columns=["email"])
+        self.assertTrue(user_from_db.id)
+        self.assertEqual(user_from_db.email, test_user_data["email"])
+
+    @unittest_run_loop
+    async def test_db_bulk_create(self) -> None:
+        service = await self.get_db_manager(models.User)
+        values = []
+        for i in range(5):
+            user_data = {**self.get_test_user_data(), "email": f"bulk{i}@test.com"}
+            if i % 3 == 0:  # rows with different set of keys are inserted with separate statements
+                user_data["company_id"] = self.user.company_id
+            values.append(user_data)
+        users = await service.bulk_create(values, columns=["email", "company_id"], chunk_size=2)
+        self.assertEqual([user.email for user in users], [user_data["email"] for user_data in values])
+        self.assertTrue(all(user.id for user in users))
+        self.assertEqual(await service.count(), len(get_fixtures_by_name("User")) + len(values))
+
+    @unittest_run_loop
+    async def test_db_bulk_create_is_atomic(self) -> None:
+        service = await self.get_db_manager(models.User)
+        invalid_user_data = self.get_test_user_data()
+        invalid_user_data.pop("password")
+        values = [
+            {**self.get_test_user_data(), "email": "bulk1@test.com"},
+            {**self.get_test_user_data(), "email": "bulk2@test.com"},
+            invalid_user_data,
+        ]
+        with self.assertRaises(FieldValidationError):
+            await service.bulk_create(values, chunk_size=1)
+        self.assertEqual(await service.count(), len(get_fixtures_by_name("User")))
+
+    @unittest_run_loop
+    async def test_db_bulk_update(self) -> None:
+        service = await self.get_db_manager(models.User)
+        duplicated_phone = get_fixtures_by_name("User")[1]["phone"]
+        count = await service.bulk_update({"phone": duplicated_phone}, {"name": "Bulk"})
+        self.assertEqual(count, 2)
+
+        whereclause = service.get_lookup_clause("name", "icontains", "bulk")
+        users = await service.bulk_update(None, {"name": "Bulk 2"}, whereclause=whereclause, returning=True)
+        self.assertEqual([user.name for user in users], ["Bulk 2", "Bulk 2"])
+        self.assertEqual({user.phone for user in users}, {duplicated_phone})
+
+    @unittest_run_loop
+    async def test_db_bulk_delete(self) -> None:
+        service = await self.get_db_manager(models.User)
+        duplicated_phone = get_fixtures_by_name("User")[1]["phone"]
+        users = await service.bulk_delete({"phone": duplicated_phone}, returning=True, columns=["phone"])
+        self.assertEqual(len(users), 2)
+        self.assertEqual(await service.bulk_delete({"phone": duplicated_phone}), 0)
+        self.assertEqual(await service.count(), len(get_fixtures_by_name("User")) - 2)
+
+    @unittest_run_loop
+    async def test_db_count(self) -> None:
+        service = await self.get_db_manager(models.User)
+        self.assertEqual(await service.count(), len(get_fixtures_by_name("User")))
+        duplicated_phone = get_fixtures_by_name("User")[1]["phone"]
+        whereclause = service.get_lookup_clause("phone", "exact", duplicated_phone)
+        self.assertEqual(await service.count(whereclause), 2)
+
+    @unittest_run_loop
+    async def test_db_estimate_count(self) -> None:
+        service = await self.get_db_manager(models.User)
+        await service.execute(text("ANALYZE users"))
+        self.assertEqual(await service.estimate_count(), len(get_fixtures_by_name("User")))
+        whereclause = service.get_lookup_clause("email", "exact", self.user.email)
+        estimate = await service.estimate_count(whereclause)
+        self.assertIsInstance(estimate, int)
+        self.assertGreaterEqual(estimate, 1)
+
     @unittest_run_loop
     async def test_db_create(self) -> None:
         service = await self.get_db_manager(models.User)
@@ -68,6 +68,25 @@ class SerializerTestCase(BaseTestCase):
         self.assertIn(invalid_field, serializer.fields)
         self.assertIsInstance(serializer.fields[invalid_field], field_cls)
 
+    def test_dump_columns(self) -> None:
+        columns = UserSerializer().get_dump_columns()
+        self.assertIn("email", columns)
+        self.assertNotIn("password", columns)  # load only
+
+        self.assertEqual(UserSerializer(only=("name",)).get_dump_columns(), ("name",))
+
+        class WithMethodFieldSerializer(ModelSerializer):
+            display_name = fields.Method("get_display_name")
+
+            class Meta:
+                model = models.User
+                fields = "__all__"
+
+            def get_display_name(self, obj):
+                return obj.name
+
+        self.assertIsNone(WithMethodFieldSerializer().get_dump_columns())
+
     class SomeSerializer(Serializer):
         pass
 
@@ -0,0 +1,79 @@
+from urllib.parse import quote
+
+from aiohttp.test_utils import unittest_run_loop
+
+from tests.functional.sa.orm.base import BaseTestCase
+from tests.functional.sa.utils import get_fixtures_by_name
+
+
+class BulkViewsTestCase(BaseTestCase):
+    duplicated_phone = get_fixtures_by_name("User")[1]["phone"]
+
+    @unittest_run_loop
+    async def test_bulk_update(self) -> None:
+        response = await self.client.patch(f"/bulk/users?phone={quote(self.duplicated_phone)}", json={"name": "Bulk"})
+        self.assertEqual(response.status, 200)
+        self.assertEqual(await response.json(), {"count": 2})
+
+        response = await self.client.get("/users")
+        users = await response.json()
+        self.assertEqual(
+            sorted(user["name"] == "Bulk" for user in users),
+            sorted(user["phone"] == self.duplicated_phone for user in users),
+        )
+
+    @unittest_run_loop
+    async def test_bulk_update_returning_objects(self) -> None:
+        response = await self.client.patch(
+            f"/bulk/users?phone={quote(self.duplicated_phone)}",
+            json={"name": "Bulk"},
+            headers={"Prefer": "return=representation"},
+        )
+        self.assertEqual(response.status, 200)
+        data = await response.json()
+        self.assertEqual(len(data), 2)
+        for user in data:
+            self.assertEqual(user["name"], "Bulk")
+            self.assertEqual(user["phone"], self.duplicated_phone)
+            self.assertNotIn("password", user)
+
+    @unittest_run_loop
+    async def test_bulk_update_validation(self) -> None:
+        response = await self.client.patch(f"/bulk/users?phone={quote(self.duplicated_phone)}", json={"company_id": 1})
+        self.assertEqual(response.status, 400)
+        self.assertIn("company_id", await response.json())
+
+        response = await self.client.patch("/bulk/users", json={"name": "Bulk"})
+        self.assertEqual(response.status, 400)
+
+        response = await self.client.patch(f"/bulk/users?phone={quote(self.duplicated_phone)}", json={})
+        self.assertEqual(response.status, 400)
+        self.assertEqual(await response.json(), {"error": "No data provided"})
+        response = await self.client.get("/users")
+        self.assertNotIn("Bulk", [user["name"] for user in await response.json()])
+
+    @unittest_run_loop
+    async def test_bulk_delete(self) -> None:
+        emails = [user["email"] for user in get_fixtures_by_name("User")[:2]]
+        response = await self.client.delete(f"/bulk/users?email__in={','.join(emails)}")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(await response.json(), {"count": 2})
+
+        response = await self.client.get("/users")
+        users = await response.json()
+        self.assertEqual(len(users), len(get_fixtures_by_name("User")) - 2)
+        self.assertFalse(set(emails) & {user["email"] for user in users})
+
+        response = await self.client.delete("/bulk/users")
+        self.assertEqual(response.status, 400)
+
+    @unittest_run_loop
+    async def test_bulk_delete_returning_objects(self) -> None:
+        response = await self.client.delete(
+            f"/bulk/users?email={quote(self.user.email)}",
+            headers={"Prefer": "return=representation"},
+        )
+        self.assertEqual(response.status, 200)
+        data = await response.json()
+        self.assertEqual([user["id"] for user in data], [str(self.user.id)])
+        self.assertIsNone(await self.get_user_by_id(self.user.id))
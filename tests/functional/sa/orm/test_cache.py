@@ -0,0 +1,161 @@
+import asyncio
+import uuid
+from unittest import mock
+
+from aiohttp.test_utils import unittest_run_loop
+from sqlalchemy import update
+
+from aiohttp_rest_framework import APP_CONFIG_KEY
+from aiohttp_rest_framework.db import sa as sa_db
+from aiohttp_rest_framework.middlewares import session_middleware
+from aiohttp_rest_framework.views import GenericAPIView
+from tests.functional.sa.orm.base import BaseTestCase
+from tests.functional.sa.utils import get_fixtures_by_name
+from tests.test_app.sa.orm.config import DB_URL
+from tests.test_app.sa.orm.models import User
+from tests.utils import async_session
+
+
+class ResponseCacheTestCase(BaseTestCase):
+    async def rename_user_in_db(self, user_id: uuid.UUID, name: str) -> None:
+        """Change the row bypassing views, so cache doesn't know about it"""
+        async with async_session(DB_URL) as session:
+            await session.execute(update(User).where(User.id == user_id).values(name=name))
+
+    @unittest_run_loop
+    async def test_retrieve_is_cached(self) -> None:
+        url = f"/cached/users/{self.user.id}"
+        response = await self.client.get(url)
+        self.assertEqual(response.status, 200)
+        etag = response.headers["ETag"]
+
+        await self.rename_user_in_db(self.user.id, "Renamed")
+        response = await self.client.get(url)
+        self.assertEqual(response.status, 200)
+        self.assertEqual((await response.json())["name"], self.user.name)
+        self.assertEqual(response.headers["ETag"], etag)
+
+        response = await self.client.get(url, headers={"If-None-Match": etag})
+        self.assertEqual(response.status, 304)
+
+    @unittest_run_loop
+    async def test_write_invalidates_cache(self) -> None:
+        response = await self.client.get("/cached/users")
+        self.assertEqual(len(await response.json()), len(get_fixtures_by_name("User")))
+        response = await self.client.get(f"/cached/users/{self.user.id}")
+        self.assertEqual((await response.json())["name"], self.user.name)
+
+        response = await self.client.post("/cached/users", json=self.get_test_user_data())
+        self.assertEqual(response.status, 201)
+        response = await self.client.get("/cached/users")
+        self.assertEqual(len(await response.json()), len(get_fixtures_by_name("User")) + 1)
+
+        response = await self.client.patch(f"/cached/users/{self.user.id}", json={"name": "Renamed"})
+        self.assertEqual(response.status, 200)
+        response = await self.client.get(f"/cached/users/{self.user.id}")
+        self.assertEqual((await response.json())["name"], "Renamed")
+
+        response = await self.client.delete(f"/cached/users/{self.user.id}")
+        self.assertEqual(response.status, 204)
+        response = await self.client.get(f"/cached/users/{self.user.id}")
+        self.assertEqual(response.status, 404)
+
+    @unittest_run_loop
+    async def test_view_headers_are_cached(self) -> None:
+        for _ in range(2):  # cache miss and hit
+            response = await self.client.get("/cached/users")
+            self.assertEqual(response.headers["X-Count"], str(len(get_fixtures_by_name("User"))))
+
+    @unittest_run_loop
+    async def test_query_and_vary_headers_are_part_of_the_key(self) -> None:
+        await self.client.get("/cached/users")
+        await self.rename_user_in_db(self.user.id, "Renamed")
+        for url, headers in [("/cached/users?some=param", {}), ("/cached/users", {"Authorization": "token"})]:
+            response = await self.client.get(url, headers=headers)
+            names = [user["name"] for user in await response.json()]
+            self.assertIn("Renamed", names)
+
+    @unittest_run_loop
+    async def test_not_found_is_cached(self) -> None:
+        user_id = uuid.uuid4()
+        response = await self.client.get(f"/cached/users/{user_id}")
+        self.assertEqual(response.status, 404)
+
+        async with async_session(DB_URL) as session:
+            session.add(User(id=str(user_id), **self.get_test_user_data()))
+        response = await self.client.get(f"/cached/users/{user_id}")
+        self.assertEqual(response.status, 404)
+        self.assertEqual((await response.json())["error"], "Not found")
+
+    @unittest_run_loop
+    async def test_stale_while_revalidate(self) -> None:
+        url = f"/stale/users/{self.user.id}"
+        await self.client.get(url)
+        await self.rename_user_in_db(self.user.id, "Renamed")
+        await asyncio.sleep(0.15)  # let the entry get stale
+
+        response = await self.client.get(url)
+        self.assertEqual(response.status, 200)
+        self.assertEqual((await response.json())["name"], self.user.name)
+
+        for _ in range(50):  # wait for background refresh
+            response = await self.client.get(url)
+            if (await response.json())["name"] == "Renamed":
+                break
+            await asyncio.sleep(0.01)
+        else:
+            self.fail("stale response wasn't refreshed")
+
+
+class SessionMiddlewareCacheTestCase(ResponseCacheTestCase):
+    """The same cache, but writes run in a single session committed after the view returns"""
+
+    async def get_application(self):
+        app = await super().get_application()
+        app.middlewares.append(session_middleware)
+        return app
+
+    @unittest_run_loop
+    async def test_cache_is_invalidated_after_commit(self) -> None:
+        url = f"/cached/users/{self.user.id}"
+        await self.client.get(url)
+        names_at_invalidation = []
+
+        async def read_while_invalidating(backend, namespace):
+            # a concurrent read at this moment must not see (and cache again) the old row
+            names_at_invalidation.append((await self.get_user_by_id(self.user.id)).name)
+            await self.client.get(url)
+            return await incr_generation(backend, namespace)
+
+        backend = type(self.app[APP_CONFIG_KEY].cache_backend)
+        incr_generation = backend.incr_generation
+        with mock.patch.object(backend, "incr_generation", autospec=True, side_effect=read_while_invalidating):
+            response = await self.client.patch(url, json={"name": "Renamed"})
+            self.assertEqual(response.status, 200)
+        self.assertEqual(names_at_invalidation, ["Renamed"])
+        response = await self.client.get(url)
+        self.assertEqual((await response.json())["name"], "Renamed")
+
+    @unittest_run_loop
+    async def test_stale_refresh_leaves_request_session(self) -> None:
+        scopes = []
+        fetch_response = GenericAPIView.fetch_response
+
+        async def fetch_and_record_scope(view, key, get_response):
+            scopes.append(sa_db._session_scope.get())  # noqa
+            return await fetch_response(view, key, get_response)
+
+        url = f"/stale/users/{self.user.id}"
+        with mock.patch.object(GenericAPIView, "fetch_response", autospec=True, side_effect=fetch_and_record_scope):
+            await self.client.get(url)
+            await asyncio.sleep(0.15)  # let the entry get stale
+            await self.rename_user_in_db(self.user.id, "Renamed")
+            for _ in range(50):  # stale response is returned until background refresh is done
+                response = await self.client.get(url)
+                if (await response.json())["name"] == "Renamed":
+                    break
+                await asyncio.sleep(0.01)
+            else:
+                self.fail("stale response wasn't refreshed")
+        self.assertIsNotNone(scopes[0])  # cache miss is fetched within the request
+        self.assertIsNone(scopes[1])
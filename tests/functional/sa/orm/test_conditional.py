@@ -0,0 +1,121 @@
+import datetime
+
+from aiohttp.test_utils import unittest_run_loop
+
+from tests.functional.sa.orm.base import BaseTestCase
+
+
+class ConditionalRequestsTestCase(BaseTestCase):
+    @unittest_run_loop
+    async def test_retrieve_not_modified(self) -> None:
+        response = await self.client.get(f"/users/{self.user.id}")
+        self.assertEqual(response.status, 200)
+        etag = response.headers["ETag"]
+        self.assertTrue(etag.startswith('"') and etag.endswith('"'))
+
+        response = await self.client.get(f"/users/{self.user.id}", headers={"If-None-Match": etag})
+        self.assertEqual(response.status, 304)
+        self.assertEqual(response.headers["ETag"], etag)
+        self.assertEqual(await response.read(), b"")
+
+        response = await self.client.get(f"/users/{self.user.id}", headers={"If-None-Match": f'"other", W/{etag}'})
+        self.assertEqual(response.status, 304)
+
+        response = await self.client.get(f"/users/{self.user.id}", headers={"If-None-Match": '"other"'})
+        self.assertEqual(response.status, 200)
+
+    @unittest_run_loop
+    async def test_list_not_modified(self) -> None:
+        response = await self.client.get("/users")
+        etag = response.headers["ETag"]
+        response = await self.client.get("/users", headers={"If-None-Match": etag})
+        self.assertEqual(response.status, 304)
+
+        await self.client.patch(f"/users/{self.user.id}", json={"name": "Changed"})
+        response = await self.client.get("/users", headers={"If-None-Match": etag})
+        self.assertEqual(response.status, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+
+    @unittest_run_loop
+    async def test_update_if_match(self) -> None:
+        response = await self.client.get(f"/users/{self.user.id}")
+        etag = response.headers["ETag"]
+
+        response = await self.client.patch(
+            f"/users/{self.user.id}", json={"name": "Changed"}, headers={"If-Match": '"outdated"'},
+        )
+        self.assertEqual(response.status, 412)
+        self.assertEqual((await self.get_user_by_id(self.user.id)).name, self.user.name)
+
+        response = await self.client.patch(
+            f"/users/{self.user.id}", json={"name": "Changed"}, headers={"If-Match": etag},
+        )
+        self.assertEqual(response.status, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+
+        # representation has changed, so the old etag doesn't match anymore
+        response = await self.client.delete(f"/users/{self.user.id}", headers={"If-Match": etag})
+        self.assertEqual(response.status, 412)
+
+    @unittest_run_loop
+    async def test_version_field_etag(self) -> None:
+        response = await self.client.get(f"/versioned/users/{self.user.id}")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.headers["ETag"], f'"{self.user.created_at.isoformat()}"')
+        self.assertIn("Last-Modified", response.headers)
+
+        response = await self.client.get(
+            f"/versioned/users/{self.user.id}", headers={"If-None-Match": response.headers["ETag"]},
+        )
+        self.assertEqual(response.status, 304)
+
+        response = await self.client.get(
+            f"/versioned/users/{self.user.id}", headers={"If-Modified-Since": response.headers["Last-Modified"]},
+        )
+        self.assertEqual(response.status, 304)
+
+    @unittest_run_loop
+    async def test_version_field_if_match(self) -> None:
+        url = f"/versioned/users/{self.user.id}"
+        outdated = f'"{(self.user.created_at - datetime.timedelta(seconds=1)).isoformat()}"'
+        for if_match in [outdated, '"not a date"', f'W/"{self.user.created_at.isoformat()}"']:
+            response = await self.client.patch(url, json={"name": "Changed"}, headers={"If-Match": if_match})
+            self.assertEqual(response.status, 412, if_match)
+            response = await self.client.delete(url, headers={"If-Match": if_match})
+            self.assertEqual(response.status, 412, if_match)
+        self.assertEqual((await self.get_user_by_id(self.user.id)).name, self.user.name)
+
+        current = f'"{self.user.created_at.isoformat()}"'
+        response = await self.client.patch(
+            url, json={"name": "Changed"}, headers={"If-Match": f"{outdated}, {current}"},
+        )
+        self.assertEqual(response.status, 200)
+        self.assertEqual((await self.get_user_by_id(self.user.id)).name, "Changed")
+
+        response = await self.client.delete(url, headers={"If-Match": current})
+        self.assertEqual(response.status, 204)
+        self.assertIsNone(await self.get_user_by_id(self.user.id))
+
+    @unittest_run_loop
+    async def test_writes_by_lookup_if_match(self) -> None:
+        url = f"/lookup/versioned/users/{self.user.id}"
+        outdated = f'"{(self.user.created_at - datetime.timedelta(seconds=1)).isoformat()}"'
+        response = await self.client.patch(url, json={"name": "Changed"}, headers={"If-Match": outdated})
+        self.assertEqual(response.status, 412)
+        response = await self.client.delete(url, headers={"If-Match": outdated})
+        self.assertEqual(response.status, 412)
+
+        current = f'"{self.user.created_at.isoformat()}"'
+        response = await self.client.patch(url, json={"name": "Changed"}, headers={"If-Match": current})
+        self.assertEqual(response.status, 200)
+        self.assertEqual((await self.get_user_by_id(self.user.id)).name, "Changed")
+        response = await self.client.delete(url, headers={"If-Match": current})
+        self.assertEqual(response.status, 204)
+        response = await self.client.delete(url, headers={"If-Match": current})
+        self.assertEqual(response.status, 404)
+
+        # body ETag needs the current object, so such requests are checked the usual way
+        response = await self.client.patch(
+            f"/lookup/users/{self.user.id}", json={"name": "Changed"}, headers={"If-Match": '"outdated"'},
+        )
+        self.assertEqual(response.status, 404)
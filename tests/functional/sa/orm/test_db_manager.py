@@ -1,9 +1,13 @@
 import uuid
+from unittest import mock
 
 from aiohttp.test_utils import unittest_run_loop
-from sqlalchemy import and_
+from sqlalchemy import and_, text
 
-from aiohttp_rest_framework.exceptions import MultipleObjectsReturned, ObjectNotFound
+from aiohttp_rest_framework.codegen import make_record_class
+from aiohttp_rest_framework.db.sa import SAManager, on_commit, session_scope
+from aiohttp_rest_framework.exceptions import FieldValidationError, MultipleObjectsReturned, ObjectNotFound
+from aiohttp_rest_framework.settings import get_global_config
 from tests.functional.sa.orm.base import BaseTestCase
 from tests.functional.sa.utils import get_fixtures_by_name
 from tests.test_app.sa.orm import models
@@ -24,6 +28,29 @@ class DBManagerTestCase(BaseTestCase):
         self.assertIsInstance(users_from_db, list)
         self.assertGreater(len(users_from_db), 1)
 
+    @unittest_run_loop
+    async def test_db_all_ordered_and_limited(self) -> None:
+        service = await self.get_db_manager(models.User)
+        users_from_db = await service.all(order_by=["-email"], limit=2, offset=1)
+        emails = sorted((user["email"] for user in get_fixtures_by_name("User")), reverse=True)
+        self.assertEqual([user.email for user in users_from_db], emails[1:3])
+
+    @unittest_run_loop
+    async def test_db_filter_keyset(self) -> None:
+        service = await self.get_db_manager(models.User)
+        emails = sorted(user["email"] for user in get_fixtures_by_name("User"))
+        whereclause = service.get_keyset_whereclause(["email"], [emails[0]])
+        users_from_db = await service.filter(whereclause=whereclause, order_by=["email"])
+        self.assertEqual([user.email for user in users_from_db], emails[1:])
+
+    @unittest_run_loop
+    async def test_db_stream(self) -> None:
+        service = await self.get_db_manager(models.User)
+        chunks = [chunk async for chunk in service.stream(order_by=["email"], chunk_size=2)]
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 1])
+        emails = sorted(user["email"] for user in get_fixtures_by_name("User"))
+        self.assertEqual([user.email for chunk in chunks for user in chunk], emails)
+
     @unittest_run_loop
     async def test_db_filter_with_operator(self):
         service = await self.get_db_manager(models.User)
@@ -31,6 +58,190 @@ class DBManagerTestCase(BaseTestCase):
         self.assertIsInstance(users_from_db, list)
         self.assertEqual(users_from_db[0].id, self.user.id)
 
+    @unittest_run_loop
+    async def test_db_filter_with_lookups(self) -> None:
+        service = await self.get_db_manager(models.User)
+        fixtures = get_fixtures_by_name("User")
+        emails = [fixtures[0]["email"], fixtures[1]["email"]]
+        users_from_db = await service.filter({"email__in": emails, "name__icontains": fixtures[0]["name"][:3].upper()})
+        self.assertEqual([user.email for user in users_from_db], emails[:1])
+
+    @unittest_run_loop
+    async def test_db_select_columns(self) -> None:
+        service = await self.get_db_manager(models.User)
+        users_from_db = await service.all(columns=["email"])
+        self.assertEqual(len(users_from_db), len(get_fixtures_by_name("User")))
+        for user in users_from_db:
+            self.assertTrue(user.id)  # primary key is always selected
+            self.assertTrue(user.email)
+
+        user_from_db = await service.get({"id": self.user.id}, columns=["name"])
+        self.assertEqual(user_from_db.id, self.user.id)
+        self.assertEqual(user_from_db.name, self.user.name)
+
+    @unittest_run_loop
+    async def test_db_create_returning_columns(self) -> None:
+        service = await self.get_db_manager(models.User)
+        test_user_data = self.get_test_user_data()
+        user_from_db = await service.create(test_user_data, columns=["email"])
+        self.assertTrue(user_from_db.id)
+        self.assertEqual(user_from_db.email, test_user_data["email"])
+
+    @unittest_run_loop
+    async def test_db_bulk_create(self) -> None:
+        service = await self.get_db_manager(models.User)
+        values = []
+        for i in range(5):
+            user_data = {**self.get_test_user_data(), "email": f"bulk{i}@test.com"}
+            if i % 3 == 0:  # rows with different set of keys are inserted with separate statements
+                user_data["company_id"] = self.user.company_id
+            values.append(user_data)
+        users = await service.bulk_create(values, columns=["email", "company_id"], chunk_size=2)
+        self.assertEqual([user.email for user in users], [user_data["email"] for user_data in values])
+        self.assertTrue(all(user.id for user in users))
+        self.assertEqual(await service.count(), len(get_fixtures_by_name("User")) + len(values))
+
+    @unittest_run_loop
+    async def test_db_bulk_create_is_atomic(self) -> None:
+        service = await self.get_db_manager(models.User)
+        invalid_user_data = self.get_test_user_data()
+        invalid_user_data.pop("password")
+        values = [
+            {**self.get_test_user_data(), "email": "bulk1@test.com"},
+            {**self.get_test_user_data(), "email": "bulk2@test.com"},
+            invalid_user_data,
+        ]
+        with self.assertRaises(FieldValidationError):
+            await service.bulk_create(values, chunk_size=1)
+        self.assertEqual(await service.count(), len(get_fixtures_by_name("User")))
+
+    @unittest_run_loop
+    async def test_db_bulk_update(self) -> None:
+        service = await self.get_db_manager(models.User)
+        duplicated_phone = get_fixtures_by_name("User")[1]["phone"]
+        count = await service.bulk_update({"phone": duplicated_phone}, {"name": "Bulk"})
+        self.assertEqual(count, 2)
+
+        whereclause = service.get_lookup_clause("name", "icontains", "bulk")
+        users = await service.bulk_update(None, {"name": "Bulk 2"}, whereclause=whereclause, returning=True)
+        self.assertEqual([user.name for user in users], ["Bulk 2", "Bulk 2"])
+        self.assertEqual({user.phone for user in users}, {duplicated_phone})
+
+    @unittest_run_loop
+    async def test_db_bulk_delete(self) -> None:
+        service = await self.get_db_manager(models.User)
+        duplicated_phone = get_fixtures_by_name("User")[1]["phone"]
+        users = await service.bulk_delete({"phone": duplicated_phone}, returning=True, columns=["phone"])
+        self.assertEqual(len(users), 2)
+        self.assertEqual(await service.bulk_delete({"phone": duplicated_phone}), 0)
+        self.assertEqual(await service.count(), len(get_fixtures_by_name("User")) - 2)
+
+    @unittest_run_loop
+    async def test_db_count(self) -> None:
+        service = await self.get_db_manager(models.User)
+        self.assertEqual(await service.count(), len(get_fixtures_by_name("User")))
+        duplicated_phone = get_fixtures_by_name("User")[1]["phone"]
+        whereclause = service.get_lookup_clause("phone", "exact", duplicated_phone)
+        self.assertEqual(await service.count(whereclause), 2)
+
+    @unittest_run_loop
+    async def test_db_estimate_count(self) -> None:
+        service = await self.get_db_manager(models.User)
+        await service.execute(text("ANALYZE users"))
+        self.assertEqual(await service.estimate_count(), len(get_fixtures_by_name("User")))
+        whereclause = service.get_lookup_clause("email", "exact", self.user.email)
+        estimate = await service.estimate_count(whereclause)
+        self.assertIsInstance(estimate, int)
+        self.assertGreaterEqual(estimate, 1)
+
+    @unittest_run_loop
+    async def test_db_records(self) -> None:
+        service = await self.get_db_manager(models.User)
+        users = await service.filter(order_by=["email"], as_records=True)
+        emails = sorted(user["email"] for user in get_fixtures_by_name("User"))
+        self.assertEqual([user.email for user in users], emails)
+        self.assertNotIsInstance(users[0], models.User)
+        self.assertFalse(hasattr(users[0], "__dict__"))  # slotted
+
+        user = await service.get({"id": self.user.id}, columns=["email"], as_records=True)
+        self.assertEqual(user.email, self.user.email)
+        self.assertIs(type(user), service.get_record_class(("id", "email")))
+        self.assertIs(type(user), make_record_class("UserRecord", ("id", "email")))  # one cache of classes
+
+        chunks = [chunk async for chunk in service.stream(chunk_size=2, as_records=True)]
+        self.assertEqual(len([user for chunk in chunks for user in chunk]), len(emails))
+        self.assertNotIsInstance(chunks[0][0], models.User)
+
+    @unittest_run_loop
+    async def test_db_manager_using_records(self) -> None:
+        service = SAManager(get_global_config(), models.User, use_records=True)
+        user = await service.create(self.get_test_user_data())
+        self.assertNotIsInstance(user, models.User)
+        user = await service.get({"id": self.user.id})
+        self.assertNotIsInstance(user, models.User)
+        user = await service.update(user, {"name": "New Name"})
+        self.assertNotIsInstance(user, models.User)
+        self.assertEqual(user.name, "New Name")
+        users = await service.all()
+        self.assertTrue(all(not isinstance(user, models.User) for user in users))
+
+    @unittest_run_loop
+    async def test_db_session_scope(self) -> None:
+        service = await self.get_db_manager(models.User)
+        engine = await service.get_engine()
+        test_user_data = self.get_test_user_data()
+        callback = mock.AsyncMock()
+        with self.assertRaises(RuntimeError):
+            async with session_scope(engine):
+                await service.create(test_user_data)
+                await on_commit(callback)
+                self.assertEqual(await service.count(models.User.email == test_user_data["email"]), 1)
+                raise RuntimeError()
+        self.assertEqual(await service.count(models.User.email == test_user_data["email"]), 0)
+        async with session_scope(engine) as scope:
+            await on_commit(callback)
+            scope.rollback_only = True
+        callback.assert_not_awaited()
+
+        async with session_scope(engine) as scope:
+            async with service.session() as session:
+                self.assertIs(session, scope.session)
+            await service.create(test_user_data)
+            await on_commit(callback)
+            callback.assert_not_awaited()
+        callback.assert_awaited_once()
+        self.assertEqual(await service.count(models.User.email == test_user_data["email"]), 1)
+
+        await on_commit(callback)  # no scope, so run right away
+        self.assertEqual(callback.await_count, 2)
+
+    @unittest_run_loop
+    async def test_db_statement_cache(self) -> None:
+        service = await self.get_db_manager(models.User)
+        users = get_fixtures_by_name("User")
+        for user in users:
+            user_from_db = await service.get({"email": user["email"]})
+            self.assertEqual(user_from_db.email, user["email"])
+        self.assertEqual(service.statements.stats()["misses"], 1)
+        self.assertEqual(service.statements.stats()["hits"], len(users) - 1)
+
+        user_from_db = await service.get({"email__in": [self.user.email]}, columns=["email"])
+        self.assertEqual(user_from_db.email, self.user.email)
+        await service.update(self.user, {"name": "New Name"})
+        user_from_db = await service.update(self.user, {"name": "Newer Name"})
+        self.assertEqual(user_from_db.name, "Newer Name")
+        self.assertEqual(service.statements.stats(), {"hits": 3, "misses": 3, "size": 3, "max_size": 256})
+
+        # `IS NULL` and lookups with transformed values are not cached
+        user_from_db = await service.get({"id": self.user.id, "name__ne": None})
+        self.assertEqual(user_from_db.id, self.user.id)
+        await service.get({"id": self.user.id, "email__icontains": self.user.email.upper()})
+        self.assertEqual(len(service.statements), 3)
+
+        service.statements.max_size = 1
+        await service.get({"id": self.user.id})
+        self.assertEqual(len(service.statements), 1)
+
     @unittest_run_loop
     async def test_db_create(self) -> None:
         service = await self.get_db_manager(models.User)
@@ -29,3 +29,13 @@ class FieldsTestCase(BaseTestCase):
         serializer = SASerializer(data=sa_fields_data)
         serializer.is_valid(raise_exception=True)
         await serializer.save()
+
+    @unittest_run_loop
+    async def test_row_mappings_are_dumped_like_models(self) -> None:
+        db_manager = await self.get_db_manager(models.SAField)
+        rows = await db_manager.all(as_mappings=True)
+        instances = await db_manager.all()
+        serializer = SASerializer(rows, many=True)
+        self.assertIsNotNone(serializer.get_row_dump_functions())
+        self.assertEqual(serializer.data, SASerializer(instances, many=True).data)
+        self.assertEqual(SASerializer(rows[0]).data, SASerializer(instances[0]).data)
@@ -0,0 +1,71 @@
+import datetime
+from urllib.parse import quote
+
+from aiohttp.test_utils import unittest_run_loop
+
+from tests.functional.sa.orm.base import BaseTestCase
+from tests.functional.sa.utils import get_fixtures_by_name
+
+
+class FiltersTestCase(BaseTestCase):
+    async def get_filtered(self, query: str, status: int = 200):
+        response = await self.client.get(f"/filtered/users?{query}")
+        self.assertEqual(response.status, status)
+        return await response.json()
+
+    @unittest_run_loop
+    async def test_exact_filter(self) -> None:
+        email = get_fixtures_by_name("User")[0]["email"]
+        data = await self.get_filtered(f"email={email}")
+        self.assertEqual([user["email"] for user in data], [email])
+
+        duplicated_phone = get_fixtures_by_name("User")[1]["phone"]
+        data = await self.get_filtered(f"phone={quote(duplicated_phone)}")
+        self.assertEqual(len(data), 2)
+
+    @unittest_run_loop
+    async def test_total_count_is_filtered(self) -> None:
+        # estimated count falls back to exact one for small tables
+        duplicated_phone = get_fixtures_by_name("User")[1]["phone"]
+        response = await self.client.get(f"/filtered/users?phone={quote(duplicated_phone)}")
+        self.assertEqual(response.headers["X-Total-Count"], "2")
+
+    @unittest_run_loop
+    async def test_in_filter(self) -> None:
+        emails = [user["email"] for user in get_fixtures_by_name("User")[:2]]
+        data = await self.get_filtered(f"email__in={','.join(emails)}")
+        self.assertEqual(sorted(user["email"] for user in data), sorted(emails))
+
+    @unittest_run_loop
+    async def test_icontains_filter_escapes_wildcards(self) -> None:
+        data = await self.get_filtered("email__icontains=TWIST")
+        self.assertEqual(len(data), 1)
+        data = await self.get_filtered("email__icontains=%25")  # literal "%"
+        self.assertEqual(data, [])
+
+    @unittest_run_loop
+    async def test_range_filter(self) -> None:
+        tomorrow = (datetime.datetime.utcnow() + datetime.timedelta(days=1)).isoformat()
+        data = await self.get_filtered(f"created_at__lt={tomorrow}")
+        self.assertEqual(len(data), len(get_fixtures_by_name("User")))
+        data = await self.get_filtered(f"created_at__gte={tomorrow}")
+        self.assertEqual(data, [])
+
+    @unittest_run_loop
+    async def test_isnull_filter(self) -> None:
+        data = await self.get_filtered("company_id__isnull=true")
+        self.assertEqual(data, [])
+        data = await self.get_filtered("company_id__isnull=false")
+        self.assertEqual(len(data), len(get_fixtures_by_name("User")))
+
+    @unittest_run_loop
+    async def test_not_declared_filters_are_ignored(self) -> None:
+        name = get_fixtures_by_name("User")[0]["name"]
+        data = await self.get_filtered(f"name={name}&phone__in=1,2")
+        self.assertEqual(len(data), len(get_fixtures_by_name("User")))
+
+    @unittest_run_loop
+    async def test_invalid_filter_value(self) -> None:
+        data = await self.get_filtered("created_at__gte=not-a-date&company_id__isnull=maybe", status=400)
+        self.assertIn("created_at__gte", data)
+        self.assertIn("company_id__isnull", data)
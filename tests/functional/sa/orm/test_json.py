@@ -0,0 +1,46 @@
+import json
+import uuid
+
+from aiohttp.test_utils import unittest_run_loop
+
+from tests.functional.sa.orm.base import BaseTestCase
+
+
+def compact_dumps(data) -> bytes:
+    """Stands for json libraries producing bytes without whitespaces, like orjson"""
+    return json.dumps(data, separators=(",", ":")).encode()
+
+
+class CustomJSONTestCase(BaseTestCase):
+    rest_config = {
+        "json_dumps": compact_dumps,
+        "json_loads": json.loads,
+    }
+
+    @unittest_run_loop
+    async def test_responses_rendered_with_json_dumps(self) -> None:
+        for url in [f"/users/{self.user.id}", "/users", "/paginated/users", "/stream/users"]:
+            response = await self.client.get(url)
+            self.assertEqual(response.status, 200, url)
+            body = await response.read()
+            self.assertNotIn(b", ", body, url)
+            self.assertNotIn(b'": ', body, url)
+            json.loads(body)
+
+    @unittest_run_loop
+    async def test_errors_rendered_with_json_dumps(self) -> None:
+        response = await self.client.get(f"/users/{uuid.uuid4()}")
+        self.assertEqual(response.status, 404)
+        self.assertEqual(await response.read(), b'{"error":"Not found"}')
+
+        response = await self.client.post("/users", data="{invalid", headers={"Content-Type": "application/json"})
+        self.assertEqual(response.status, 400)
+        self.assertEqual(await response.read(), b'{"error":"invalid json"}')
+
+    @unittest_run_loop
+    async def test_request_parsed_with_json_loads(self) -> None:
+        response = await self.client.post("/users", json=self.get_test_user_data())
+        self.assertEqual(response.status, 201)
+        body = await response.read()
+        self.assertNotIn(b", ", body)
+        self.assertEqual(json.loads(body)["email"], self.get_test_user_data()["email"])
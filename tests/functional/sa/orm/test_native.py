@@ -0,0 +1,80 @@
+from unittest import mock
+
+import marshmallow as ma
+from aiohttp.test_utils import unittest_run_loop
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from aiohttp_rest_framework.db.native import AsyncpgManager, NativeRow, close_asyncpg_pools
+from aiohttp_rest_framework.settings import get_global_config
+from tests.functional.sa.orm import test_db_manager, test_views
+from tests.functional.sa.utils import get_fixtures_by_name
+from tests.test_app.sa.orm import models
+from tests.test_app.sa.orm.serializers import UserRowSerializer
+
+
+class AsyncpgManagerTestCase(test_db_manager.DBManagerTestCase):
+    """The same db manager tests, but statements are run on asyncpg pool"""
+
+    async def tearDownAsync(self) -> None:
+        await close_asyncpg_pools()
+        await super().tearDownAsync()
+
+    async def get_db_manager(self, model) -> AsyncpgManager:
+        return AsyncpgManager(get_global_config(), model)
+
+    @unittest_run_loop
+    async def test_db_bypasses_sessions(self) -> None:
+        service = await self.get_db_manager(models.User)
+        with mock.patch("aiohttp_rest_framework.db.sa.AsyncSession", wraps=AsyncSession) as session_class:
+            user = await service.get({"id": self.user.id})
+            users = await service.filter({"email__in": [self.user.email]})
+            await service.update(user, {"name": "New Name"})
+            self.assertEqual(session_class.call_count, 0)
+        self.assertIsInstance(user, models.User)
+        self.assertEqual(user.id, self.user.id)  # uuid is converted to string like the column's type does
+        self.assertEqual([user.id for user in users], [self.user.id])
+
+    @unittest_run_loop
+    async def test_db_statements_are_compiled_once(self) -> None:
+        service = await self.get_db_manager(models.User)
+        # `IN` takes an array parameter, so any number of values is the same statement
+        for user in get_fixtures_by_name("User"):
+            for emails in ([user["email"]], [user["email"], self.user.email]):
+                user_from_db = await service.get({"email__in": emails, "email": user["email"]})
+                self.assertEqual(user_from_db.email, user["email"])
+        self.assertEqual(service.statements.stats()["size"], 1)
+        self.assertEqual(len(service._compiled), 1)  # noqa
+
+    @unittest_run_loop
+    async def test_db_rows(self) -> None:
+        service = await self.get_db_manager(models.User.__table__)
+        row = await service.get({"id": self.user.id}, columns=["email"])
+        self.assertIsInstance(row, NativeRow)
+        self.assertEqual(row._fields, ("id", "email"))  # noqa
+        self.assertEqual(row.email, self.user.email)
+        self.assertEqual(row["email"], self.user.email)
+        self.assertEqual(tuple(row), (self.user.id, self.user.email))
+        self.assertEqual(row._mapping, {"id": self.user.id, "email": self.user.email})  # noqa
+
+        rows = await service.filter({"id": self.user.id}, as_mappings=True)
+        serializer = UserRowSerializer(rows, many=True)
+        with mock.patch.object(ma.Schema, "_serialize") as serialize:
+            data = serializer.data
+            serialize.assert_not_called()
+        self.assertEqual([user["id"] for user in data], [str(self.user.id)])
+
+        sa_instance = await (await self.get_db_manager(models.SAField)).get({"UUID": self.sa_instance.UUID})
+        self.assertEqual(sa_instance.Enum, self.sa_instance.Enum)
+        self.assertEqual(sa_instance.Numeric, self.sa_instance.Numeric)
+        self.assertEqual(sa_instance.Interval, self.sa_instance.Interval)
+
+
+class AsyncpgManagerViewsTestCase(test_views.ViewsTestCase):
+    """The same views, but their db manager runs statements on asyncpg pool"""
+
+    rest_config = {"db_manager": AsyncpgManager}
+    execute_method = (AsyncpgManager, "_run")
+
+    async def tearDownAsync(self) -> None:
+        await close_asyncpg_pools()
+        await super().tearDownAsync()
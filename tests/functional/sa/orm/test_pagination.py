@@ -0,0 +1,127 @@
+from typing import Optional
+
+from aiohttp.test_utils import unittest_run_loop
+from yarl import URL
+
+from aiohttp_rest_framework.pagination import CursorPagination
+from tests.functional.sa.orm.base import BaseTestCase
+from tests.functional.sa.utils import get_fixtures_by_name
+from tests.test_app.sa.orm import models
+
+
+def relative(link: Optional[str]) -> Optional[str]:
+    return link and URL(link).path_qs
+
+
+class PaginationTestCase(BaseTestCase):
+    async def collect_pages(self, url: str):
+        results = []
+        pages = 0
+        while url:
+            response = await self.client.get(url)
+            self.assertEqual(response.status, 200)
+            data = await response.json()
+            results.extend(data["results"])
+            url = relative(data["next"])
+            pages += 1
+        return results, pages
+
+    @unittest_run_loop
+    async def test_limit_offset_pagination(self) -> None:
+        response = await self.client.get("/paginated/users")
+        self.assertEqual(response.status, 200)
+        data = await response.json()
+        self.assertEqual(len(data["results"]), 2)
+        self.assertIsNone(data["previous"])
+        self.assertIn("offset=2", data["next"])
+        self.assertEqual(response.headers["X-Total-Count"], str(len(get_fixtures_by_name("User"))))
+
+        response = await self.client.get(relative(data["next"]))
+        data = await response.json()
+        self.assertEqual(len(data["results"]), len(get_fixtures_by_name("User")) - 2)
+        self.assertIsNone(data["next"])
+        self.assertIn("offset=0", data["previous"])
+
+    @unittest_run_loop
+    async def test_limit_offset_pagination_collects_all_rows(self) -> None:
+        results, pages = await self.collect_pages("/paginated/users")
+        self.assertEqual(pages, 2)
+        self.assertEqual(len({user["id"] for user in results}), len(get_fixtures_by_name("User")))
+
+    @unittest_run_loop
+    async def test_limit_is_bounded_by_max_limit(self) -> None:
+        response = await self.client.get("/paginated/users?limit=1000")
+        data = await response.json()
+        self.assertEqual(len(data["results"]), 2)
+
+    @unittest_run_loop
+    async def test_invalid_limit_offset_fall_back_to_defaults(self) -> None:
+        response = await self.client.get("/paginated/users?limit=-1&offset=invalid")
+        self.assertEqual(response.status, 200)
+        data = await response.json()
+        self.assertEqual(len(data["results"]), 2)
+        self.assertIsNone(data["previous"])
+
+    @unittest_run_loop
+    async def test_cursor_pagination(self) -> None:
+        results, pages = await self.collect_pages("/cursor/users")
+        self.assertEqual(pages, 2)
+        self.assertEqual(len({user["id"] for user in results}), len(get_fixtures_by_name("User")))
+        created = [user["created_at"] for user in results]
+        self.assertEqual(created, sorted(created, reverse=True))
+
+    @unittest_run_loop
+    async def test_cursor_pagination_of_rows(self) -> None:
+        results, pages = await self.collect_pages("/rows/users")
+        self.assertEqual(pages, 2)
+        expected, _ = await self.collect_pages("/cursor/users")
+        self.assertEqual(results, expected)
+
+    @unittest_run_loop
+    async def test_pagination_of_records(self) -> None:
+        for url in ["/paginated/users", "/cursor/users"]:
+            results, pages = await self.collect_pages(f"/records{url}")
+            self.assertEqual(pages, 2)
+            expected, _ = await self.collect_pages(url)
+            self.assertEqual(results, expected)
+
+    @unittest_run_loop
+    async def test_cursor_pagination_previous_page(self) -> None:
+        response = await self.client.get("/cursor/users")
+        first_page = await response.json()
+        self.assertIsNone(first_page["previous"])
+
+        response = await self.client.get(relative(first_page["next"]))
+        second_page = await response.json()
+        self.assertIsNone(second_page["next"])
+        self.assertIsNotNone(second_page["previous"])
+
+        response = await self.client.get(relative(second_page["previous"]))
+        previous_page = await response.json()
+        self.assertEqual(
+            [user["id"] for user in previous_page["results"]],
+            [user["id"] for user in first_page["results"]],
+        )
+        self.assertIsNone(previous_page["previous"])
+        self.assertIsNotNone(previous_page["next"])
+
+    @unittest_run_loop
+    async def test_invalid_cursor(self) -> None:
+        for cursor in ["invalid", "eyJwIjpbXX0"]:  # garbage and a cursor with no position values
+            response = await self.client.get(f"/cursor/users?cursor={cursor}")
+            self.assertEqual(response.status, 400)
+            data = await response.json()
+            self.assertEqual(data["error"], "invalid cursor")
+
+    @unittest_run_loop
+    async def test_cursor_pagination_rejects_nullable_ordering(self) -> None:
+        class NullableOrderingPagination(CursorPagination):
+            ordering = ("-Integer", "Date")
+
+        db_manager = await self.get_db_manager(models.SAField)
+        with self.assertRaises(AssertionError) as exc_info:
+            NullableOrderingPagination().get_ordering(db_manager)
+        self.assertIn("nullable columns: -Integer, Date", exc_info.exception.args[0])
+
+        db_manager = await self.get_db_manager(models.User)
+        self.assertEqual(CursorPagination().get_ordering(db_manager), ("id",))
@@ -0,0 +1,41 @@
+import asyncio
+
+from aiohttp.test_utils import unittest_run_loop
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from aiohttp_rest_framework import APP_CONFIG_KEY
+from aiohttp_rest_framework.db.pool import InstrumentedQueuePool
+from tests.functional.sa.orm.base import BaseTestCase
+
+
+class PoolTestCase(BaseTestCase):
+    rest_config = {"pool_size": 1, "max_overflow": 0, "pool_timeout": 0.1, "pool_pre_ping": True}
+
+    @unittest_run_loop
+    async def test_pool_settings(self) -> None:
+        engine = await self.app[APP_CONFIG_KEY].get_connection()
+        pool = engine.sync_engine.pool
+        self.assertIsInstance(pool, InstrumentedQueuePool)
+        self.assertEqual(pool.size(), 1)
+
+        async with engine.connect():
+            with self.assertRaises(PoolTimeoutError):
+                async with engine.connect():
+                    pass
+        self.assertEqual(pool.stats.timeouts, 1)
+
+    @unittest_run_loop
+    async def test_pool_stats_view(self) -> None:
+        responses = await asyncio.gather(*(self.client.get("/users") for _ in range(3)))
+        self.assertTrue(all(response.status == 200 for response in responses))
+
+        response = await self.client.get("/pool")
+        self.assertEqual(response.status, 200)
+        stats = (await response.json())["primary"]
+        self.assertEqual(stats["pool"], InstrumentedQueuePool.__name__)
+        self.assertEqual(stats["size"], 1)
+        self.assertEqual(stats["checked_out"], 0)
+        self.assertEqual(stats["idle"], 1)
+        self.assertGreaterEqual(stats["checkouts"], 3)
+        self.assertEqual(sum(stats["checkout_time_histogram"].values()), stats["checkouts"])
+        self.assertGreaterEqual(stats["waits"], 1)  # the only connection was shared by concurrent requests
@@ -0,0 +1,68 @@
+from typing import List, Optional, Sequence
+
+from aiohttp.test_utils import unittest_run_loop
+from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+
+from aiohttp_rest_framework.db.replicas import LagAwarePolicy, RoundRobinPolicy
+from aiohttp_rest_framework.middlewares import READ_YOUR_WRITES_COOKIE, read_your_writes_middleware
+from tests.functional.sa.orm.base import BaseTestCase
+from tests.test_app.sa.orm.config import DB_URL
+
+
+class RecordingPolicy(RoundRobinPolicy):
+    def __init__(self):
+        super().__init__()
+        self.chosen: List[AsyncEngine] = []
+
+    async def choose(self, replicas: Sequence[AsyncEngine]) -> Optional[AsyncEngine]:
+        replica = await super().choose(replicas)
+        self.chosen.append(replica)
+        return replica
+
+
+class ReplicasTestCase(BaseTestCase):
+    async def get_application(self):
+        # the same database plays a replica, only routing of statements is tested
+        self.replica = create_async_engine(DB_URL)
+        self.policy = RecordingPolicy()
+        self.rest_config = {"get_replicas": self.get_replicas, "replica_policy": self.policy}
+        app = await super().get_application()
+        app.middlewares.append(read_your_writes_middleware)
+        return app
+
+    async def tearDownAsync(self) -> None:
+        await super().tearDownAsync()
+        await self.replica.dispose()
+
+    async def get_replicas(self) -> List[AsyncEngine]:
+        return [self.replica]
+
+    @unittest_run_loop
+    async def test_reads_are_routed_to_replicas(self) -> None:
+        response = await self.client.get("/users")
+        self.assertEqual(response.status, 200)
+        response = await self.client.get(f"/users/{self.user.id}")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(self.policy.chosen, [self.replica, self.replica])
+
+    @unittest_run_loop
+    async def test_reads_your_writes_from_primary(self) -> None:
+        response = await self.client.patch(f"/users/{self.user.id}", json={"name": "New Name"})
+        self.assertEqual(response.status, 200)
+        self.assertEqual(self.policy.chosen, [])  # the object to update is read from the primary
+        self.assertIn(READ_YOUR_WRITES_COOKIE, response.cookies)
+
+        response = await self.client.get(f"/users/{self.user.id}")
+        self.assertEqual((await response.json())["name"], "New Name")
+        self.assertEqual(self.policy.chosen, [])
+
+        self.client.session.cookie_jar.update_cookies({READ_YOUR_WRITES_COOKIE: "0"})  # the window is over
+        response = await self.client.get(f"/users/{self.user.id}")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(self.policy.chosen, [self.replica])
+
+    @unittest_run_loop
+    async def test_lag_aware_policy(self) -> None:
+        policy = LagAwarePolicy(max_lag=1)
+        self.assertEqual(await policy.measure_lag(self.replica), 0)  # not in recovery, i.e. not behind
+        self.assertIs(await policy.choose([self.replica]), self.replica)
@@ -1,5 +1,9 @@
 import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from unittest import mock
 
+import marshmallow as ma
 from aiohttp.test_utils import unittest_run_loop
 
 from aiohttp_rest_framework import fields
@@ -68,6 +72,67 @@ class SerializerTestCase(BaseTestCase):
         self.assertIn(invalid_field, serializer.fields)
         self.assertIsInstance(serializer.fields[invalid_field], field_cls)
 
+    def test_field_setup_is_cached_per_class(self) -> None:
+        class CachedFieldsSerializer(ModelSerializer):
+            class Meta:
+                model = models.User
+                fields = "__all__"
+
+        config = CachedFieldsSerializer().config
+        with mock.patch.object(config.field_builder, "build", autospec=True, wraps=config.field_builder.build) as build:
+            first = CachedFieldsSerializer()
+            second = CachedFieldsSerializer(only=("id", "name"))
+        self.assertEqual(build.call_count, 0)  # built by the first instance above
+
+        self.assertEqual(list(second.fields), ["id", "name"])
+        for name in ["id", "name"]:
+            # instances share field setup, but every one of them has its own bound fields
+            self.assertIsNot(first.fields[name], second.fields[name])
+            self.assertIs(first.fields[name].parent, first)
+            self.assertIs(second.fields[name].parent, second)
+            self.assertEqual(type(first.fields[name]), type(second.fields[name]))
+        self.assertEqual(first.dump(self.user)["name"], self.user.name)
+
+        original_init = ma.fields.Inferred.__init__
+        with mock.patch.object(ma.fields.Inferred, "__init__", autospec=True, side_effect=original_init) as init:
+            third = CachedFieldsSerializer(only=("id", "name"), dump_only=("name",))
+            fourth = CachedFieldsSerializer(only=("id", "name"), dump_only=("name",))
+        # the first instance with these options resolves the layout, the next one only binds copies
+        self.assertEqual(init.call_count, 2)
+        self.assertEqual(list(fourth.fields), ["id", "name"])
+        self.assertNotIn("name", fourth.load_fields)
+        self.assertFalse(second.fields["name"].dump_only)
+        self.assertTrue(third.fields["name"].dump_only)
+        with self.assertRaises(ValueError):
+            CachedFieldsSerializer(only=("invalid",))
+        with self.assertRaises(ValueError):
+            CachedFieldsSerializer(only=("invalid",))
+
+        # instances can change their fields without affecting the other ones
+        first.fields["name"].validators.append(lambda value: False)
+        first.fields["name"].metadata["changed"] = True
+        self.assertEqual(second.fields["name"].validators, [])
+        self.assertNotIn("changed", CachedFieldsSerializer().fields["name"].metadata)
+
+    def test_dump_columns(self) -> None:
+        columns = UserSerializer().get_dump_columns()
+        self.assertIn("email", columns)
+        self.assertNotIn("password", columns)  # load only
+
+        self.assertEqual(UserSerializer(only=("name",)).get_dump_columns(), ("name",))
+
+        class WithMethodFieldSerializer(ModelSerializer):
+            display_name = fields.Method("get_display_name")
+
+            class Meta:
+                model = models.User
+                fields = "__all__"
+
+            def get_display_name(self, obj):
+                return obj.name
+
+        self.assertIsNone(WithMethodFieldSerializer().get_dump_columns())
+
     class SomeSerializer(Serializer):
         pass
 
@@ -134,6 +199,51 @@ class SerializerTestCase(BaseTestCase):
         self.assertIn("custom", serializer.fields)
         self.assertEqual(len(models.User.__table__.columns) + 1, len(serializer.fields))
 
+    @unittest_run_loop
+    async def test_serializer_in_executor(self) -> None:
+        db_manager = await self.get_db_manager(models.User)
+        users = await db_manager.all()
+        expected = UserSerializer(users, many=True).data
+        test_user_data = self.get_test_user_data()
+        # spawned workers don't have the global config, they build their own of the request's one
+        process_pool = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+        thread_pool = ThreadPoolExecutor(max_workers=1)
+        with process_pool, thread_pool:
+            for executor in (None, thread_pool, process_pool):
+                serializer = UserSerializer(users, many=True)
+                self.assertEqual(await serializer.data_in_executor(executor), expected)
+                self.assertEqual(json.loads(await serializer.render_json_in_executor(executor)), expected)
+
+                serializer = UserSerializer(data=json.dumps(test_user_data), as_text=True)
+                self.assertTrue(await serializer.is_valid_in_executor(executor))
+                self.assertEqual(serializer.validated_data["email"], test_user_data["email"])
+
+                serializer = UserSerializer(data=json.dumps({**test_user_data, "email": 1}), as_text=True)
+                self.assertFalse(await serializer.is_valid_in_executor(executor))
+                self.assertIn("email", serializer.errors)
+                self.assertEqual(serializer.data, {**test_user_data, "email": 1})
+
+                serializer = UserSerializer(data=b"{", as_text=True)
+                with self.assertRaises(ValidationError):
+                    await serializer.is_valid_in_executor(executor, raise_exception=True)
+
+
+def json_dumps_indented(data) -> str:
+    return json.dumps(data, indent=2)
+
+
+class CustomJSONCodecSerializerTestCase(BaseTestCase):
+    rest_config = {"json_dumps": json_dumps_indented}
+
+    @unittest_run_loop
+    async def test_serializer_in_process_pool_uses_config_codec(self) -> None:
+        users = await (await self.get_db_manager(models.User)).all()
+        serializer = UserSerializer(users, many=True)
+        expected = serializer.config.render_json(serializer.data)
+        self.assertIn(b"\n  ", expected)
+        with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as process_pool:
+            self.assertEqual(await serializer.render_json_in_executor(process_pool), expected)
+
 
 class AsyncConnectionPassedToConfigTestCase(BaseTestCase):
     @staticmethod
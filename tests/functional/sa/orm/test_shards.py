@@ -0,0 +1,130 @@
+from aiohttp.test_utils import unittest_run_loop
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+from yarl import URL
+
+from aiohttp_rest_framework import APP_CONFIG_KEY
+from aiohttp_rest_framework.db.shards import ShardMap, use_shard
+from aiohttp_rest_framework.exceptions import FieldValidationError, MultipleObjectsReturned, ObjectNotFound
+from tests.functional.sa.orm.base import BaseTestCase
+from tests.test_app.sa.orm import models
+from tests.test_app.sa.orm.config import DB_URL
+
+SHARDS = ("shard_a", "shard_b")
+
+
+class ShardsTestCase(BaseTestCase):
+    async def get_application(self):
+        # schemas of the test database play shards, every engine maps tables to its own schema
+        self.shards = {
+            name: create_async_engine(DB_URL, execution_options={"schema_translate_map": {None: name}})
+            for name in SHARDS
+        }
+        self.shard_map = ShardMap(self.shards, key="email")
+        self.rest_config = {"shard_maps": {models.User: self.shard_map}}
+        return await super().get_application()
+
+    async def setUpAsync(self) -> None:
+        await super().setUpAsync()
+        for name, engine in self.shards.items():
+            async with engine.begin() as connection:
+                await connection.execute(text(f"DROP SCHEMA IF EXISTS {name} CASCADE"))
+                await connection.execute(text(f"CREATE SCHEMA {name}"))
+                await connection.run_sync(
+                    models.meta.create_all, tables=[models.Company.__table__, models.User.__table__],
+                )
+        self.service = self.app[APP_CONFIG_KEY].get_db_manager(models.User)
+        self.emails = [f"user{index}@mail.com" for index in range(6)]
+        await self.service.bulk_create([
+            {"name": f"User {index % 2}", "email": email, "password": "pwd"}
+            for index, email in enumerate(self.emails)
+        ])
+
+    async def tearDownAsync(self) -> None:
+        for name, engine in self.shards.items():
+            async with engine.begin() as connection:
+                await connection.execute(text(f"DROP SCHEMA {name} CASCADE"))
+            await engine.dispose()
+        await super().tearDownAsync()
+
+    @unittest_run_loop
+    async def test_rows_are_routed_by_key(self) -> None:
+        for name in SHARDS:
+            with use_shard(name):
+                users = await self.service.all()
+            self.assertTrue(users)
+            self.assertTrue(all(self.shard_map.get_shard(user.email) == name for user in users))
+        self.assertEqual(await self.service.count(), len(self.emails))
+
+    @unittest_run_loop
+    async def test_get(self) -> None:
+        user = await self.service.get({"email": self.emails[0]})
+        self.assertEqual(user.email, self.emails[0])
+        user = await self.service.get({"id": user.id})  # looked up in all shards
+        self.assertEqual(user.email, self.emails[0])
+        with self.assertRaises(ObjectNotFound):
+            await self.service.get({"email": "missing@mail.com"})
+        with self.assertRaises(ObjectNotFound):
+            await self.service.get({"name": "missing"})
+
+    @unittest_run_loop
+    async def test_lists_are_merge_sorted(self) -> None:
+        users = await self.service.filter(order_by=["-email"], limit=3, offset=2)
+        self.assertEqual([user.email for user in users], sorted(self.emails, reverse=True)[2:5])
+
+        users = await self.service.all(order_by=["name", "-email"], as_mappings=True)
+        expected = sorted(self.emails[1::2], reverse=True)
+        expected = sorted(self.emails[::2], reverse=True) + expected
+        self.assertEqual([user["email"] for user in users], expected)
+
+        users = await self.service.filter({"name": "User 1"}, order_by=["email"])
+        self.assertEqual([user.email for user in users], self.emails[1::2])
+
+    @unittest_run_loop
+    async def test_writes(self) -> None:
+        user = await self.service.get({"email": self.emails[0]})
+        updated = await self.service.update(user, {"name": "New Name"})
+        self.assertEqual(updated.name, "New Name")
+        other_shard_email = next(
+            email for email in self.emails if self.shard_map.get_shard(email) != self.shard_map.get_shard(user.email)
+        )
+        with self.assertRaises(FieldValidationError):
+            await self.service.update(user, {"email": other_shard_email})
+        with self.assertRaises(FieldValidationError):
+            await self.service.create({"name": "No Email", "password": "pwd"})
+
+        updated = await self.service.update_by({"id": user.id}, {"name": "Newer Name"})
+        self.assertEqual(updated.name, "Newer Name")
+        await self.service.delete_by({"id": user.id})
+        await self.service.delete(await self.service.get({"email": self.emails[1]}))
+        self.assertEqual(await self.service.bulk_update({"name": "User 0"}, {"phone": "123"}), 2)
+        self.assertEqual(await self.service.count(), len(self.emails) - 2)
+        with self.assertRaises(ObjectNotFound):
+            await self.service.delete_by({"id": user.id})
+
+    @unittest_run_loop
+    async def test_writes_by_lookup_matching_several_shards(self) -> None:
+        with self.assertRaises(MultipleObjectsReturned):
+            await self.service.delete_by({"name": "User 0"})
+        with self.assertRaises(MultipleObjectsReturned):
+            await self.service.update_by({"name": "User 0"}, {"phone": "123"})
+        self.assertEqual(await self.service.count(), len(self.emails))
+        self.assertFalse(await self.service.filter({"phone": "123"}))
+
+    @unittest_run_loop
+    async def test_stream(self) -> None:
+        chunks = [chunk async for chunk in self.service.stream(chunk_size=2)]
+        self.assertEqual(sorted(user.email for chunk in chunks for user in chunk), self.emails)
+
+    @unittest_run_loop
+    async def test_cursor_pagination(self) -> None:
+        results, url = [], "/cursor/users"
+        while url:
+            response = await self.client.get(url)
+            self.assertEqual(response.status, 200)
+            data = await response.json()
+            results.extend(data["results"])
+            url = data["next"] and URL(data["next"]).path_qs
+        self.assertEqual(sorted(user["email"] for user in results), self.emails)
+        created = [user["created_at"] for user in results]
+        self.assertEqual(created, sorted(created, reverse=True))
@@ -1,19 +1,81 @@
+import json
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
+
 from aiohttp.test_utils import unittest_run_loop
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from aiohttp_rest_framework.middlewares import session_middleware
 from tests.functional.sa.orm.base import BaseTestCase
+from tests.functional.sa.utils import get_fixtures_by_name
+from tests.test_app.sa.orm.app import create_application
+from tests.test_app.sa.orm.config import DB_URL
 
 
 class ViewsTestCase(BaseTestCase):
+    # method running every statement of a db manager
+    execute_method = (AsyncSession, "execute")
+
     @unittest_run_loop
     async def test_list_view(self) -> None:
         response = await self.client.get("/users")
         self.assertEqual(response.status, 200)
+        self.assertEqual(response.headers["Content-Type"], "application/json; charset=utf-8")
         data = await response.json()
         self.assertTrue(data)
         user = data[0]
         self.assertTrue(user["id"])
         self.assertIsNone(user.get("password"))
 
+    @unittest_run_loop
+    async def test_streaming_list_view(self) -> None:
+        response = await self.client.get("/stream/users")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.content_type, "application/json")
+        data = await response.json()
+        self.assertEqual(len(data), len(get_fixtures_by_name("User")))
+        self.assertTrue(all(user["id"] for user in data))
+        self.assertTrue(all("password" not in user for user in data))
+
+    @unittest_run_loop
+    async def test_streaming_list_view_ndjson(self) -> None:
+        response = await self.client.get("/stream/users", headers={"Accept": "application/x-ndjson"})
+        self.assertEqual(response.status, 200)
+        self.assertEqual(response.content_type, "application/x-ndjson")
+        lines = (await response.text()).splitlines()
+        self.assertEqual(len(lines), len(get_fixtures_by_name("User")))
+        self.assertTrue(all(json.loads(line)["id"] for line in lines))
+
+    @unittest_run_loop
+    async def test_views_reading_records(self) -> None:
+        for url in ["/users", "/stream/users"]:
+            response = await self.client.get(url)
+            expected = sorted(await response.json(), key=lambda user: user["id"])
+            response = await self.client.get(f"/records{url}")
+            self.assertEqual(response.status, 200)
+            self.assertEqual(sorted(await response.json(), key=lambda user: user["id"]), expected)
+
+        response = await self.client.get(f"/records/users/{self.user.id}")
+        self.assertEqual(response.status, 200)
+        data = await response.json()
+        self.assertEqual(data["id"], self.user.id)
+        self.assertEqual(data["email"], self.user.email)
+
+    @unittest_run_loop
+    async def test_offloaded_view(self) -> None:
+        response = await self.client.get("/users")
+        expected = await response.json()
+        response = await self.client.get("/offloaded/users")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(await response.json(), expected)
+
+        response = await self.client.post("/offloaded/users", json=self.get_test_user_data())
+        self.assertEqual(response.status, 201, await response.text())
+        response = await self.client.post("/offloaded/users", data="{")
+        self.assertEqual(response.status, 400)
+        self.assertEqual(await response.json(), {"error": "invalid json"})
+
     @unittest_run_loop
     async def test_retrieve_view(self) -> None:
         response = await self.client.get(f"/users/{self.user.id}")
@@ -22,6 +84,25 @@ class ViewsTestCase(BaseTestCase):
         self.assertTrue(data)
         self.assertEqual(str(self.user.id), data["id"])
 
+    @unittest_run_loop
+    async def test_sparse_fields(self) -> None:
+        response = await self.client.get("/users?fields=id,email")
+        self.assertEqual(response.status, 200)
+        data = await response.json()
+        self.assertTrue(data)
+        self.assertTrue(all(set(user) == {"id", "email"} for user in data))
+
+        response = await self.client.get(f"/users/{self.user.id}?fields=name")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(await response.json(), {"name": self.user.name})
+
+    @unittest_run_loop
+    async def test_sparse_fields_invalid(self) -> None:
+        response = await self.client.get("/users?fields=id,not_a_field")
+        self.assertEqual(response.status, 400)
+        data = await response.json()
+        self.assertIn("fields", data)
+
     @unittest_run_loop
     async def test_create_view(self):
         response = await self.client.post("/users", json=self.get_test_user_data())
@@ -37,6 +118,74 @@ class ViewsTestCase(BaseTestCase):
         self.assertEqual(user.phone, data["phone"])
         self.assertEqual(user.email, data["email"])
 
+    @unittest_run_loop
+    async def test_bulk_create_view(self):
+        users_data = [{**self.get_test_user_data(), "email": f"bulk{i}@test.com"} for i in range(3)]
+        response = await self.client.post("/users", json=users_data)
+        self.assertEqual(response.status, 201)
+
+        data = await response.json()
+        self.assertEqual([user["email"] for user in data], [user["email"] for user in users_data])
+        for user in data:
+            user_from_db = await self.get_user_by_id(user["id"])
+            self.assertEqual(user_from_db.email, user["email"])
+            self.assertNotIn("password", user)
+
+    @unittest_run_loop
+    async def test_bulk_create_errors_by_index(self):
+        invalid_user_data = {**self.get_test_user_data(), "email": "bulk@test.com", "company_id": 1}
+        response = await self.client.post("/users", json=[self.get_test_user_data(), invalid_user_data])
+        self.assertEqual(response.status, 400)
+        data = await response.json()
+        self.assertEqual(list(data), ["1"])
+        self.assertIn("company_id", data["1"])
+
+        users = await (await self.client.get("/users")).json()
+        self.assertNotIn(self.get_test_user_data()["email"], [user["email"] for user in users])
+
+    @unittest_run_loop
+    async def test_bulk_create_chunked_upload(self):
+        users_data = [{**self.get_test_user_data(), "email": f"bulk{i}@test.com"} for i in range(3)]
+        raw = json.dumps(users_data).encode()
+
+        async def body():
+            for i in range(0, len(raw), 10):
+                yield raw[i:i + 10]
+
+        response = await self.client.post("/users", data=body(), headers={"Content-Type": "application/json"})
+        self.assertEqual(response.status, 201)
+        data = await response.json()
+        self.assertEqual([user["email"] for user in data], [user["email"] for user in users_data])
+
+    @unittest_run_loop
+    async def test_bulk_create_invalid_json(self):
+        raw = json.dumps([self.get_test_user_data()])
+        for body in [raw + ",]", raw[:-1] + "}"]:  # extra data and mismatched closing bracket
+            response = await self.client.post("/users", data=body, headers={"Content-Type": "application/json"})
+            self.assertEqual(response.status, 400)
+            self.assertEqual(await response.json(), {"error": "invalid json"})
+        users = await (await self.client.get("/users")).json()
+        self.assertNotIn(self.get_test_user_data()["email"], [user["email"] for user in users])
+
+    @unittest_run_loop
+    async def test_request_body_too_large(self):
+        users_data = [{**self.get_test_user_data(), "email": f"bulk{i}@test.com"} for i in range(10)]
+        response = await self.client.post("/small/users", json=users_data)
+        self.assertEqual(response.status, 413)
+        self.assertIn("512", (await response.json())["error"])
+
+        raw = json.dumps(users_data).encode()
+
+        async def body():  # chunked upload, without content length
+            for i in range(0, len(raw), 100):
+                yield raw[i:i + 100]
+
+        response = await self.client.post("/small/users", data=body(), headers={"Content-Type": "application/json"})
+        self.assertEqual(response.status, 413)
+
+        response = await self.client.post("/small/users", json=self.get_test_user_data())
+        self.assertEqual(response.status, 201)
+
     @unittest_run_loop
     async def test_update_view(self):
         user_data = {
@@ -108,3 +257,80 @@ class ViewsTestCase(BaseTestCase):
     async def test_destroy_non_existent_user(self):
         response = await self.client.delete("/users/123")
         self.assertEqual(response.status, 404)
+
+    @unittest_run_loop
+    async def test_writes_by_lookup(self):
+        url = f"/lookup/users/{self.user.id}"
+        original = getattr(*self.execute_method)
+        with mock.patch.object(*self.execute_method, autospec=True, side_effect=original) as execute:
+            response = await self.client.patch(url, json={"email": "updated@mail.com"})
+            self.assertEqual(response.status, 200)
+            self.assertEqual(execute.call_count, 1)  # no select before update
+            data = await response.json()
+            self.assertEqual(data["email"], "updated@mail.com")
+            self.assertEqual(data["name"], self.user.name)
+
+            execute.reset_mock()
+            response = await self.client.patch(url, json={"name": ["not", "a", "string"]})
+            self.assertEqual(response.status, 400)
+            self.assertEqual(execute.call_count, 0)  # body is validated before touching the database
+
+            execute.reset_mock()
+            response = await self.client.delete(url)
+            self.assertEqual(response.status, 204)
+            self.assertEqual(execute.call_count, 1)
+        self.assertIsNone(await self.get_user_by_id(self.user.id))
+
+        for missing in [self.user.id, "123"]:
+            response = await self.client.patch(f"/lookup/users/{missing}", json={"name": "Name"})
+            self.assertEqual(response.status, 404)
+            response = await self.client.delete(f"/lookup/users/{missing}")
+            self.assertEqual(response.status, 404)
+
+
+class SessionMiddlewareViewsTestCase(ViewsTestCase):
+    """The same views, but every request runs in a single session"""
+
+    async def get_application(self):
+        app = await super().get_application()
+        app.middlewares.append(session_middleware)
+        return app
+
+    @unittest_run_loop
+    async def test_request_uses_single_session(self) -> None:
+        with mock.patch("aiohttp_rest_framework.db.sa.AsyncSession", wraps=AsyncSession) as session_class:
+            response = await self.client.patch(f"/users/{self.user.id}", json={"name": "New Name"})
+            self.assertEqual(response.status, 200)
+            self.assertEqual(session_class.call_count, 1)
+        user = await self.get_user_by_id(self.user.id)
+        self.assertEqual(user.name, "New Name")
+
+
+class ProcessPoolOffloadTestCase(BaseTestCase):
+    """Big lists are dumped in process pool workers"""
+
+    async def get_application(self):
+        self.process_pool = ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn"))
+        return create_application(DB_URL, {"offload_executor": self.process_pool})
+
+    async def tearDownAsync(self) -> None:
+        self.process_pool.shutdown()
+        await super().tearDownAsync()
+
+    @unittest_run_loop
+    async def test_offloaded_views_of_rows(self) -> None:
+        response = await self.client.get("/users")
+        expected = sorted(await response.json(), key=lambda user: user["id"])
+        response = await self.client.get("/offloaded/rows/users")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(sorted(await response.json(), key=lambda user: user["id"]), expected)
+
+        response = await self.client.get("/offloaded/cursor/users")
+        self.assertEqual(response.status, 200)
+        response_data = await response.json()
+        self.assertTrue(response_data["next"])
+        self.assertEqual(len(response_data["results"]), 2)
+
+        response = await self.client.get("/offloaded/users")  # ORM instances
+        self.assertEqual(response.status, 200)
+        self.assertEqual(sorted(await response.json(), key=lambda user: user["id"]), expected)
@@ -0,0 +1,120 @@
+import decimal
+
+from aiohttp.test_utils import AioHTTPTestCase, unittest_run_loop
+from aiohttp.web_app import Application
+
+from aiohttp_rest_framework import APP_CONFIG_KEY
+from aiohttp_rest_framework.db.sqlite import SQLiteManager
+from aiohttp_rest_framework.exceptions import FieldValidationError, UniqueViolationError
+from aiohttp_rest_framework.settings import get_global_config
+from aiohttp_rest_framework.utils import create_tables, drop_tables
+from tests.test_app.sqlite import models
+from tests.test_app.sqlite.app import create_application
+
+USERS = [
+    {"name": "Anna", "email": "anna@test.com", "balance": decimal.Decimal("10.50"), "plan": models.Plan.paid},
+    {"name": "Bob", "email": "bob@test.com", "settings": {"theme": "dark"}},
+    {"name": "Carl", "email": "carl@test.com"},
+]
+
+
+class SQLiteTestCase(AioHTTPTestCase):
+    async def get_application(self) -> Application:
+        return create_application()
+
+    async def setUpAsync(self) -> None:
+        self.engine = self.app[self.app[APP_CONFIG_KEY].app_connection_property]
+        await create_tables(models.meta, self.engine)
+        company = await self.get_db_manager(models.Company).create({"name": "Company"})
+        self.users = await self.get_db_manager(models.User).bulk_create(
+            [{**user, "company_id": company.id} for user in USERS]
+        )
+
+    async def tearDownAsync(self) -> None:
+        await drop_tables(models.meta, self.engine)
+
+    def get_db_manager(self, model) -> SQLiteManager:
+        return get_global_config().get_db_manager(model)
+
+    @unittest_run_loop
+    async def test_db_manager_class(self) -> None:
+        self.assertIsInstance(self.get_db_manager(models.User), SQLiteManager)
+
+    @unittest_run_loop
+    async def test_db_get(self) -> None:
+        service = self.get_db_manager(models.User)
+        user = await service.get({"email": USERS[0]["email"]})
+        self.assertIsInstance(user, models.User)
+        self.assertEqual(user.id, self.users[0].id)
+        self.assertEqual(user.balance, USERS[0]["balance"])
+        self.assertEqual(user.plan, models.Plan.paid)
+        self.assertIsNotNone(user.created_at)
+        user = await service.get({"id": self.users[1].id})
+        self.assertEqual(user.settings, {"theme": "dark"})
+        self.assertEqual(user.plan, models.Plan.free)
+
+    @unittest_run_loop
+    async def test_db_filter_with_lookups(self) -> None:
+        service = self.get_db_manager(models.User)
+        emails = [USERS[0]["email"], USERS[2]["email"]]
+        users = await service.filter({"email__in": emails}, order_by=["-email"])
+        self.assertEqual([user.email for user in users], emails[::-1])
+        users = await service.filter({"name__icontains": "AR"})
+        self.assertEqual([user.name for user in users], ["Carl"])
+
+    @unittest_run_loop
+    async def test_db_stream_and_count(self) -> None:
+        service = self.get_db_manager(models.User)
+        chunks = [chunk async for chunk in service.stream(order_by=["email"], chunk_size=2)]
+        self.assertEqual([len(chunk) for chunk in chunks], [2, 1])
+        self.assertEqual([user.email for chunk in chunks for user in chunk], [user["email"] for user in USERS])
+        self.assertEqual(await service.count(), len(USERS))
+        self.assertIsNone(await service.estimate_count())
+
+    @unittest_run_loop
+    async def test_db_update_and_delete(self) -> None:
+        service = self.get_db_manager(models.User)
+        user = await service.update(self.users[0], {"name": "New Name"})
+        self.assertEqual(user.name, "New Name")
+        self.assertEqual((await service.get({"id": user.id})).name, "New Name")
+        await service.delete(user)
+        self.assertEqual(await service.count(), len(USERS) - 1)
+
+    @unittest_run_loop
+    async def test_db_errors(self) -> None:
+        service = self.get_db_manager(models.User)
+        with self.assertRaises(UniqueViolationError):
+            await service.create({"email": USERS[0]["email"]})
+        with self.assertRaises(FieldValidationError):
+            await service.create({"email": "new@test.com", "company_id": 100})  # no such company
+        with self.assertRaises(FieldValidationError):
+            await service.create({"email": None})
+        self.assertEqual(await service.count(), len(USERS))
+
+    @unittest_run_loop
+    async def test_views(self) -> None:
+        response = await self.client.get("/users")
+        self.assertEqual(response.status, 200)
+        data = await response.json()
+        self.assertEqual([user["email"] for user in data], [user["email"] for user in USERS])
+        self.assertEqual(data[0]["balance"], "10.50")
+        self.assertEqual(data[0]["plan"], "paid")
+
+        response = await self.client.post("/users", json={"email": "new@test.com", "settings": {"a": 1}})
+        self.assertEqual(response.status, 201, await response.text())
+        created = await response.json()
+        self.assertEqual(created["settings"], {"a": 1})
+        response = await self.client.get(f"/users/{created['id']}")
+        self.assertEqual(response.status, 200)
+        self.assertEqual((await response.json())["email"], "new@test.com")
+
+        response = await self.client.post("/users", json={"email": "new@test.com"})
+        self.assertEqual(response.status, 400)
+
+        response = await self.client.get("/stream/users")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(len(await response.json()), len(USERS) + 1)
+
+        response = await self.client.get("/pool")
+        self.assertEqual(response.status, 200)
+        self.assertEqual(await response.json(), {"primary": {"pool": None}})
@@ -1,12 +1,35 @@
 # import aiohttp_cors
 from aiohttp import web
 
+from aiohttp_rest_framework.views import PoolStatsView
 from tests.test_app.sa.orm import views
 
 
 def setup_routes(app: web.Application):
     app.router.add_view("/users", views.UsersListCreateView)
     app.router.add_view("/users/{id}", views.UsersRetrieveUpdateDestroyView)
+    app.router.add_view("/paginated/users", views.UsersLimitOffsetListView)
+    app.router.add_view("/cursor/users", views.UsersCursorListView)
+    app.router.add_view("/rows/users", views.UsersRowsCursorListView)
+    app.router.add_view("/stream/users", views.UsersStreamingListView)
+    app.router.add_view("/records/users", views.UsersRecordsView)
+    app.router.add_view("/records/users/{id}", views.UsersRecordsDetailView)
+    app.router.add_view("/records/stream/users", views.UsersRecordsStreamingListView)
+    app.router.add_view("/records/paginated/users", views.UsersRecordsLimitOffsetListView)
+    app.router.add_view("/records/cursor/users", views.UsersRecordsCursorListView)
+    app.router.add_view("/filtered/users", views.UsersFilteredListView)
+    app.router.add_view("/versioned/users/{id}", views.UsersVersionedView)
+    app.router.add_view("/lookup/users/{id}", views.UsersLookupWritesView)
+    app.router.add_view("/lookup/versioned/users/{id}", views.UsersVersionedLookupWritesView)
+    app.router.add_view("/cached/users", views.UsersCachedListView)
+    app.router.add_view("/cached/users/{id}", views.UsersCachedDetailView)
+    app.router.add_view("/stale/users/{id}", views.UsersStaleCachedDetailView)
+    app.router.add_view("/bulk/users", views.UsersBulkView)
+    app.router.add_view("/small/users", views.UsersSmallBodyView)
+    app.router.add_view("/offloaded/users", views.UsersOffloadedView)
+    app.router.add_view("/offloaded/rows/users", views.UsersRowsOffloadedView)
+    app.router.add_view("/offloaded/cursor/users", views.UsersRowsOffloadedCursorView)
+    app.router.add_view("/pool", PoolStatsView)
 
     # cors = aiohttp_cors.setup(app, defaults={
     #     "*": aiohttp_cors.ResourceOptions(
@@ -11,3 +11,12 @@ class UserSerializer(ModelSerializer[models.User]):
         model = models.User
         fields = "__all__"
         dump_only = ("created_at",)
+
+
+class UserRowSerializer(ModelSerializer[models.User]):
+    """No declared fields, so lists are dumped straight from database rows"""
+
+    class Meta:
+        model = models.User
+        fields = "__all__"
+        exclude = ("password",)
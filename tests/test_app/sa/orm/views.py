@@ -1,10 +1,143 @@
 from aiohttp_rest_framework import views
-from tests.test_app.sa.orm.serializers import UserSerializer
+from aiohttp_rest_framework.filters import FieldFilterBackend
+from aiohttp_rest_framework.pagination import CursorPagination, LimitOffsetPagination
+from tests.test_app.sa.orm.serializers import UserRowSerializer, UserSerializer
+
+
+class UsersLimitOffsetPagination(LimitOffsetPagination):
+    default_limit = 2
+    max_limit = 2
+
+
+class UsersCursorPagination(CursorPagination):
+    page_size = 2
+    ordering = ("-created_at",)
 
 
 class UsersListCreateView(views.ListCreateAPIView):
     serializer_class = UserSerializer
+    sparse_fields_query_param = "fields"
 
 
 class UsersRetrieveUpdateDestroyView(views.RetrieveUpdateDestroyAPIView):
     serializer_class = UserSerializer
+    sparse_fields_query_param = "fields"
+
+
+class UsersLimitOffsetListView(views.ListAPIView):
+    serializer_class = UserSerializer
+    pagination_class = UsersLimitOffsetPagination
+    total_count_mode = views.GenericAPIView.EXACT_COUNT
+
+
+class UsersCursorListView(views.ListAPIView):
+    serializer_class = UserSerializer
+    pagination_class = UsersCursorPagination
+
+
+class UsersStreamingListView(views.StreamingListAPIView):
+    serializer_class = UserSerializer
+    stream_chunk_size = 2
+
+
+class UsersRecordsStreamingListView(views.StreamingListAPIView):
+    serializer_class = UserSerializer
+    stream_chunk_size = 2
+    read_records = True
+
+
+class UsersRecordsView(views.ListAPIView):
+    serializer_class = UserSerializer
+    read_records = True
+
+
+class UsersRecordsLimitOffsetListView(UsersLimitOffsetListView):
+    read_records = True
+
+
+class UsersRecordsCursorListView(UsersCursorListView):
+    read_records = True
+
+
+class UsersRecordsDetailView(views.RetrieveAPIView):
+    serializer_class = UserSerializer
+    read_records = True
+
+
+class UsersFilteredListView(views.ListAPIView):
+    serializer_class = UserSerializer
+    filter_backends = (FieldFilterBackend,)
+    total_count_mode = views.GenericAPIView.ESTIMATED_COUNT
+    filterset_fields = {
+        "email": ("exact", "in", "icontains"),
+        "phone": ("exact",),
+        "created_at": ("gte", "lt"),
+        "company_id": ("isnull",),
+    }
+
+
+class UsersVersionedView(views.RetrieveUpdateDestroyAPIView):
+    serializer_class = UserSerializer
+    etag_version_field = "created_at"
+
+
+class UsersLookupWritesView(views.RetrieveUpdateDestroyAPIView):
+    serializer_class = UserSerializer
+    write_by_lookup = True
+
+
+class UsersVersionedLookupWritesView(UsersVersionedView):
+    write_by_lookup = True
+
+
+class UsersCachedListView(views.ListCreateAPIView):
+    serializer_class = UserSerializer
+    cache_timeout = 60
+    total_count_mode = views.GenericAPIView.EXACT_COUNT
+    total_count_header = "X-Count"
+
+
+class UsersCachedDetailView(views.RetrieveUpdateDestroyAPIView):
+    serializer_class = UserSerializer
+    cache_timeout = 60
+    cache_not_found_timeout = 60
+
+
+class UsersStaleCachedDetailView(views.RetrieveAPIView):
+    serializer_class = UserSerializer
+    cache_timeout = 0.1
+    cache_stale_timeout = 60
+
+
+class UsersBulkView(views.BulkUpdateDestroyAPIView):
+    serializer_class = UserSerializer
+    filter_backends = (FieldFilterBackend,)
+    filterset_fields = {
+        "email": ("exact", "in"),
+        "phone": ("exact",),
+    }
+
+
+class UsersSmallBodyView(views.CreateAPIView):
+    serializer_class = UserSerializer
+    max_body_size = 512
+
+
+class UsersRowsCursorListView(views.ListAPIView):
+    serializer_class = UserRowSerializer
+    pagination_class = UsersCursorPagination
+
+
+class UsersOffloadedView(views.ListCreateAPIView):
+    serializer_class = UserSerializer
+    offload_rows_threshold = 1
+    offload_bytes_threshold = 1
+
+
+class UsersRowsOffloadedView(views.ListAPIView):
+    serializer_class = UserRowSerializer
+    offload_rows_threshold = 1
+
+
+class UsersRowsOffloadedCursorView(UsersRowsOffloadedView):
+    pagination_class = UsersCursorPagination
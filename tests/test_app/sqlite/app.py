@@ -0,0 +1,29 @@
+import typing
+from functools import partial
+
+from aiohttp import web
+
+from aiohttp_rest_framework import APP_CONFIG_KEY, create_connection, setup_rest_framework
+from aiohttp_rest_framework.settings import SQLITE
+from tests.test_app.sqlite.routes import setup_routes
+
+# in-memory database, it lives as long as the app's connection
+DB_URL = "sqlite://"
+
+
+async def init_db(app_conn_prop: str, db_url: str, app: web.Application) -> None:
+    app[app_conn_prop] = await create_connection(db_url)
+
+
+async def close_db(app_conn_prop: str, app: web.Application) -> None:
+    await app[app_conn_prop].dispose()
+
+
+def create_application(db_url: str = DB_URL, rest_config: typing.Mapping = None):
+    app = web.Application()
+    setup_routes(app)
+    setup_rest_framework(app, {"schema_type": SQLITE, **(rest_config or {})})
+    app_conn_prop = app[APP_CONFIG_KEY].app_connection_property
+    app.on_startup.append(partial(init_db, app_conn_prop, db_url))
+    app.on_cleanup.append(partial(close_db, app_conn_prop))
+    return app
@@ -0,0 +1,33 @@
+import datetime
+import enum
+
+import sqlalchemy as sa
+from sqlalchemy.orm import declarative_base
+
+Base = declarative_base()
+meta = Base.metadata
+
+
+class Company(Base):
+    __tablename__ = "companies"
+
+    id = sa.Column(sa.Integer, primary_key=True)
+    name = sa.Column(sa.Text, nullable=False)
+
+
+class Plan(enum.Enum):
+    free = "free"
+    paid = "paid"
+
+
+class User(Base):
+    __tablename__ = "users"
+
+    id = sa.Column(sa.Integer, primary_key=True)
+    name = sa.Column(sa.Text, nullable=False, default="")
+    email = sa.Column(sa.Text, nullable=False, unique=True)
+    balance = sa.Column(sa.Numeric(10, 2), nullable=False, default=0)
+    plan = sa.Column(sa.Enum(Plan), nullable=False, default=Plan.free)
+    settings = sa.Column(sa.JSON, nullable=True)
+    created_at = sa.Column(sa.DateTime, nullable=False, default=datetime.datetime.utcnow)
+    company_id = sa.Column(sa.ForeignKey("companies.id"), nullable=True)
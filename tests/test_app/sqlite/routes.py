@@ -0,0 +1,11 @@
+from aiohttp import web
+
+from aiohttp_rest_framework.views import PoolStatsView
+from tests.test_app.sqlite import views
+
+
+def setup_routes(app: web.Application):
+    app.router.add_view("/users", views.UsersListCreateView)
+    app.router.add_view("/users/{id}", views.UsersRetrieveUpdateDestroyView)
+    app.router.add_view("/stream/users", views.UsersStreamingListView)
+    app.router.add_view("/pool", PoolStatsView)
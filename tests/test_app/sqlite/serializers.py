@@ -0,0 +1,12 @@
+from aiohttp_rest_framework import fields
+from aiohttp_rest_framework.serializers import ModelSerializer
+from tests.test_app.sqlite import models
+
+
+class UserSerializer(ModelSerializer[models.User]):
+    balance = fields.Decimal(places=2, as_string=True, required=False)
+
+    class Meta:
+        model = models.User
+        fields = "__all__"
+        dump_only = ("id", "created_at")
@@ -0,0 +1,15 @@
+from aiohttp_rest_framework import views
+from tests.test_app.sqlite.serializers import UserSerializer
+
+
+class UsersListCreateView(views.ListCreateAPIView):
+    serializer_class = UserSerializer
+
+
+class UsersRetrieveUpdateDestroyView(views.RetrieveUpdateDestroyAPIView):
+    serializer_class = UserSerializer
+
+
+class UsersStreamingListView(views.StreamingListAPIView):
+    serializer_class = UserSerializer
+    stream_chunk_size = 2